@@ -0,0 +1,225 @@
+/*
+ * Compiled hand evaluator, loaded through fasteval.py when it has been built
+ * (python build_fasteval.py). It computes the same packed raw key as
+ * texasholdem._raw_rank and maps it to the same dense rank (1-7462), using the
+ * sorted key table handed over by fe_init.
+ *
+ * Cards are ids 0-51 laid out like engine.DECK_ORDER: suit * 13 + rank, with
+ * rank 0 for a deuce and 12 for an ace.
+ */
+#include <stdint.h>
+
+#define CATEGORY_SHIFT 20
+#define MAX_KEYS 7462
+
+static uint32_t rank_keys[MAX_KEYS];
+static int num_keys;
+static uint8_t straight_high[8192];
+static uint32_t top_five[8192];
+
+/* The `count` highest values in a rank mask, packed four bits each */
+static uint32_t top_values(int mask, int count)
+{
+    uint32_t packed = 0;
+    for (int r = 12; r >= 0 && count > 0; r--) {
+        if (mask >> r & 1) {
+            packed = packed << 4 | (uint32_t)(r + 2);
+            count--;
+        }
+    }
+    return packed;
+}
+
+int fe_init(const uint32_t *keys, int n)
+{
+    int mask, high;
+
+    if (n > MAX_KEYS)
+        return -1;
+    for (int i = 0; i < n; i++)
+        rank_keys[i] = keys[i];
+    num_keys = n;
+
+    for (mask = 0; mask < 8192; mask++) {
+        straight_high[mask] = 0;
+        for (high = 14; high >= 6; high--) {
+            int run = 0x1f << (high - 6);
+            if ((mask & run) == run) {
+                straight_high[mask] = (uint8_t)high;
+                break;
+            }
+        }
+        if (!straight_high[mask] && (mask & 0x100f) == 0x100f)
+            straight_high[mask] = 5;
+        top_five[mask] = top_values(mask, 5);
+    }
+    return 0;
+}
+
+/* Highest rank value (2-14) with at least `count` cards, skipping `skip` values, or 0 */
+static int highest(const int *counts, int count, int skip1, int skip2)
+{
+    for (int r = 12; r >= 0; r--) {
+        int v = r + 2;
+        if (counts[r] >= count && v != skip1 && v != skip2)
+            return v;
+    }
+    return 0;
+}
+
+static uint32_t raw_rank(const unsigned char *cards, int n)
+{
+    int counts[13] = {0};
+    int suit_masks[4] = {0, 0, 0, 0};
+    int mask = 0, quads = 0, trips = 0, pairs = 0;
+    int flush = 0;
+
+    for (int i = 0; i < n; i++) {
+        int rank = cards[i] % 13, suit = cards[i] / 13;
+        counts[rank]++;
+        suit_masks[suit] |= 1 << rank;
+        mask |= 1 << rank;
+    }
+    for (int r = 0; r < 13; r++) {
+        if (counts[r] == 4) quads++;
+        else if (counts[r] == 3) trips++;
+        else if (counts[r] == 2) pairs++;
+    }
+    for (int s = 0; s < 4; s++) {
+        if (__builtin_popcount(suit_masks[s]) >= 5) {
+            flush = suit_masks[s];
+            break;
+        }
+    }
+
+    if (quads) {
+        int quad = highest(counts, 4, 0, 0);
+        return 8u << CATEGORY_SHIFT | quad << 4 | highest(counts, 1, quad, 0);
+    }
+    if (trips) {
+        int three = highest(counts, 3, 0, 0);
+        int pair = highest(counts, 2, three, 0);
+        if (pair)
+            return 7u << CATEGORY_SHIFT | three << 4 | pair;
+    }
+    if (flush) {
+        if (straight_high[flush])
+            return 9u << CATEGORY_SHIFT | straight_high[flush];
+        return 6u << CATEGORY_SHIFT | top_five[flush];
+    }
+    if (straight_high[mask])
+        return 5u << CATEGORY_SHIFT | straight_high[mask];
+    if (trips) {
+        int three = highest(counts, 3, 0, 0);
+        return 4u << CATEGORY_SHIFT | three << 8 | top_values(mask & ~(1 << (three - 2)), 2);
+    }
+    if (pairs >= 2) {
+        int p1 = highest(counts, 2, 0, 0);
+        int p2 = highest(counts, 2, p1, 0);
+        return 3u << CATEGORY_SHIFT | p1 << 8 | p2 << 4 | highest(counts, 1, p1, p2);
+    }
+    if (pairs) {
+        int pair = highest(counts, 2, 0, 0);
+        return 2u << CATEGORY_SHIFT | pair << 12 | top_values(mask & ~(1 << (pair - 2)), 3);
+    }
+    return 1u << CATEGORY_SHIFT | top_five[mask];
+}
+
+int fe_rank(const char *cards, int n)
+{
+    uint32_t key = raw_rank((const unsigned char *)cards, n);
+    int lo = 0, hi = num_keys - 1;
+
+    while (lo <= hi) {
+        int mid = (lo + hi) / 2;
+        if (rank_keys[mid] < key) lo = mid + 1;
+        else if (rank_keys[mid] > key) hi = mid - 1;
+        else return mid + 1;
+    }
+    return 0;
+}
+
+void fe_rank_many(const char *cards, int count, int n, uint16_t *out)
+{
+    for (int i = 0; i < count; i++)
+        out[i] = (uint16_t)fe_rank(cards + i * n, n);
+}
+
+/* xorshift64*, good enough for sampling runouts */
+static uint64_t next_random(uint64_t *state)
+{
+    uint64_t x = *state;
+    x ^= x >> 12;
+    x ^= x << 25;
+    x ^= x >> 27;
+    *state = x;
+    return x * 0x2545F4914F6CDD1DULL;
+}
+
+/*
+ * Share of the pot `hero` wins against `villain` (two cards each, ties split)
+ * over runouts of `board`: every runout when `samples` is 0, otherwise
+ * `samples` random ones.
+ */
+double fe_equity(const char *hero, const char *villain, const char *board, int nboard,
+                 int samples, uint64_t seed)
+{
+    unsigned char live[52], hero_cards[7], villain_cards[7];
+    int used[52] = {0};
+    int nlive = 0, needed = 5 - nboard;
+    double won = 0.0, total = 0.0;
+
+    for (int i = 0; i < 2; i++) {
+        hero_cards[i] = (unsigned char)hero[i];
+        villain_cards[i] = (unsigned char)villain[i];
+        used[hero_cards[i]] = used[villain_cards[i]] = 1;
+    }
+    for (int i = 0; i < nboard; i++) {
+        hero_cards[2 + i] = villain_cards[2 + i] = (unsigned char)board[i];
+        used[(unsigned char)board[i]] = 1;
+    }
+    for (int c = 0; c < 52; c++)
+        if (!used[c])
+            live[nlive++] = (unsigned char)c;
+    if (needed < 0 || needed > nlive)
+        return 0.0;
+
+    if (samples > 0) {
+        uint64_t state = seed ? seed : 0x9E3779B97F4A7C15ULL;
+        for (int s = 0; s < samples; s++) {
+            /* Partial Fisher-Yates: the last `needed` slots become the runout */
+            for (int k = 0; k < needed; k++) {
+                int j = (int)(next_random(&state) % (uint64_t)(nlive - k));
+                unsigned char tmp = live[j];
+                live[j] = live[nlive - 1 - k];
+                live[nlive - 1 - k] = tmp;
+                hero_cards[2 + nboard + k] = villain_cards[2 + nboard + k] = tmp;
+            }
+            int h = fe_rank((const char *)hero_cards, 7), v = fe_rank((const char *)villain_cards, 7);
+            won += h > v ? 1.0 : h == v ? 0.5 : 0.0;
+            total += 1.0;
+        }
+    } else {
+        int idx[5];
+        for (int k = 0; k < needed; k++)
+            idx[k] = k;
+        for (;;) {
+            for (int k = 0; k < needed; k++)
+                hero_cards[2 + nboard + k] = villain_cards[2 + nboard + k] = live[idx[k]];
+            int h = fe_rank((const char *)hero_cards, 7), v = fe_rank((const char *)villain_cards, 7);
+            won += h > v ? 1.0 : h == v ? 0.5 : 0.0;
+            total += 1.0;
+
+            /* Next combination of `needed` live cards */
+            int k = needed - 1;
+            while (k >= 0 && idx[k] == nlive - needed + k)
+                k--;
+            if (k < 0)
+                break;
+            idx[k]++;
+            for (int j = k + 1; j < needed; j++)
+                idx[j] = idx[j - 1] + 1;
+        }
+    }
+    return total > 0.0 ? won / total : 0.0;
+}
@@ -0,0 +1,126 @@
+"""
+Betting figures of a hand, kept up to date as chips go in.
+
+A table (HoldemEngine, which the GUI drives too) holds one BettingState
+and tells it about every chip put in, raise, fold and new betting round.
+Each figure is then an O(1) read instead of a sum over the contributions or
+a scan of the seats:
+
+    pot                  every chip in this hand, antes and blinds included
+    current_bet          the bet to match this round
+    min_raise            the smallest raise: the big blind, or the largest raise this round
+    raise_count          raises this round
+    to_call(p)           what p needs to call, at most p's stack
+    raise_limits(p)      the smallest and largest raise p can make on top of the call
+    effective_stack(p)   the most p can bet this round that an opponent still in the hand can match
+
+Chips only move from a seat's stack to its bet within a round, so chips plus
+this round's bet is fixed per seat until the next round. The two deepest of
+those stacks are found once per round (and again if one of them folds),
+which is all effective_stack needs.
+
+The tables keep their pot, current_bet and raise_count attributes; they are
+properties reading and writing the BettingState (see forward()). The AI
+policies are passed the BettingState itself and size their raises from
+decision_figures(). Raises are held to raise_limits(): human_bet refuses one
+outside them, and the table moves an AI's raise size inside them.
+"""
+
+
+class BettingState:
+    def __init__(self, big_blind):
+        self.big_blind = big_blind
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise = big_blind
+        self.raise_count = 0
+        # The seats tracked, and the two deepest stacks (chips + this round's bet)
+        # still in the hand among them, as (stack, seat)
+        self.players = []
+        self.deepest = [(0, -1), (0, -1)]
+
+    def copy(self, players):
+        """A copy tracking ``players``, the copied table's seats."""
+        other = BettingState.__new__(BettingState)
+        other.__dict__.update(self.__dict__)
+        other.players = players
+        other.deepest = list(self.deepest)
+        return other
+
+    def start_hand(self):
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.raise_count = 0
+
+    def start_round(self, players):
+        """A new betting round; every seat's bet this round must be 0 (or the blinds)."""
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.raise_count = 0
+        self.track_stacks(players)
+
+    def track_stacks(self, players):
+        deepest = [(0, -1), (0, -1)]
+        for seat, p in enumerate(players):
+            if not p.folded:
+                stack = (p.chips + p.current_bet, seat)
+                if stack > deepest[0]:
+                    deepest = [stack, deepest[0]]
+                elif stack > deepest[1]:
+                    deepest[1] = stack
+        self.players = players
+        self.deepest = deepest
+
+    def add(self, amount):
+        """``amount`` chips went into the pot."""
+        self.pot += amount
+
+    def raise_by(self, amount):
+        """The bet to match went up by ``amount``."""
+        self.current_bet += amount
+        self.raise_count += 1
+        if amount > self.min_raise:
+            self.min_raise = amount
+
+    def fold(self, player):
+        if any(seat >= 0 and self.players[seat] is player for _, seat in self.deepest):
+            self.track_stacks(self.players)
+
+    def to_call(self, player):
+        return min(max(self.current_bet - player.current_bet, 0), player.chips)
+
+    def raise_limits(self, player):
+        """
+        (smallest, largest) raise ``player`` can make on top of the call. The
+        largest puts the player all-in, which is allowed even when it is
+        below min_raise; largest < 1 means no raise is possible.
+        """
+        largest = player.chips - self.to_call(player)
+        return min(self.min_raise, largest), largest
+
+    def effective_stack(self, player):
+        (stack, seat), (second, _) = self.deepest
+        deepest_other = second if seat >= 0 and self.players[seat] is player else stack
+        return max(min(player.chips + player.current_bet, deepest_other) - player.current_bet, 0)
+
+
+def decision_figures(betting, player, current_bet):
+    """
+    (to_call, min_raise, effective_stack) for ``player`` to decide on. With
+    no BettingState (a decision asked for away from a table) only the bet is
+    known: no minimum raise, and the player's whole stack.
+    """
+    if betting is None:
+        return min(max(current_bet - player.current_bet, 0), player.chips), 0, player.chips
+    return betting.to_call(player), betting.min_raise, betting.effective_stack(player)
+
+
+def forward(name):
+    """A table property reading and writing ``name`` of the table's BettingState."""
+    def get(table):
+        return getattr(table.betting, name)
+
+    def set_(table, value):
+        setattr(table.betting, name, value)
+    return property(get, set_)
@@ -0,0 +1,33 @@
+"""
+Builds the optional compiled evaluator (_fasteval_cffi) next to this file:
+
+    python build_fasteval.py
+
+Needs cffi and a C compiler. fasteval.py picks the extension up at import and
+falls back to the pure-Python evaluator without it.
+"""
+import os
+
+from cffi import FFI
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CDEF = """
+int fe_init(const uint32_t *keys, int n);
+int fe_rank(const char *cards, int n);
+void fe_rank_many(const char *cards, int count, int n, uint16_t *out);
+double fe_equity(const char *hero, const char *villain, const char *board, int nboard,
+                 int samples, uint64_t seed);
+"""
+
+ffibuilder = FFI()
+ffibuilder.cdef(CDEF)
+ffibuilder.set_source(
+    "_fasteval_cffi",
+    "#include <stdint.h>\n" + CDEF,
+    sources=[os.path.join(HERE, "_fasteval.c")],
+    extra_compile_args=["-O3"],
+)
+
+if __name__ == "__main__":
+    ffibuilder.compile(tmpdir=HERE, verbose=True)
@@ -0,0 +1,462 @@
+"""
+The "cfr" play style and its offline trainer.
+
+Training runs Monte Carlo counterfactual regret minimization (external
+sampling) on a small abstraction of the game:
+  - heads-up, with the table's 50/100 blinds; seat 0 posts the small blind,
+    acts first before the flop and last after it
+  - fold, call (or check) and raise by one big blind, with raise_count
+    capped at 2 per betting round like ai_decision_*; as on HoldemEngine, the
+    big blind gets no option once the small blind calls
+  - the cards reduced to NUM_BUCKETS buckets per street: a hole card class
+    before the flop, the evaluator's hand category after it
+
+Regret and strategy sums are float64 arrays in two files memory-mapped by
+every worker process, so memory stays at the size of the tables however long
+training runs, and the files double as the checkpoint: training resumes from
+the iteration count in meta.json. Workers update the shared tables without
+locks; an update lost to a race is noise the sampling already tolerates.
+
+ai_decision_cfr plays from the average strategy, looked up by street,
+bucket, raise count and whether there's a bet to call.
+
+    python cfr_ai.py --iterations 200000 --workers 4
+"""
+import argparse
+import json
+import mmap
+import multiprocessing
+import os
+import random
+import threading
+import time
+from array import array
+
+from betting import decision_figures
+from texasholdem import (
+    AI_RAISE_AMOUNT, RANK_TUPLES, ai_decision_strategic, ai_random, ai_raise_size, evaluate_hand,
+    hand_rank,
+)
+
+STRATEGY_PATH = "cfr_tables"
+SMALL_BLIND = 50
+BIG_BLIND = 100
+MAX_RAISES = 2  # per betting round, as in ai_decision_*
+NUM_BUCKETS = 8
+# Bumped whenever card_bucket changes, so tables trained on other buckets aren't read
+BUCKETING = 2
+NUM_ACTIONS = 3
+FOLD, CALL, RAISE = range(NUM_ACTIONS)
+CHECKPOINT_ITERATIONS = 10000
+
+# Node kinds of the betting tree
+DECISION, FOLDED, SHOWDOWN = range(3)
+BOARD_SIZES = [0, 3, 4, 5]  # community cards on each street
+
+
+class BettingTree:
+    """
+    Every betting sequence of the abstract game, as flat lists indexed by
+    node. Decision nodes are numbered separately (decision[node]) and each
+    has NUM_BUCKETS information sets, one per card bucket of the seat to act.
+    """
+
+    def __init__(self):
+        self.kind = []
+        self.actor = []         # seat to act, or the seat that folded
+        self.street = []
+        self.raises = []        # raises so far this betting round
+        self.facing = []        # 1 if the actor has a bet to call
+        self.contrib = []       # (seat 0, seat 1) chips in the pot
+        self.children = []      # child node per action, -1 where not allowed
+        self.decision = []      # decision number, -1 for terminal nodes
+        self.num_decisions = 0
+        self.root = self._build(0, 0, 0, 0, (SMALL_BLIND, BIG_BLIND))
+
+    @property
+    def num_infosets(self):
+        return self.num_decisions * NUM_BUCKETS
+
+    def _node(self, kind, actor, street, raises, contrib):
+        self.kind.append(kind)
+        self.actor.append(actor)
+        self.street.append(street)
+        self.raises.append(raises)
+        self.facing.append(1 if contrib[actor] < contrib[1 - actor] else 0)
+        self.contrib.append(contrib)
+        self.children.append([-1] * NUM_ACTIONS)
+        if kind == DECISION:
+            self.decision.append(self.num_decisions)
+            self.num_decisions += 1
+        else:
+            self.decision.append(-1)
+        return len(self.kind) - 1
+
+    def _build(self, street, actor, raises, acted, contrib):
+        node = self._node(DECISION, actor, street, raises, contrib)
+        other = 1 - actor
+        children = self.children[node]
+        if contrib[actor] < contrib[other]:
+            children[FOLD] = self._node(FOLDED, actor, street, raises, contrib)
+
+        called = list(contrib)
+        called[actor] = contrib[other]
+        called = tuple(called)
+        # Preflop a call always closes the round (the big blind has no option);
+        # after the flop the first check passes the action on
+        if street == 0 or acted:
+            if street == 3:
+                children[CALL] = self._node(SHOWDOWN, actor, street, raises, called)
+            else:
+                # Seat 1, the big blind, acts first after the flop
+                children[CALL] = self._build(street + 1, 1, 0, 0, called)
+        else:
+            children[CALL] = self._build(street, other, raises, acted + 1, called)
+
+        if raises < MAX_RAISES:
+            raised = list(contrib)
+            raised[actor] = contrib[other] + BIG_BLIND
+            children[RAISE] = self._build(street, other, raises + 1, acted + 1, tuple(raised))
+        return node
+
+
+_tree = None
+
+
+def betting_tree():
+    global _tree
+    if _tree is None:
+        _tree = BettingTree()
+    return _tree
+
+
+def card_bucket(hole, board):
+    """
+    Bucket (0 to NUM_BUCKETS - 1, stronger higher) of two hole card ids on a
+    board of 0, 3, 4 or 5 card ids (ids are positions in engine.DECK_ORDER).
+    """
+    if not board:
+        high, low = max(hole[0] % 13, hole[1] % 13), min(hole[0] % 13, hole[1] % 13)
+        if high == low:
+            return 7 if high >= 8 else 6 if high >= 4 else 5  # TT+, 66-99, 22-55
+        score = high + low + (2 if hole[0] // 13 == hole[1] // 13 else 0) + (1 if high - low == 1 else 0)
+        return 4 if score >= 19 else 3 if score >= 15 else 2 if score >= 11 else 1 if score >= 7 else 0
+    return rank_bucket(RANK_TUPLES[_rank_ids(list(hole) + list(board))])
+
+
+def rank_bucket(rank):
+    """Bucket of a hand after the flop, from its rank_tuple."""
+    category = rank[0]
+    if category == 1:
+        return 0
+    if category == 2:
+        return 2 if rank[1] >= 10 else 1  # pair of tens or better
+    return min(category, 7)  # two pair, trips, straight, flush, full house or better
+
+
+def _rank_ids(ids):
+    from engine import DECK_ORDER
+    return hand_rank([DECK_ORDER[i] for i in ids])
+
+
+class StrategyTables:
+    """
+    Regret and strategy sums for every information set, memory-mapped from
+    ``path``/regrets.f64 and ``path``/strategy.f64. meta.json records the
+    iterations trained and the shape of the tables.
+    """
+
+    def __init__(self, path, num_infosets, create=False):
+        self.path = path
+        self.size = num_infosets * NUM_ACTIONS
+        self.meta = {"iterations": 0, "infosets": num_infosets, "buckets": NUM_BUCKETS, "bucketing": BUCKETING}
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+            if (self.meta["infosets"] != num_infosets or self.meta["buckets"] != NUM_BUCKETS
+                    or self.meta.get("bucketing", 1) != BUCKETING):
+                raise ValueError(f"{path} holds tables for a different abstraction")
+        elif create:
+            os.makedirs(path, exist_ok=True)
+            self.write_meta()
+        else:
+            raise FileNotFoundError(f"No CFR tables in {path}")
+        self._maps = []
+        self.regrets = self._map("regrets.f64", create)
+        self.strategy = self._map("strategy.f64", create)
+
+    @property
+    def iterations(self):
+        return self.meta["iterations"]
+
+    def _map(self, name, create):
+        nbytes = self.size * 8
+        file_path = os.path.join(self.path, name)
+        if create and not os.path.exists(file_path):
+            with open(file_path, "wb") as f:
+                f.truncate(nbytes)
+        with open(file_path, "r+b") as f:
+            m = mmap.mmap(f.fileno(), nbytes)
+        self._maps.append(m)
+        return memoryview(m).cast("d")
+
+    def write_meta(self):
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def flush(self):
+        for m in self._maps:
+            m.flush()
+
+    def close(self):
+        self.flush()
+        self.regrets.release()
+        self.strategy.release()
+        for m in self._maps:
+            m.close()
+
+
+def _current_strategy(regrets, base, children):
+    """Regret matching over the allowed actions."""
+    strategy = [0.0] * NUM_ACTIONS
+    total = 0.0
+    for a in range(NUM_ACTIONS):
+        if children[a] >= 0:
+            r = regrets[base + a]
+            if r > 0:
+                strategy[a] = r
+                total += r
+    if total > 0:
+        return [s / total for s in strategy]
+    allowed = sum(1 for c in children if c >= 0)
+    return [1.0 / allowed if c >= 0 else 0.0 for c in children]
+
+
+def _traverse(tree, tables, node, traverser, buckets, winner, rng):
+    """Sampled counterfactual value of ``node`` for ``traverser``, updating the tables."""
+    kind = tree.kind[node]
+    contrib = tree.contrib[node]
+    if kind == FOLDED:
+        folder = tree.actor[node]
+        return -contrib[traverser] if folder == traverser else contrib[1 - traverser]
+    if kind == SHOWDOWN:
+        if winner < 0:
+            return 0
+        return contrib[1 - traverser] if winner == traverser else -contrib[traverser]
+
+    actor = tree.actor[node]
+    children = tree.children[node]
+    base = (tree.decision[node] * NUM_BUCKETS + buckets[actor][tree.street[node]]) * NUM_ACTIONS
+    strategy = _current_strategy(tables.regrets, base, children)
+
+    if actor != traverser:
+        # The opponent's actions are sampled, and their strategy averaged here
+        for a in range(NUM_ACTIONS):
+            tables.strategy[base + a] += strategy[a]
+        r = rng.random()
+        for a in range(NUM_ACTIONS):
+            if children[a] >= 0:
+                r -= strategy[a]
+                chosen = a
+                if r < 0:
+                    break
+        return _traverse(tree, tables, children[chosen], traverser, buckets, winner, rng)
+
+    values = [0.0] * NUM_ACTIONS
+    value = 0.0
+    for a in range(NUM_ACTIONS):
+        if children[a] >= 0:
+            values[a] = _traverse(tree, tables, children[a], traverser, buckets, winner, rng)
+            value += strategy[a] * values[a]
+    for a in range(NUM_ACTIONS):
+        if children[a] >= 0:
+            tables.regrets[base + a] += values[a] - value
+    return value
+
+
+def _deal(rng):
+    """Buckets per seat and street, and the showdown winner (-1 for a split)."""
+    ids = rng.sample(range(52), 9)
+    holes = [ids[0:2], ids[2:4]]
+    board = ids[4:9]
+    buckets = [[card_bucket(hole, board[:n]) for n in BOARD_SIZES] for hole in holes]
+    ranks = [_rank_ids(hole + board) for hole in holes]
+    winner = 0 if ranks[0] > ranks[1] else 1 if ranks[1] > ranks[0] else -1
+    return buckets, winner
+
+
+def _train_worker(args):
+    # Runs in a worker process on the shared, memory-mapped tables
+    path, iterations, seed = args
+    tree = betting_tree()
+    tables = StrategyTables(path, tree.num_infosets)
+    rng = random.Random(seed)
+    try:
+        for _ in range(iterations):
+            buckets, winner = _deal(rng)
+            for traverser in (0, 1):
+                _traverse(tree, tables, tree.root, traverser, buckets, winner, rng)
+    finally:
+        tables.close()
+    return iterations
+
+
+def train(path=STRATEGY_PATH, iterations=100000, workers=1, checkpoint=CHECKPOINT_ITERATIONS,
+          seed=None, progress=None):
+    """
+    Trains the tables in ``path`` (created if needed, resumed if not) up to
+    ``iterations`` deals. The tables are flushed and meta.json updated every
+    ``checkpoint`` iterations; ``progress`` is called with the count after
+    each. Returns the iterations trained.
+    """
+    tree = betting_tree()
+    tables = StrategyTables(path, tree.num_infosets, create=True)
+    seed = seed if seed is not None else random.randrange(2 ** 32)
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        while tables.iterations < iterations:
+            done = tables.iterations
+            chunk = min(checkpoint, iterations - done)
+            # Seeds depend on where the chunk starts, so a resumed run continues the sequence
+            jobs = [
+                (path, chunk // workers + (1 if w < chunk % workers else 0), seed * 1000003 + done + w)
+                for w in range(workers)
+            ]
+            if pool is None:
+                trained = sum(map(_train_worker, jobs))
+            else:
+                trained = sum(pool.map(_train_worker, jobs))
+            tables.flush()
+            tables.meta["iterations"] = done + trained
+            tables.write_meta()
+            if progress is not None:
+                progress(tables.iterations)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        tables.close()
+    return iterations
+
+
+class CfrPolicy:
+    """
+    The average strategy summed over the betting tree's nodes that share a
+    situation the real table can be matched to: street, bucket, raises this
+    round and whether there's a bet to call.
+    """
+
+    def __init__(self, path=STRATEGY_PATH):
+        tree = betting_tree()
+        tables = StrategyTables(path, tree.num_infosets)
+        self.iterations = tables.iterations
+        # situation -> summed strategy weights; situation = ((street * 3 + raises) * 2 + facing) * buckets + bucket
+        self.weights = array("d", bytes(8 * 4 * 3 * 2 * NUM_BUCKETS * NUM_ACTIONS))
+        try:
+            for node, decision in enumerate(tree.decision):
+                if decision < 0:
+                    continue
+                situation = (tree.street[node] * 3 + tree.raises[node]) * 2 + tree.facing[node]
+                for bucket in range(NUM_BUCKETS):
+                    src = (decision * NUM_BUCKETS + bucket) * NUM_ACTIONS
+                    dst = (situation * NUM_BUCKETS + bucket) * NUM_ACTIONS
+                    for a in range(NUM_ACTIONS):
+                        self.weights[dst + a] += tables.strategy[src + a]
+        finally:
+            tables.close()
+
+    def probabilities(self, street, bucket, raises, facing):
+        situation = (street * 3 + min(raises, MAX_RAISES)) * 2 + (1 if facing else 0)
+        base = (situation * NUM_BUCKETS + bucket) * NUM_ACTIONS
+        weights = list(self.weights[base:base + NUM_ACTIONS])
+        if not facing:
+            weights[FOLD] = 0.0
+        if raises >= MAX_RAISES:
+            weights[RAISE] = 0.0
+        total = sum(weights)
+        if total <= 0:
+            # A situation training never reached: call
+            return [0.0, 1.0, 0.0]
+        return [w / total for w in weights]
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def load_policy(path=STRATEGY_PATH):
+    """
+    The CfrPolicy trained in ``path``, or None if there are no tables there.
+    Only a loaded policy is kept, so a later call finds tables trained in the
+    meantime.
+    """
+    policy = _policies.get(path)
+    if policy is None:
+        with _policies_lock:
+            # Tables playing on other threads map each path only once
+            policy = _policies.get(path)
+            if policy is None:
+                try:
+                    policy = _policies[path] = CfrPolicy(path)
+                except FileNotFoundError:
+                    return None
+    return policy
+
+
+def ai_decision_cfr(player, community_cards, current_bet, pot, stage, raise_count,
+                    game=None, path=STRATEGY_PATH, betting=None):
+    policy = load_policy(path)
+    if policy is None:
+        # Nothing trained yet, so play like the strategic style
+        return ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count,
+                                     betting=betting)
+
+    street = BOARD_SIZES.index(len(community_cards))
+    bucket = card_bucket([c.id for c in player.cards], [c.id for c in community_cards])
+    facing = current_bet > player.current_bet
+    probabilities = policy.probabilities(street, bucket, raise_count, facing)
+
+    r = ai_random.random()
+    if r < probabilities[FOLD]:
+        return "fold", 0
+    if r < probabilities[FOLD] + probabilities[CALL]:
+        return "call", 0
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
+    if player.chips > to_call + AI_RAISE_AMOUNT and raise_count < MAX_RAISES:
+        hand_strength = evaluate_hand(player.cards, community_cards)
+        return "raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack)
+    if player.chips > to_call:
+        return "call", 0
+    return "all-in", 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the cfr play style's strategy tables.")
+    parser.add_argument("--path", default=STRATEGY_PATH, help="directory for the tables")
+    parser.add_argument("--iterations", type=int, default=100000, help="total deals to train to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", type=int, default=CHECKPOINT_ITERATIONS,
+                        help="iterations between checkpoints")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(done):
+        elapsed = time.perf_counter() - start
+        print(f"{done} iterations ({elapsed:.1f} s)", flush=True)
+
+    train(args.path, args.iterations, args.workers, args.checkpoint, args.seed, progress)
+
+    policy = CfrPolicy(args.path)
+    print("Preflop, first to act: fold/call/raise by bucket")
+    for bucket in range(NUM_BUCKETS):
+        probabilities = policy.probabilities(0, bucket, 0, True)
+        print(f"  {bucket}: " + " ".join(f"{p:.2f}" for p in probabilities))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Columnar export of simulation results.
+
+Rows are collected into preallocated typed columns (array.array, one per
+field) and flushed every ``chunk_rows`` rows, so memory doesn't grow with
+the number of hands. With pyarrow installed the chunks become row groups of
+a Parquet file; otherwise each column is written to its own NumPy .npy file
+(no NumPy needed to write them) next to a columns.json describing the codes.
+Either loads in one call: pyarrow.parquet.read_table(path), or
+numpy.load(path + "/pot.npy", mmap_mode="r") / load_npy(path). map_npy() maps
+any .npy written here (1-d or 2-d) into memory without NumPy or a copy.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+CHUNK_ROWS = 65536
+
+# array typecode -> .npy dtype (without byte order) and pyarrow type name
+TYPECODES = {
+    "b": ("i1", "int8"),
+    "B": ("u1", "uint8"),
+    "h": ("i2", "int16"),
+    "H": ("u2", "uint16"),
+    "i": ("i4", "int32"),
+    "I": ("u4", "uint32"),
+    "q": ("i8", "int64"),
+    "f": ("f4", "float32"),
+    "d": ("f8", "float64"),
+}
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_SIZE = 128  # room for any row count, so the header can be rewritten in place
+
+
+class ColumnBuffer:
+    """
+    Typed columns for ``schema``, a list of (name, array typecode). ``sink``
+    gets flush(columns, count) with every full chunk and close() at the end.
+    """
+
+    def __init__(self, schema, sink, chunk_rows=CHUNK_ROWS):
+        self.schema = list(schema)
+        self.sink = sink
+        self.chunk_rows = chunk_rows
+        self.columns = [array(code, bytes(array(code).itemsize * chunk_rows)) for _, code in self.schema]
+        self.count = 0
+        self.rows = 0
+
+    def append(self, values):
+        """``values`` in schema order."""
+        i = self.count
+        for column, value in zip(self.columns, values):
+            column[i] = value
+        self.count += 1
+        if self.count == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.sink.flush(self.columns, self.count)
+            self.rows += self.count
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        self.sink.close()
+        return self.rows
+
+
+def _byte_order():
+    return "<" if sys.byteorder == "little" else ">"
+
+
+def _npy_header(code, shape):
+    # shape: a row count, or a tuple of dimensions
+    shape = (shape,) if isinstance(shape, int) else tuple(shape)
+    descr = _byte_order() + TYPECODES[code][0]
+    text = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape!r}, }}"
+    text = text.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - 1) + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(text)) + text.encode("latin1")
+
+
+class NpySink:
+    """One .npy file per column in ``directory``, plus columns.json with ``metadata``."""
+
+    def __init__(self, directory, schema, metadata=None):
+        self.directory = directory
+        self.schema = list(schema)
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+        self.files = []
+        for name, code in self.schema:
+            f = open(os.path.join(directory, name + ".npy"), "wb")
+            f.write(_npy_header(code, 0))
+            self.files.append(f)
+        with open(os.path.join(directory, "columns.json"), "w") as f:
+            json.dump({"columns": self.schema, "metadata": metadata or {}}, f)
+
+    def flush(self, columns, count):
+        for f, column in zip(self.files, columns):
+            f.write(memoryview(column)[:count])
+        self.rows += count
+
+    def close(self):
+        # The row count is only known now
+        for f, (_, code) in zip(self.files, self.schema):
+            f.seek(0)
+            f.write(_npy_header(code, self.rows))
+            f.close()
+
+
+class ParquetSink:
+    """A Parquet file at ``path`` with one row group per flushed chunk."""
+
+    def __init__(self, path, schema, metadata=None):
+        self.schema = list(schema)
+        fields = [pyarrow.field(name, getattr(pyarrow, TYPECODES[code][1])()) for name, code in self.schema]
+        arrow_metadata = {key: json.dumps(value) for key, value in (metadata or {}).items()}
+        self.arrow_schema = pyarrow.schema(fields, metadata=arrow_metadata)
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.arrow_schema)
+
+    def flush(self, columns, count):
+        arrays = [
+            # Wraps the column's memory without copying it
+            pyarrow.Array.from_buffers(field.type, count, [None, pyarrow.py_buffer(memoryview(column)[:count])])
+            for field, column in zip(self.arrow_schema, columns)
+        ]
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.arrow_schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_sink(path, schema, metadata=None, fmt=None):
+    """Parquet when pyarrow is available (or asked for), otherwise a directory of .npy files."""
+    if fmt is None:
+        fmt = "parquet" if pyarrow is not None else "npy"
+    if fmt == "parquet":
+        if pyarrow is None:
+            raise RuntimeError("Writing Parquet needs pyarrow; use the npy format instead")
+        return ParquetSink(path, schema, metadata)
+    return NpySink(path, schema, metadata)
+
+
+def write_npy(path, values, shape=None):
+    """
+    Writes the array.array ``values`` to the .npy file ``path`` with
+    ``shape`` (default: 1-d). The file is replaced in one step, so readers
+    never map a half-written one.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_npy_header(values.typecode, shape if shape is not None else len(values)))
+        values.tofile(f)
+    os.replace(tmp, path)
+
+
+def _read_npy_header(f, path):
+    # (array typecode, byte order, shape) of a version 1 .npy file, leaving f at the data
+    if f.read(len(NPY_MAGIC)) != NPY_MAGIC:
+        raise ValueError(f"{path} is not a version 1 .npy file")
+    (header_len,) = struct.unpack("<H", f.read(2))
+    header = f.read(header_len).decode("latin1")
+    descr = header.split("'descr': '")[1].split("'")[0]
+    code = next(c for c, (dtype, _) in TYPECODES.items() if dtype == descr[1:])
+    shape = header.split("'shape': (")[1].split(")")[0]
+    return code, descr[0], tuple(int(n) for n in shape.split(",") if n.strip())
+
+
+def read_npy(path):
+    """Reads a 1-d .npy column written by NpySink into an array.array."""
+    with open(path, "rb") as f:
+        code, byte_order, _ = _read_npy_header(f, path)
+        column = array(code)
+        column.frombytes(f.read())
+    if byte_order != _byte_order():
+        column.byteswap()
+    return column
+
+
+def map_npy(path):
+    """
+    Maps a .npy file written here into memory: returns (a flat memoryview of
+    its values, its shape). Nothing is read up front, and every process
+    mapping the file shares the same page-cached copy.
+    """
+    with open(path, "rb") as f:
+        code, byte_order, shape = _read_npy_header(f, path)
+        offset = f.tell()
+        if byte_order != _byte_order():
+            raise ValueError(f"{path} was written with the other byte order")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[offset:].cast(code), shape
+
+
+def load_npy(directory):
+    """Columns written by NpySink: (dict of name -> array.array, metadata)."""
+    with open(os.path.join(directory, "columns.json")) as f:
+        info = json.load(f)
+    columns = {name: read_npy(os.path.join(directory, name + ".npy")) for name, _ in info["columns"]}
+    return columns, info["metadata"]
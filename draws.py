@@ -0,0 +1,174 @@
+"""
+Board texture and draw analysis.
+
+evaluate_hand only reports the made hand, so a flush draw looks like high
+card. analyze_draws() adds what the hand can still become: flush draws,
+open-ended and gutshot straight draws, the number of outs and the chance of
+hitting one by the river. Straight draws come from rank-mask tables built on
+texasholdem.STRAIGHT_HIGH (the table behind check_straight), so an analysis
+costs a handful of table lookups.
+"""
+from texasholdem import MASK_VALUES, RANK_VALUES, STRAIGHT_HIGH, SUITS, rank_mask
+
+# Every 5-rank window that makes a straight, ace-low included
+STRAIGHT_WINDOWS = [0b11111 << low for low in range(9)] + [0b1000000001111]
+
+def _build_straight_outs():
+    table = [0] * 8192
+    bits = [1 << r for r in range(13)]
+    for mask in range(8192):
+        high = STRAIGHT_HIGH[mask]
+        outs = 0
+        for bit in bits:
+            if not mask & bit and STRAIGHT_HIGH[mask | bit] > high:
+                outs |= bit
+        table[mask] = outs
+    return table
+
+# STRAIGHT_OUTS[mask]: ranks (as a mask) that would give the mask a better straight
+STRAIGHT_OUTS = _build_straight_outs()
+POPCOUNT = [len(values) for values in MASK_VALUES]
+
+
+class BoardTexture:
+    def __init__(self, paired, trips, max_suited, straight_possible, high_card):
+        self.paired = paired            # at least two cards of one rank
+        self.trips = trips              # at least three cards of one rank
+        self.max_suited = max_suited    # most cards of any one suit
+        self.straight_possible = straight_possible  # three or more cards within a straight window
+        self.high_card = high_card
+
+    @property
+    def flush_possible(self):
+        return self.max_suited >= 3
+
+    @property
+    def rainbow(self):
+        return self.max_suited <= 1
+
+
+class DrawInfo:
+    def __init__(self, made_straight, made_flush, flush_draw, backdoor_flush, straight_draw,
+                 outs, improve_probability, board):
+        self.made_straight = made_straight
+        self.made_flush = made_flush
+        self.flush_draw = flush_draw
+        self.backdoor_flush = backdoor_flush
+        self.straight_draw = straight_draw  # "open-ended", "double gutshot", "gutshot" or None
+        self.outs = outs
+        self.improve_probability = improve_probability  # to hit an out by the river
+        self.board = board
+
+
+def _rank_counts(cards):
+    counts = [0] * 13
+    for c in cards:
+        counts[RANK_VALUES[c.rank] - 2] += 1
+    return counts
+
+
+def _suit_counts(cards):
+    counts = [0] * 4
+    for c in cards:
+        counts[SUITS.index(c.suit)] += 1
+    return counts
+
+
+def analyze_board(community_cards):
+    counts = _rank_counts(community_cards)
+    mask = rank_mask(RANK_VALUES[c.rank] for c in community_cards)
+    most = max(counts) if community_cards else 0
+    return BoardTexture(
+        paired=most >= 2,
+        trips=most >= 3,
+        max_suited=max(_suit_counts(community_cards)),
+        straight_possible=any(POPCOUNT[mask & window] >= 3 for window in STRAIGHT_WINDOWS),
+        high_card=max((RANK_VALUES[c.rank] for c in community_cards), default=0),
+    )
+
+
+def hit_probability(outs, unseen, cards_to_come):
+    """Chance that at least one of ``outs`` shows up among the next ``cards_to_come`` cards."""
+    if outs <= 0 or cards_to_come <= 0 or unseen <= 0:
+        return 0.0
+    miss = 1.0
+    for i in range(cards_to_come):
+        miss *= (unseen - outs - i) / (unseen - i)
+    return 1.0 - max(0.0, miss)
+
+
+def analyze_draws(cards, community_cards):
+    """Draws for hole ``cards`` on ``community_cards`` (outs only count once the flop is out)."""
+    known = list(cards) + list(community_cards)
+    counts = _rank_counts(known)
+    suits = _suit_counts(known)
+    hole_suits = _suit_counts(cards)
+    all_mask = rank_mask(RANK_VALUES[c.rank] for c in known)
+    board_mask = rank_mask(RANK_VALUES[c.rank] for c in community_cards)
+    cards_to_come = 5 - len(community_cards) if len(community_cards) >= 3 else 0
+
+    made_straight = STRAIGHT_HIGH[all_mask] > 0
+    made_flush = max(suits) >= 5
+
+    # A draw needs at least one hole card in the flush suit
+    flush_suit = None
+    backdoor_flush = False
+    for s in range(4):
+        if suits[s] == 4 and hole_suits[s] and not made_flush:
+            flush_suit = s
+        elif suits[s] == 3 and hole_suits[s] and cards_to_come == 2:
+            backdoor_flush = True
+
+    # Out ranks must give a better straight than the board would give everyone
+    out_ranks = 0
+    if cards_to_come:
+        candidates = STRAIGHT_OUTS[all_mask]
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            if STRAIGHT_HIGH[all_mask | bit] > STRAIGHT_HIGH[board_mask | bit]:
+                out_ranks |= bit
+
+    straight_draw = None
+    n_out_ranks = POPCOUNT[out_ranks]
+    if n_out_ranks >= 2:
+        low = (out_ranks & -out_ranks).bit_length() - 1
+        high = out_ranks.bit_length() - 1
+        # Both ends of a four-card run are five ranks apart
+        straight_draw = "open-ended" if n_out_ranks == 2 and high - low == 5 else "double gutshot"
+    elif n_out_ranks == 1:
+        straight_draw = "gutshot"
+
+    outs = 0
+    if flush_suit is not None:
+        outs += 13 - suits[flush_suit]
+        seen = {RANK_VALUES[c.rank] - 2 for c in known if SUITS.index(c.suit) == flush_suit}
+    for r in range(13):
+        if out_ranks >> r & 1:
+            outs += 4 - counts[r]
+            if flush_suit is not None and r not in seen:
+                outs -= 1  # already counted as a flush out
+
+    unseen = 52 - len(known)
+    return DrawInfo(
+        made_straight=made_straight,
+        made_flush=made_flush,
+        flush_draw=flush_suit is not None,
+        backdoor_flush=backdoor_flush,
+        straight_draw=straight_draw,
+        outs=outs,
+        improve_probability=hit_probability(outs, unseen, cards_to_come),
+        board=analyze_board(community_cards),
+    )
+
+
+def worth_drawing(cards, community_cards, to_call, pot):
+    """True when the chance of completing a draw beats the price of calling."""
+    if len(community_cards) not in (3, 4):
+        return False
+    draws = analyze_draws(cards, community_cards)
+    if not draws.outs:
+        return False
+    if to_call <= 0:
+        return True
+    return draws.improve_probability >= to_call / (pot + to_call)
@@ -0,0 +1,701 @@
+"""
+Headless Texas Hold'em table.
+
+HoldemEngine runs the hand flow (blinds, betting rounds, side pots,
+showdown) without tkinter or timers, so a table can be driven by the GUI, a
+network client, a script or a simulator. Seats flagged ``is_human`` wait
+for human_call/human_fold/human_bet/human_all_in; every other seat plays
+through ai_decision.
+
+By default the AI seats act as soon as it is their turn. A table created
+with ``autoplay=False`` (the GUI, which paces the AI seats) only moves when
+step() is called.
+"""
+import os
+import random
+import struct
+
+import betting
+from opponent_stats import TableStats
+from texasholdem import (
+    SUITS, RANKS, Card, Player, ai_decision, build_side_pots,
+    default_players, hand_description, hand_rank,
+)
+
+# The 52 cards in Deck order. Cards are never mutated, so every table shares these.
+DECK_ORDER = [
+    Card(rank, suit, os.path.join("cards", f"{rank}_of_{suit}.png"))
+    for suit in SUITS
+    for rank in RANKS
+]
+
+# Cards are identified on the wire and in snapshots by their position in DECK_ORDER.
+CARD_INDEX = {card: i for i, card in enumerate(DECK_ORDER)}
+
+STAGES = ["preflop", "flop", "turn", "river", "showdown"]
+
+# Snapshot layout (little-endian):
+#   header, then per player: _snapshot_player, name, play style, last action, hole cards,
+#   then community cards, deck remainder, players_to_act seats, side pots, status text.
+# Text is a 2-byte length + utf-8 (cut at MAX_SNAPSHOT_TEXT bytes), card lists a count
+# byte + one byte per card. Bump SNAPSHOT_VERSION whenever the layout changes.
+SNAPSHOT_MAGIC = b"THS"
+SNAPSHOT_VERSION = 4
+# magic, version, small blind, big blind, ante, dealer, current player, pot, current bet,
+# minimum raise, raise count, stage, flags, player count
+_snapshot_header = struct.Struct("<3sBIIIHHIIIBBBB")
+_snapshot_text_length = struct.Struct("<H")
+MAX_SNAPSHOT_TEXT = 0xFFFF
+# chips, current bet, contribution, flags
+_snapshot_player = struct.Struct("<IIIB")
+# amount, seat bit mask
+_snapshot_side_pot = struct.Struct("<II")
+
+
+class HoldemEngine:
+    # Kept by self.betting (see betting.py)
+    pot = betting.forward("pot")
+    current_bet = betting.forward("current_bet")
+    raise_count = betting.forward("raise_count")
+    # A new blind level (see tournament.py) sets the minimum raise from the next hand on
+    big_blind = betting.forward("big_blind")
+
+    def __init__(self, players=None, small_blind=50, big_blind=100, dealer_index=0,
+                 rng=None, on_update=None, stats=None, ante=0, decide=None, autoplay=True):
+        self.players = players if players is not None else default_players()
+        self.betting = betting.BettingState(big_blind)
+        self.dealer_index = dealer_index
+        self.small_blind = small_blind
+        self.ante = ante
+        self.rng = rng if rng is not None else random.Random()
+        # Called with the engine wherever the GUI would redraw.
+        self.on_update = on_update
+        # Picks the AI seats' actions; anything with ai_decision's signature,
+        # such as policy_tables.policy_decision.
+        self.decide = decide if decide is not None else ai_decision
+        self.autoplay = autoplay
+
+        self.deck = []
+        self.current_player_index = 0
+        self.community_cards = []
+        self.pot = 0
+        self.current_bet = 0
+        self.stage = "preflop"
+        self.betting_completed = False
+        self.hand_over = False
+        self.status = ""
+
+        self.player_contributions = [0 for _ in self.players]
+        self.side_pots = []
+
+        self.human_turn = False
+        self.players_to_act = []
+        self.raise_count = 0
+        self.stats = stats if stats is not None else TableStats()
+
+    def clone(self, rng=None):
+        """
+        Cheap copy for search and what-if play: players are copied shallowly,
+        cards are shared and the copy has no on_update callback or stats.
+        """
+        other = HoldemEngine.__new__(HoldemEngine)
+        other.__dict__.update(self.__dict__)
+        other.players = [p.copy() for p in self.players]
+        if rng is not None:
+            other.rng = rng
+        other.on_update = None
+        other.stats = None
+        other.betting = self.betting.copy(other.players)
+        other.deck = list(self.deck)
+        other.community_cards = list(self.community_cards)
+        other.player_contributions = list(self.player_contributions)
+        seat = {id(p): i for i, p in enumerate(self.players)}
+        other.players_to_act = [other.players[seat[id(p)]] for p in self.players_to_act]
+        other.side_pots = [
+            {'players': [other.players[seat[id(p)]] for p in pot['players']],
+             'amount': pot['amount']}
+            for pot in self.side_pots
+        ]
+        return other
+
+    def snapshot(self):
+        """Serializes the whole table into a compact versioned binary blob."""
+        flags = (self.betting_completed << 0) | (self.hand_over << 1) | (self.human_turn << 2)
+        out = bytearray(_snapshot_header.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.small_blind, self.big_blind, self.ante,
+            self.dealer_index, self.current_player_index, self.pot, self.current_bet,
+            self.betting.min_raise, self.raise_count, STAGES.index(self.stage), flags, len(self.players)
+        ))
+        for i, p in enumerate(self.players):
+            out += _snapshot_player.pack(
+                p.chips, p.current_bet, self.player_contributions[i],
+                (p.folded << 0) | (p.is_human << 1)
+            )
+            _pack_text(out, p.name)
+            _pack_text(out, p.play_style)
+            _pack_text(out, p.last_action)
+            _pack_cards(out, p.cards)
+        _pack_cards(out, self.community_cards)
+        _pack_cards(out, self.deck)
+        seats = [self.players.index(p) for p in self.players_to_act]
+        out.append(len(seats))
+        out += bytes(seats)
+        out.append(len(self.side_pots))
+        for pot in self.side_pots:
+            mask = 0
+            for p in pot['players']:
+                mask |= 1 << self.players.index(p)
+            out += _snapshot_side_pot.pack(pot['amount'], mask)
+        _pack_text(out, self.status)
+        return bytes(out)
+
+    @classmethod
+    def from_snapshot(cls, data, rng=None, on_update=None):
+        """Rebuilds a table from snapshot(). Raises ValueError for foreign, newer or damaged data."""
+        if data[:3] != SNAPSHOT_MAGIC:
+            raise ValueError("Not a table snapshot")
+        if len(data) < _snapshot_header.size:
+            raise ValueError("Snapshot is truncated")
+        if data[3] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data[3]}")
+        try:
+            return cls._read_snapshot(data, rng, on_update)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"Snapshot is truncated or damaged ({e})") from None
+
+    @classmethod
+    def _read_snapshot(cls, data, rng, on_update):
+        (magic, version, small_blind, big_blind, ante, dealer_index, current_player_index, pot,
+         current_bet, min_raise, raise_count, stage, flags, count) = _snapshot_header.unpack_from(data, 0)
+        pos = _snapshot_header.size
+
+        players = []
+        contributions = []
+        for _ in range(count):
+            chips, current_bet_p, contribution, pflags = _snapshot_player.unpack_from(data, pos)
+            pos += _snapshot_player.size
+            name, pos = _unpack_text(data, pos)
+            play_style, pos = _unpack_text(data, pos)
+            p = Player(name, chips, is_human=bool(pflags & 2), play_style=play_style)
+            p.current_bet = current_bet_p
+            p.folded = bool(pflags & 1)
+            p.last_action, pos = _unpack_text(data, pos)
+            p.cards, pos = _unpack_cards(data, pos)
+            players.append(p)
+            contributions.append(contribution)
+
+        engine = cls(players, small_blind, big_blind, dealer_index, rng=rng, on_update=on_update,
+                     ante=ante)
+        engine.player_contributions = contributions
+        engine.current_player_index = current_player_index
+        engine.pot = pot
+        engine.current_bet = current_bet
+        engine.betting.min_raise = min_raise
+        engine.raise_count = raise_count
+        engine.stage = STAGES[stage]
+        engine.betting_completed = bool(flags & 1)
+        engine.hand_over = bool(flags & 2)
+        engine.human_turn = bool(flags & 4)
+        engine.community_cards, pos = _unpack_cards(data, pos)
+        engine.deck, pos = _unpack_cards(data, pos)
+        n = data[pos]
+        engine.players_to_act = [players[i] for i in data[pos + 1:pos + 1 + n]]
+        pos += 1 + n
+        n = data[pos]
+        pos += 1
+        for _ in range(n):
+            amount, mask = _snapshot_side_pot.unpack_from(data, pos)
+            pos += _snapshot_side_pot.size
+            engine.side_pots.append({
+                'players': [p for i, p in enumerate(players) if mask >> i & 1],
+                'amount': amount
+            })
+        engine.status, pos = _unpack_text(data, pos)
+        if pos != len(data):
+            raise IndexError(f"{len(data) - pos} bytes left over")
+        engine.betting.track_stacks(players)
+        return engine
+
+    def update_ui(self):
+        if self.on_update is not None:
+            self.on_update(self)
+
+    def reset_for_new_hand(self):
+        self.betting.start_hand()
+        self.stage = "preflop"
+        self.betting_completed = False
+        self.hand_over = False
+        self.human_turn = False
+        self.player_contributions = [0 for _ in self.players]
+        self.side_pots = []
+        self.players_to_act = []
+
+    def start_hand(self):
+        self.deck = list(DECK_ORDER)
+        self.rng.shuffle(self.deck)
+        for p in self.players:
+            p.reset_hand()
+        self.community_cards = []
+        self.reset_for_new_hand()
+
+        self.deal_hole_cards()
+        self.post_blinds()
+        if self.stats is not None:
+            self.stats.start_hand(self.players)
+        self.update_ui()
+
+        # Preflop: first to act is (dealer+3) % len(players)
+        self.current_player_index = (self.dealer_index + 3) % len(self.players)
+
+        # Players to act on preflop is all players except big blind
+        big_blind_player = self.players[(self.dealer_index + 2) % len(self.players)]
+        self.players_to_act = [
+            p for p in self.players if not p.folded and p != big_blind_player
+        ]
+        if self.autoplay:
+            self.run_betting_round()
+
+    def deal_hole_cards(self):
+        for _ in range(2):
+            for p in self.players:
+                p.cards.append(self.deck.pop())
+
+    def post_blinds(self):
+        if self.ante:
+            # Antes go straight into the pot; they don't count toward anyone's bet
+            for i, p in enumerate(self.players):
+                amount = min(self.ante, p.chips)
+                p.chips -= amount
+                self.player_contributions[i] += amount
+                self.betting.add(amount)
+        self.betting.start_round(self.players)
+        sb_player = self.players[(self.dealer_index + 1) % len(self.players)]
+        bb_player = self.players[(self.dealer_index + 2) % len(self.players)]
+
+        sb_amount = self.take_bet_from_player(sb_player, self.small_blind)
+        bb_amount = self.take_bet_from_player(bb_player, self.big_blind)
+        self.current_bet = self.big_blind
+        self.status = f"{sb_player.name} posts SB {sb_amount}, {bb_player.name} posts BB {bb_amount}"
+
+    def take_bet_from_player(self, player, amount):
+        actual = min(amount, player.chips)
+        player.chips -= actual
+        player.current_bet += actual
+        self.player_contributions[self.players.index(player)] += actual
+        self.betting.add(actual)
+        return actual
+
+    def run_betting_round(self):
+        """Plays AI turns until the human seat has to act or the hand is over."""
+        while self.step():
+            pass
+
+    def step(self):
+        """
+        Moves the hand on by one AI action, deal, skipped seat or settlement.
+        Returns False once the hand is over or the human seat has to act.
+        """
+        if self.hand_over or self.human_turn:
+            return False
+        active_players = [p for p in self.players if not p.folded]
+        if len(active_players) == 1:
+            self.single_player_win(active_players[0])
+            return False
+
+        if self.betting_completed:
+            self.next_stage()
+            return True
+
+        if not self.players_to_act:
+            self.betting_completed = True
+            return True
+
+        current_player = self.players[self.current_player_index]
+        if current_player.folded:
+            self.next_player()
+            return True
+
+        if current_player.is_human:
+            self.status = "Your turn. Choose an action. (Max 2 Raises Per Betting Round)"
+            self.human_turn = True
+            self.update_ui()
+            return False
+        self.process_ai_turn(current_player)
+        return True
+
+    def ai_to_act(self):
+        """The AI seat whose action the next step() plays, or None."""
+        if self.hand_over or self.human_turn or self.betting_completed or not self.players_to_act:
+            return None
+        player = self.players[self.current_player_index]
+        if player.folded or player.is_human or sum(not p.folded for p in self.players) == 1:
+            return None
+        return player
+
+    def process_ai_turn(self, current_player):
+        action, raise_amount = self.decide(
+            current_player, self.community_cards,
+            self.current_bet, self.pot, self.stage, self.raise_count, game=self, betting=self.betting
+        )
+        self.process_ai_action(current_player, action, raise_amount)
+
+    def process_ai_action(self, player, action, raise_amount):
+        required = self.current_bet - player.current_bet
+        raise_count = self.raise_count
+        if action == "fold":
+            self.fold_player(player)
+            self.status = f"{player.name} folds."
+        elif action == "call":
+            if required > 0:
+                if player.chips < required:
+                    all_in_amount = player.chips
+                    self.take_bet_from_player(player, all_in_amount)
+                    player.last_action = f"All-In {all_in_amount}"
+                    self.status = f"{player.name} goes all-in with {all_in_amount}."
+                else:
+                    self.take_bet_from_player(player, required)
+                    player.last_action = "Call"
+                    self.status = f"{player.name} calls {required}."
+            else:
+                player.last_action = "Check"
+                self.status = f"{player.name} checks."
+        elif action == "raise":
+            smallest, largest = self.betting.raise_limits(player)
+            if largest >= 1:
+                # Held to the limits human_bet enforces: at least the minimum
+                # raise, unless that is more than the player has left
+                raise_amount = min(max(raise_amount, smallest), largest)
+                if required > 0:
+                    self.take_bet_from_player(player, required)
+                extra = self.take_bet_from_player(player, raise_amount)
+                self.betting.raise_by(extra)
+                player.last_action = f"Raise {raise_amount}"
+                if player.chips:
+                    self.status = f"{player.name} raises by {raise_amount}"
+                else:
+                    self.status = f"{player.name} raises all-in by {raise_amount}"
+                # Everyone else must act again
+                self.players_to_act = [
+                    p for p in self.players if not p.folded and p != player
+                ]
+            else:
+                all_in_amount = player.chips
+                self.take_bet_from_player(player, all_in_amount)
+                player.last_action = f"All-In {all_in_amount}"
+                self.status = f"{player.name} all-in with {all_in_amount}."
+        elif action == "all-in":
+            all_in_amount = player.chips
+            self.take_bet_from_player(player, all_in_amount)
+            player.last_action = f"All-In {all_in_amount}"
+            self.status = f"{player.name} all-in with {all_in_amount}."
+
+        self.record_action(player, required, raise_count)
+        self.update_ui()
+        self.finish_action(player)
+
+    def record_action(self, player, required, raise_count):
+        if self.stats is not None:
+            self.stats.record_action(player, required, raise_count, self.stage)
+
+    def finish_action(self, player):
+        if player in self.players_to_act:
+            self.players_to_act.remove(player)
+
+        active_players = [p for p in self.players if not p.folded]
+        if len(active_players) == 1:
+            self.single_player_win(active_players[0])
+            return
+
+        # If all remaining players are all in, the betting round is over.
+        if all(p.chips == 0 for p in self.players if not p.folded):
+            self.betting_completed = True
+            return
+
+        self.next_player()
+
+    def fold_player(self, player):
+        player.fold()
+        self.betting.fold(player)
+
+    def update_pot(self):
+        # The betting code keeps the pot up to date; this recounts it from the contributions
+        self.pot = sum(self.player_contributions)
+
+    def next_player(self):
+        if self.check_betting_complete():
+            self.create_side_pots()
+            self.betting_completed = True
+            return
+
+        # Iterate through players until finding one who hasn't folded and is in players_to_act
+        for _ in range(len(self.players)):  # safeguard against infinite loop
+            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+            current = self.players[self.current_player_index]
+            if not current.folded and current in self.players_to_act:
+                break
+
+    def check_betting_complete(self):
+        active_players = [p for p in self.players if not p.folded]
+        if len(active_players) == 1:
+            return True
+        if not self.players_to_act:
+            return True
+        return False
+
+    def create_side_pots(self):
+        self.side_pots = build_side_pots(self.players, self.player_contributions)
+
+    def next_stage(self):
+        if self.stage == "preflop":
+            for _ in range(3):
+                self.community_cards.append(self.deck.pop())
+            self.stage = "flop"
+            if self.stats is not None:
+                self.stats.record_flop(self.players)
+        elif self.stage == "flop":
+            self.community_cards.append(self.deck.pop())
+            self.stage = "turn"
+        elif self.stage == "turn":
+            self.community_cards.append(self.deck.pop())
+            self.stage = "river"
+        elif self.stage == "river":
+            self.do_showdown()
+            return
+
+        # Reset bets each round
+        for p in self.players:
+            p.current_bet = 0
+            p.last_action = ""
+        self.betting.start_round(self.players)
+
+        self.betting_completed = False
+        self.status = f"Dealing {self.stage.capitalize()}. Pot: {self.pot}"
+        self.update_ui()
+
+        # Post-flop: first to act is the seat after the dealer
+        self.current_player_index = (self.dealer_index + 1) % len(self.players)
+        while self.players[self.current_player_index].folded:
+            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        self.players_to_act = [p for p in self.players if not p.folded]
+
+    def do_showdown(self):
+        self.stage = "showdown"
+        active_players = [p for p in self.players if not p.folded]
+
+        if len(active_players) == 1:
+            self.single_player_win(active_players[0])
+            return
+
+        player_values = {}
+        for p in active_players:
+            player_values[p] = hand_rank(p.cards + self.community_cards)
+
+        # Rebuild the pots from the final contributions so all-ins are settled too
+        self.create_side_pots()
+
+        pot_winners = set()
+        for side_pot in self.side_pots:
+            contenders = [p for p in side_pot['players'] if p in player_values]
+            if not contenders:
+                continue
+            best_value = None
+            winners = []
+            for p in contenders:
+                val = player_values[p]
+                if best_value is None or val > best_value:
+                    best_value = val
+                    winners = [p]
+                elif val == best_value:
+                    winners.append(p)
+            pot_winners.update(winners)
+
+            winning_hand_description = hand_description(best_value)
+            if len(winners) == 1:
+                winners[0].chips += side_pot['amount']
+                self.status = (
+                    f"{winners[0].name} wins {side_pot['amount']} chips with a {winning_hand_description}!"
+                )
+            else:
+                share = side_pot['amount'] // len(winners)
+                for w in winners:
+                    w.chips += share
+                # Odd chips go to the first winners in seat order
+                for w in winners[:side_pot['amount'] % len(winners)]:
+                    w.chips += 1
+                winner_names = ", ".join([w.name for w in winners])
+                self.status = (
+                    f"Split pot! {winner_names} each win {share} chips with a {winning_hand_description}!"
+                )
+
+        if self.stats is not None:
+            self.stats.record_showdown(self.players, pot_winners)
+            self.stats.end_hand(self.players)
+        self.hand_over = True
+        self.update_ui()
+
+    def single_player_win(self, player):
+        player.chips += self.pot
+        self.status = f"{player.name} wins {self.pot} chips!"
+        self.stage = "showdown"
+        if self.stats is not None:
+            self.stats.end_hand(self.players)
+        self.hand_over = True
+        self.update_ui()
+
+    def end_hand(self):
+        """Moves the button and deals the next hand."""
+        self.dealer_index = (self.dealer_index + 1) % len(self.players)
+        self.start_hand()
+
+    def human_player(self):
+        """Returns the human seat if it is waiting for input, otherwise None."""
+        if not self.human_turn:
+            return None
+        player = self.players[self.current_player_index]
+        if player.is_human and not player.folded:
+            return player
+        return None
+
+    def play_human_turn(self):
+        """
+        Plays the waiting human seat's turn as an AI seat of its play style
+        would (the GUI's fast-forward). Returns False if no human is waiting.
+        """
+        player = self.human_player()
+        if player is None:
+            return False
+        self.human_turn = False
+        self.process_ai_turn(player)
+        if self.autoplay:
+            self.run_betting_round()
+        return True
+
+    def finish_human_action(self, player):
+        self.human_turn = False
+        self.update_ui()
+        self.finish_action(player)
+        if self.autoplay:
+            self.run_betting_round()
+        return True
+
+    def raise_refusal(self, player):
+        """Why ``player`` can't raise now, or None if it can."""
+        if self.raise_count >= 2:
+            return "Maximum raises reached, choose call or fold."
+        if self.betting.raise_limits(player)[1] < 1:
+            return "You don't have the chips to raise, choose call or fold."
+        return None
+
+    def human_call(self):
+        player = self.human_player()
+        if player is None:
+            return False
+        required = self.current_bet - player.current_bet
+        if required > 0:
+            if player.chips < required:
+                all_in_amount = player.chips
+                self.take_bet_from_player(player, all_in_amount)
+                player.last_action = f"All-In {all_in_amount}"
+                self.status = "You go all-in!"
+            else:
+                self.take_bet_from_player(player, required)
+                player.last_action = "Call"
+                self.status = "You call."
+        else:
+            player.last_action = "Check"
+            self.status = "You check."
+        self.record_action(player, required, self.raise_count)
+        return self.finish_human_action(player)
+
+    def human_fold(self):
+        player = self.human_player()
+        if player is None:
+            return False
+        self.fold_player(player)
+        self.status = "You fold."
+        self.record_action(player, self.current_bet - player.current_bet, self.raise_count)
+        return self.finish_human_action(player)
+
+    def human_bet(self, bet_amount):
+        """Calls, then raises by ``bet_amount`` on top (see BettingState.raise_limits)."""
+        player = self.human_player()
+        if player is None:
+            return False
+        refusal = self.raise_refusal(player)
+        if refusal is not None:
+            self.status = refusal
+            return False
+        to_call = self.betting.to_call(player)
+        smallest, largest = self.betting.raise_limits(player)
+        if not smallest <= bet_amount <= largest:
+            self.status = f"Raise must be between {smallest} and {largest}"
+            self.status += f" on top of the call of {to_call}." if to_call else "."
+            return False
+        required = self.current_bet - player.current_bet
+        raise_count = self.raise_count
+        # Cover the call if needed
+        if to_call > 0:
+            self.take_bet_from_player(player, to_call)
+        extra = self.take_bet_from_player(player, bet_amount)
+        self.betting.raise_by(extra)
+        player.last_action = f"Raise {bet_amount}"
+        self.status = f"You raise by {bet_amount}." if player.chips else f"You raise all-in by {bet_amount}."
+        self.players_to_act = [p for p in self.players if not p.folded and p != player]
+        self.record_action(player, required, raise_count)
+        return self.finish_human_action(player)
+
+    def human_all_in(self):
+        player = self.human_player()
+        if player is None:
+            return False
+        all_in_amount = player.chips
+        if all_in_amount <= 0:
+            self.status = "You have no chips to go all-in."
+            return False
+        required = self.current_bet - player.current_bet
+        self.take_bet_from_player(player, all_in_amount)
+        player.last_action = f"All-In {all_in_amount}"
+        self.status = f"You go all-in with {all_in_amount}."
+        self.record_action(player, required, self.raise_count)
+        self.players_to_act = [p for p in self.players if not p.folded and p != player]
+        return self.finish_human_action(player)
+
+
+def _pack_text(out, text):
+    raw = text.encode("utf-8")
+    if len(raw) > MAX_SNAPSHOT_TEXT:
+        # Cut on a character boundary
+        raw = raw[:MAX_SNAPSHOT_TEXT].decode("utf-8", "ignore").encode("utf-8")
+    out += _snapshot_text_length.pack(len(raw))
+    out += raw
+
+
+def _unpack_text(data, pos):
+    (length,) = _snapshot_text_length.unpack_from(data, pos)
+    pos += _snapshot_text_length.size
+    if pos + length > len(data):
+        raise IndexError("text runs past the end")
+    return bytes(data[pos:pos + length]).decode("utf-8"), pos + length
+
+
+def _pack_cards(out, cards):
+    out.append(len(cards))
+    out += bytes(CARD_INDEX[c] for c in cards)
+
+
+def _unpack_cards(data, pos):
+    n = data[pos]
+    return [DECK_ORDER[i] for i in data[pos + 1:pos + 1 + n]], pos + 1 + n
+
+
+def save_checkpoint(engine, path):
+    """Writes a snapshot atomically, so an interrupted save keeps the previous checkpoint."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(engine.snapshot())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, rng=None, on_update=None):
+    with open(path, "rb") as f:
+        return HoldemEngine.from_snapshot(f.read(), rng=rng, on_update=on_update)
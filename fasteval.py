@@ -0,0 +1,134 @@
+"""
+Optional compiled backend for the hand evaluator.
+
+_fasteval.c ranks hands exactly like texasholdem.hand_rank and also runs batch
+ranking and heads-up equity loops, so long simulations don't pay the
+interpreter's cost per hand. It is built with cffi into the _fasteval_cffi
+extension (python build_fasteval.py, needs cffi and a C compiler). When the
+extension isn't there, everything here falls back to the pure-Python
+evaluator and returns the same results.
+
+Cards here are ids: positions in engine.DECK_ORDER, suit * 13 + rank index.
+
+    python fasteval.py    times the backend against the pure-Python evaluator
+    python -m pytest test_fasteval.py    checks that they agree
+"""
+import itertools
+import random
+import threading
+import time
+
+try:
+    from _fasteval_cffi import ffi, lib
+except ImportError:
+    ffi = lib = None
+
+BACKEND = "python" if lib is None else "cffi"
+EQUITY_SAMPLES = 0  # 0 enumerates every runout
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def load(raw_keys):
+    """
+    Hands the sorted raw rank keys over to the compiled evaluator. Returns a
+    hand_rank(cards) built on it, or None when there is no compiled backend.
+    """
+    global _initialized
+    if lib is None:
+        return None
+    if lib.fe_init(ffi.new("uint32_t[]", raw_keys), len(raw_keys)) != 0:
+        return None
+    _initialized = True
+
+    def native_hand_rank(cards):
+        return lib.fe_rank(bytes([c.id for c in cards]), len(cards))
+    return native_hand_rank
+
+
+def _use_native():
+    if lib is not None and not _initialized:
+        from texasholdem import _DENSE_RANK
+        with _init_lock:
+            # fe_init fills the C tables, so only one thread may run it
+            if not _initialized:
+                load(sorted(_DENSE_RANK))
+    return _initialized
+
+
+def _python_rank(ids):
+    from engine import DECK_ORDER
+    from texasholdem import python_hand_rank
+    return python_hand_rank([DECK_ORDER[i] for i in ids])
+
+
+def rank_ids(ids):
+    """Dense rank (1-7462) of five to seven card ids."""
+    if not _use_native():
+        return _python_rank(ids)
+    return lib.fe_rank(bytes(ids), len(ids))
+
+
+def rank_many(hands):
+    """Ranks for a batch of hands, all with the same number of cards."""
+    hands = [bytes(h) for h in hands]
+    if not hands:
+        return []
+    if not _use_native():
+        return [_python_rank(h) for h in hands]
+    out = ffi.new("uint16_t[]", len(hands))
+    lib.fe_rank_many(b"".join(hands), len(hands), len(hands[0]), out)
+    return list(out)
+
+
+def equity(hero, villain, board=(), samples=EQUITY_SAMPLES, seed=None):
+    """
+    Share of the pot ``hero`` wins against ``villain`` (two card ids each, ties
+    split) over every runout of ``board``, or ``samples`` random runouts.
+    """
+    if _use_native():
+        if seed is None:
+            seed = random.getrandbits(64)
+        return lib.fe_equity(bytes(hero), bytes(villain), bytes(board), len(board), samples, seed)
+    return _python_equity(hero, villain, board, samples, seed)
+
+
+def _python_equity(hero, villain, board, samples, seed):
+    used = set(hero) | set(villain) | set(board)
+    live = [c for c in range(52) if c not in used]
+    needed = 5 - len(board)
+    if samples > 0:
+        rng = random.Random(seed)
+        runouts = (rng.sample(live, needed) for _ in range(samples))
+    else:
+        runouts = itertools.combinations(live, needed)
+    won = 0.0
+    total = 0
+    for runout in runouts:
+        final_board = list(board) + list(runout)
+        h = _python_rank(list(hero) + final_board)
+        v = _python_rank(list(villain) + final_board)
+        won += 1.0 if h > v else 0.5 if h == v else 0.0
+        total += 1
+    return won / total if total else 0.0
+
+
+def main():
+    print(f"Backend: {BACKEND}")
+
+    rng = random.Random(1)
+    batch = [rng.sample(range(52), 7) for _ in range(20000)]
+    start = time.perf_counter()
+    for h in batch:
+        _python_rank(h)
+    python_rate = len(batch) / (time.perf_counter() - start)
+    print(f"pure Python: {python_rate:,.0f} hands/s")
+    if _initialized:
+        start = time.perf_counter()
+        rank_many(batch)
+        native_rate = len(batch) / (time.perf_counter() - start)
+        print(f"compiled:    {native_rate:,.0f} hands/s ({native_rate / python_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+"""
+Tkinter front end for the game in texasholdem.
+
+Only this module needs tkinter; it is loaded when the game is launched
+(python texasholdem.py or python holdem_gui.py) or when TexasHoldemGame is
+looked up on texasholdem.
+
+Fast-forward (the X key or button, or --fast-forward on the command line)
+cuts every pause to FAST_FORWARD_DELAY, plays your seat with its play style
+and deals each next hand straight away, so hundreds of hands go by; the
+table is still redrawn up to once per frame.
+"""
+import argparse
+import tkinter as tk
+from tkinter import font as tkFont, simpledialog
+import random
+import os
+import time
+
+from engine import HoldemEngine
+from texasholdem import RANKS, SUITS
+
+# Table and chip constants
+TABLE_COLOR = "#2F5D3D"
+CHIP_COLORS = ["black", "blue", "green", "red", "white"]
+CHIP_VALUES = {"black": 5, "blue": 10, "green": 20, "red": 50, "white": 100}
+CHIP_IMAGE_NAMES = {
+    "black": "black_chip.png",
+    "blue": "blue_chip.png",
+    "green": "green_chip.png",
+    "red": "red_chip.png",
+    "white": "white_chip.png",
+}
+CHIP_STACK_HEIGHT = 100
+CHIP_STACK_WIDTH = 90
+CHIP_STACK_LIMIT = 6  # Maximum chips in a stack
+MAX_STACKS_PER_PLAYER = 3 # Maximum Stacks allowed for each player
+
+# Timing, in milliseconds
+UPDATE_DELAY = 100
+MIN_AI_DELAY = 500
+MAX_AI_DELAY = 1500
+FRAME_INTERVAL = 16  # at most one redraw per frame, about 60 a second
+# Fast-forward's pause between steps. Not 0: Tk only repaints the window when
+# no timer is due, and a chain of 0 ms timers always has one due.
+FAST_FORWARD_DELAY = 1
+
+class TexasHoldemGame:
+    """
+    The table window. The game itself is a HoldemEngine, which this class
+    only draws and paces: AI seats act after a short pause, and the human
+    seat's buttons call the engine's human_* actions.
+    """
+
+    def __init__(self, root, engine=None):
+        self.root = root
+        self.root.geometry("1500x900")
+
+        self.engine = engine if engine is not None else HoldemEngine()
+        self.engine.on_update = self.on_engine_update
+        # The GUI schedules the AI turns itself, see advance()
+        self.engine.autoplay = False
+        self.continue_button = None
+
+        # Pauses between steps of play; set_fast_forward drops them
+        self.step_delay = UPDATE_DELAY
+        self.ai_delay = (MIN_AI_DELAY, MAX_AI_DELAY)
+        self.fast_forward = False
+        self.advance_pending = None
+        # update_ui only schedules a redraw; render draws the latest state once per frame
+        self.render_pending = None
+        self.last_render = 0.0
+
+        self.card_images = {}
+        self.card_back_image = None
+        self.load_images("cards")
+        
+        self.chip_images = {}
+        self.load_chip_images("chips")
+        self.chip_cache = {}
+        
+        self.setup_ui()
+        self.bind_keys()
+        self.start_hand()
+
+    def load_images(self, folder):
+        scale_factor = (3, 3)
+        back_path = os.path.join(folder, "card_back.png")
+        back_img = tk.PhotoImage(file=back_path).subsample(*scale_factor)
+        self.card_back_image = back_img
+
+        for suit in SUITS:
+            for rank in RANKS:
+                filename = f"{rank}_of_{suit}.png"
+                path = os.path.join(folder, filename)
+                img = tk.PhotoImage(file=path).subsample(*scale_factor)
+                self.card_images[(rank, suit)] = img
+
+    def load_chip_images(self, folder):
+        scale_factor = 5  # adjust if needed
+        for color, filename in CHIP_IMAGE_NAMES.items():
+            path = os.path.join(folder, filename)
+            if os.path.exists(path):
+                img = tk.PhotoImage(file=path).subsample(scale_factor)
+                self.chip_images[color] = img
+            else:
+                raise FileNotFoundError(f"Missing chip image: {path}")
+    
+    def get_chip_image(self, color):
+        if color not in self.chip_cache:
+            self.chip_cache[color] = self.chip_images.get(color)
+        return self.chip_cache[color]
+
+    def setup_ui(self):
+        self.root.title("♣︎ ♦︎ ♠︎ ♥︎ Texas Hold'em ♣︎ ♦︎ ♠︎ ♥︎")
+
+        bg_main = "#F0F0F0"
+        bg_info = "#F8F8F8"
+        bg_game = TABLE_COLOR
+        bg_player_frame = "#FFFFFF"
+        bg_community_frame = "#DDDDDD"
+        bg_action = "#D0D0D0"
+
+        self.bold_font = tkFont.Font(family="Helvetica", size=14, weight="bold")
+        self.status_font = tkFont.Font(family="Helvetica", size=18, slant="italic")
+
+        self.root.configure(bg=bg_main)
+
+        # Top info bar
+        self.info_frame = tk.Frame(self.root, bg=bg_info)
+        self.info_frame.pack(side=tk.TOP, fill=tk.X)
+        self.status_label = tk.Label(
+            self.info_frame, text="Welcome to Texas Hold'em!",
+            fg="black", bg=bg_info, font=self.status_font
+        )
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        # Action frame
+        self.action_frame = tk.Frame(self.root, bg=bg_action, bd=2, relief=tk.RAISED)
+        self.action_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=5)
+
+        self.call_button = tk.Button(
+            self.action_frame, text="Call/Check (C)",
+            command=self.human_call, bg="#C0C0C0", fg="black", state=tk.DISABLED
+        )
+        self.call_button.pack(side=tk.LEFT, padx=5)
+
+        self.fold_button = tk.Button(
+            self.action_frame, text="Fold (F)",
+            command=self.human_fold, bg="#C0C0C0", fg="black", state=tk.DISABLED
+        )
+        self.fold_button.pack(side=tk.LEFT, padx=5)
+
+        self.bet_button = tk.Button(
+            self.action_frame, text="Bet/Raise (B)",
+            command=self.human_bet, bg="#C0C0C0", fg="black", state=tk.DISABLED
+        )
+        self.bet_button.pack(side=tk.LEFT, padx=5)
+
+        self.all_in_button = tk.Button(
+            self.action_frame, text="All-In (A)",
+            command=self.human_all_in, bg="#C0C0C0", fg="black", state=tk.DISABLED
+        )
+        self.all_in_button.pack(side=tk.LEFT, padx=5)
+
+        self.fast_forward_button = tk.Button(
+            self.action_frame, text="Fast Forward (X)",
+            command=self.toggle_fast_forward, bg="#C0C0C0", fg="black"
+        )
+        self.fast_forward_button.pack(side=tk.RIGHT, padx=5)
+
+        # Main game area
+        self.game_frame = tk.Frame(self.root, bg=bg_game)
+        self.game_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Top area for community cards
+        top_area = tk.Frame(self.game_frame, bg=bg_game)
+        top_area.pack(side=tk.TOP, pady=10)
+
+        self.stage_label = tk.Label(top_area, text="Stage: Preflop", font=self.bold_font, fg="white", bg=bg_game)
+        self.stage_label.pack(side=tk.TOP, pady=5)
+
+        self.pot_label = tk.Label(top_area, text="Pot: 0", font=self.bold_font, fg="white", bg=bg_game)
+        self.pot_label.pack(side=tk.TOP, pady=5)
+
+        self.community_frame = tk.Frame(top_area, bd=2, relief=tk.RIDGE, bg=bg_community_frame, padx=5, pady=5)
+        self.community_frame.pack(side=tk.TOP, pady=10)
+
+        # Players frame
+        self.players_frame = tk.Frame(self.game_frame, bg=bg_game)
+        self.players_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
+
+        self.player_frames = []
+        for p in self.engine.players:
+            f = tk.Frame(self.players_frame, bd=2, relief=tk.GROOVE, bg=bg_player_frame, padx=5, pady=5)
+            f.pack(side=tk.LEFT, padx=5)
+            self.player_frames.append(f)
+
+    def bind_keys(self):
+        self.root.bind('<c>', lambda event: self.human_call())
+        self.root.bind('<C>', lambda event: self.human_call())
+        self.root.bind('<f>', lambda event: self.human_fold())
+        self.root.bind('<F>', lambda event: self.human_fold())
+        self.root.bind('<b>', lambda event: self.human_bet())
+        self.root.bind('<B>', lambda event: self.human_bet())
+        self.root.bind('<a>', lambda event: self.human_all_in())
+        self.root.bind('<A>', lambda event: self.human_all_in())
+        self.root.bind('<x>', lambda event: self.toggle_fast_forward())
+        self.root.bind('<X>', lambda event: self.toggle_fast_forward())
+        self.root.focus_set()
+
+    def start_hand(self):
+        self.engine.start_hand()
+        self.schedule_advance()
+
+    def schedule_advance(self):
+        """Plays the next step after a pause; an AI seat about to act pauses longer."""
+        if self.advance_pending is not None:
+            return
+        if self.engine.ai_to_act() is not None:
+            delay = random.randint(*self.ai_delay)
+        else:
+            delay = self.step_delay
+        self.advance_pending = self.root.after(delay, self.advance)
+
+    def advance(self):
+        self.advance_pending = None
+        engine = self.engine
+        if self.fast_forward:
+            if engine.hand_over:
+                self.end_hand()
+                return
+            if engine.play_human_turn():
+                self.schedule_advance()
+                return
+        if engine.step() or self.fast_forward:
+            self.schedule_advance()
+
+    def toggle_fast_forward(self):
+        self.set_fast_forward(not self.fast_forward)
+
+    def set_fast_forward(self, on):
+        self.fast_forward = on
+        if on:
+            self.step_delay = FAST_FORWARD_DELAY
+            self.ai_delay = (FAST_FORWARD_DELAY, FAST_FORWARD_DELAY)
+            self.fast_forward_button.config(text="Normal Speed (X)")
+            # Take over a hand that is waiting on you
+            self.schedule_advance()
+        else:
+            self.step_delay = UPDATE_DELAY
+            self.ai_delay = (MIN_AI_DELAY, MAX_AI_DELAY)
+            self.fast_forward_button.config(text="Fast Forward (X)")
+
+    def on_engine_update(self, engine):
+        self.update_ui()
+
+    def show_continue_button(self):
+        if self.continue_button is None:
+            self.continue_button = tk.Button(
+                self.action_frame, text="Continue",
+                command=self.end_hand, bg="#C0C0C0", fg="black"
+            )
+            self.continue_button.pack(side=tk.LEFT, padx=10)
+            self.root.bind('<space>', self.on_spacebar_end_hand)
+
+    def hide_continue_button(self):
+        if self.continue_button is not None:
+            self.continue_button.destroy()
+            self.continue_button = None
+            self.root.unbind('<space>')
+
+    def on_spacebar_end_hand(self, event):
+        self.end_hand()
+
+    def end_hand(self):
+        if not self.engine.hand_over:
+            return
+        self.hide_continue_button()
+        self.engine.end_hand()
+        self.schedule_advance()
+
+    def update_ui(self):
+        """
+        Asks for a redraw. However many changes come in, the table is drawn at
+        most once per FRAME_INTERVAL, from the state at the time of drawing.
+        """
+        if self.render_pending is None:
+            since_last = int((time.perf_counter() - self.last_render) * 1000)
+            self.render_pending = self.root.after(max(0, FRAME_INTERVAL - since_last), self.render)
+
+    def render(self):
+        self.render_pending = None
+        self.last_render = time.perf_counter()
+        engine = self.engine
+        self.status_label.config(text=engine.status)
+        self.stage_label.config(text=f"Stage: {engine.stage.capitalize()}")
+        self.pot_label.config(text=f"Pot: {engine.pot}")
+        
+        for frame, player in zip(self.player_frames, engine.players):
+            self.update_player_frame(frame, player)
+
+        # Community cards
+        self.update_community_cards()
+
+        if engine.human_player() is not None:
+            self.enable_action_buttons()
+        else:
+            self.disable_action_buttons()
+        if engine.hand_over:
+            self.show_continue_button()
+
+    def update_player_frame(self, frame, player):
+        engine = self.engine
+        # Destroy previous widgets
+        for widget in frame.winfo_children():
+            widget.destroy()
+
+        # Grey out folded player's frame
+        if player.folded:
+            frame_bg = "#BBBBBB"
+        elif engine.players[engine.current_player_index] == player:
+            frame_bg = "#FFEB99"
+        else:
+            frame_bg = "#FFFFFF"
+
+        frame.config(bg=frame_bg)
+
+        # Show player's name, chips, any last action
+        action_display = ""
+        action_color = "black"
+        if player.last_action:
+            action_display = f" ({player.last_action})"
+            if "Fold" in player.last_action:
+                action_color = "red"
+            elif "Check" in player.last_action or "Call" in player.last_action:
+                action_color = "blue"
+            elif "Raise" in player.last_action or "All-In" in player.last_action:
+                action_color = "green"
+
+        dealer_button = " (D)" if (engine.players.index(player) == engine.dealer_index) else ""
+        label_text = f"{player.name}: {player.chips} chips{dealer_button}{action_display}"
+
+        lbl = tk.Label(frame, text=label_text, fg=action_color, bg=frame_bg, font=self.bold_font)
+        lbl.pack()
+
+        self.display_bet_this_round(frame, player, frame_bg)
+        self.display_chips(frame, player, frame_bg)
+
+        # Show hole cards face-up if human or showdown, else facedown
+        for c in player.cards:
+            if player.is_human or engine.stage == "showdown":
+                img = self.card_images.get((c.rank, c.suit), self.card_back_image)
+            else:
+                img = self.card_back_image
+            lbl_card = tk.Label(frame, image=img, bg=frame_bg)
+            lbl_card.image = img
+            lbl_card.pack(side=tk.LEFT, padx=2, pady=2)
+
+    def update_community_cards(self):
+        for widget in self.community_frame.winfo_children():
+            widget.destroy()
+        tk.Label(
+            self.community_frame, text="Community Cards", bg="#DDDDDD",
+            fg="black", font=self.bold_font
+        ).pack(side=tk.LEFT, padx=5)
+
+        for c in self.engine.community_cards:
+            img = self.card_images.get((c.rank, c.suit), self.card_back_image)
+            lbl = tk.Label(self.community_frame, image=img, bg="#DDDDDD")
+            lbl.image = img
+            lbl.pack(side=tk.LEFT, padx=2)
+
+    def display_bet_this_round(self, frame, player, bg_color="#000000"):
+        bet_this_round = player.current_bet
+        bet_label = tk.Label(
+            frame, text=f"Bet This Round: {bet_this_round}",
+            bg=bg_color,fg="black"
+        )
+        bet_label.pack(side=tk.TOP, padx=2, pady=2)
+
+    def display_chips(self, frame, player, bg_color="#FFFFFF"):
+        chips_frame = tk.Frame(frame, bg=bg_color)
+        chips_frame.pack(side=tk.TOP, pady=5)
+
+        
+        placed_chips = chip_breakdown(player.current_bet)
+        sorted_chips = sorted(placed_chips, key=lambda x: CHIP_VALUES[next(k for k, v in CHIP_VALUES.items() if v == x)], reverse=True)
+
+        num_stacks = 0
+        chips_in_stack = 0
+        x_offset_per_stack = 0
+        stacks = []
+        current_stack = []
+
+        for chip_value in sorted_chips:
+            current_stack.append(chip_value)
+            chips_in_stack += 1
+            if chips_in_stack >= CHIP_STACK_LIMIT:
+                 stacks.append(current_stack)
+                 current_stack = []
+                 chips_in_stack = 0
+                 num_stacks+=1
+
+        if current_stack:
+            stacks.append(current_stack)
+
+        num_stacks = len(stacks)
+        
+        # If we have more stacks than allowed per player, we just truncate to the limit
+        if num_stacks > MAX_STACKS_PER_PLAYER:
+              num_stacks = MAX_STACKS_PER_PLAYER
+              stacks = stacks[:MAX_STACKS_PER_PLAYER]
+
+
+        for stack_index, stack in enumerate(stacks):
+             chips_canvas = tk.Canvas(chips_frame, width=CHIP_STACK_WIDTH, height=CHIP_STACK_HEIGHT, bg=bg_color, highlightthickness=0)
+             chips_canvas.pack(side=tk.LEFT, padx=5)
+
+             max_display = 35
+             visible_chips = stack[:max_display]
+             extra_count = len(stack) - max_display if len(stack) > max_display else 0
+
+             x_start, y_start = CHIP_STACK_WIDTH / 2, CHIP_STACK_HEIGHT - 30
+             x_offset = 0
+             y_offset = 9 # Chip vertical spacing
+
+             # Stack them vertically
+             for i, chip_value in enumerate(visible_chips):
+                  chip_color = [k for k, v in CHIP_VALUES.items() if v == chip_value][0]
+                  img = self.get_chip_image(chip_color)
+                  x = x_start - i * x_offset
+                  y = y_start - i * y_offset
+                  chips_canvas.create_image(x, y, image=img, anchor=tk.CENTER)
+
+             if extra_count > 0:
+                 chips_canvas.create_text(
+                     x_start, 20, text=f"+{extra_count} more",
+                     fill="black", font=("Helvetica", 8)
+                 )
+
+    def enable_action_buttons(self):
+        self.call_button.config(state=tk.NORMAL)
+        self.fold_button.config(state=tk.NORMAL)
+        self.bet_button.config(state=tk.NORMAL)
+        self.all_in_button.config(state=tk.NORMAL)
+
+    def disable_action_buttons(self):
+        self.call_button.config(state=tk.DISABLED)
+        self.fold_button.config(state=tk.DISABLED)
+        self.bet_button.config(state=tk.DISABLED)
+        self.all_in_button.config(state=tk.DISABLED)
+
+    def human_call(self):
+        self.after_human_action(self.engine.human_call())
+
+    def human_fold(self):
+        self.after_human_action(self.engine.human_fold())
+
+    def human_bet(self):
+        engine = self.engine
+        player = engine.human_player()
+        if player is None:
+            return
+        refusal = engine.raise_refusal(player)
+        if refusal is not None:
+            engine.status = refusal
+            self.update_ui()
+            return
+        to_call = engine.betting.to_call(player)
+        smallest, largest = engine.betting.raise_limits(player)
+        prompt = f"Raise by ({smallest}-{largest})"
+        bet_amount = simpledialog.askinteger(
+            "Bet Amount", prompt + (f" on top of the call of {to_call}:" if to_call else ":"),
+            minvalue=smallest, maxvalue=largest
+        )
+        if bet_amount is not None:
+            self.after_human_action(engine.human_bet(bet_amount))
+
+    def human_all_in(self):
+        self.after_human_action(self.engine.human_all_in())
+
+    def after_human_action(self, accepted):
+        # A rejected action only changes the status line
+        self.update_ui()
+        if accepted:
+            self.schedule_advance()
+
+def chip_breakdown(amount):
+    """The chips making up ``amount``, largest first."""
+    chips = []
+    for denomination in sorted(CHIP_VALUES.values(), reverse=True):
+        while amount >= denomination:
+            chips.append(denomination)
+            amount -= denomination
+    return chips
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Texas Hold'em against the AI seats.")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="start with the table playing itself at full speed (toggle with X)")
+    args = parser.parse_args(argv)
+    root = tk.Tk()
+    app = TexasHoldemGame(root)
+    if args.fast_forward:
+        app.set_fast_forward(True)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Streaming per-player statistics for opponent modeling.
+
+Each player keeps one small record per hand in fixed-size ring buffers plus
+running totals over the last STATS_WINDOW hands. Recording an action or
+closing a hand touches a constant number of counters, so the stats stay
+cheap in long simulations and their memory is bounded.
+
+Tracked, over the window:
+    VPIP           share of hands where chips went in voluntarily preflop
+    PFR            share of hands raised preflop
+    aggression     (bets + raises) / calls
+    fold to raise  folds / decisions facing a raise
+    WTSD           showdowns reached / flops seen
+    W$SD           showdowns won / showdowns reached
+"""
+
+STATS_WINDOW = 200  # hands
+MIN_SAMPLE = 5  # decisions needed before a tendency is trusted
+
+# Per-hand flags
+VPIP = 1
+PFR = 2
+SAW_FLOP = 4
+SHOWDOWN = 8
+WON_SHOWDOWN = 16
+
+
+class PlayerStats:
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.hands = 0
+        # Parallel ring buffers, one slot per hand
+        self.flags = [0] * window
+        self.aggressive = [0] * window
+        self.calls = [0] * window
+        self.faced_raise = [0] * window
+        self.folded_to_raise = [0] * window
+
+        # Running totals over the window
+        self.vpip_hands = 0
+        self.pfr_hands = 0
+        self.flop_hands = 0
+        self.showdown_hands = 0
+        self.won_showdown_hands = 0
+        self.total_aggressive = 0
+        self.total_calls = 0
+        self.total_faced_raise = 0
+        self.total_folded_to_raise = 0
+
+        # The hand in progress
+        self.hand_flags = 0
+        self.hand_aggressive = 0
+        self.hand_calls = 0
+        self.hand_faced_raise = 0
+        self.hand_folded_to_raise = 0
+
+    def record_action(self, kind, stage, facing_raise):
+        """``kind`` is one of "fold", "check", "call" or "raise"."""
+        if facing_raise:
+            self.hand_faced_raise += 1
+            if kind == "fold":
+                self.hand_folded_to_raise += 1
+        if kind == "raise":
+            self.hand_aggressive += 1
+            if stage == "preflop":
+                self.hand_flags |= VPIP | PFR
+        elif kind == "call":
+            self.hand_calls += 1
+            if stage == "preflop":
+                self.hand_flags |= VPIP
+
+    def record_flop(self):
+        self.hand_flags |= SAW_FLOP
+
+    def record_showdown(self, won):
+        self.hand_flags |= SHOWDOWN | (WON_SHOWDOWN if won else 0)
+
+    def end_hand(self):
+        slot = self.hands % self.window
+        if self.hands >= self.window:
+            # Drop the hand falling out of the window
+            self._add(slot, -1)
+        self.flags[slot] = self.hand_flags
+        self.aggressive[slot] = self.hand_aggressive
+        self.calls[slot] = self.hand_calls
+        self.faced_raise[slot] = self.hand_faced_raise
+        self.folded_to_raise[slot] = self.hand_folded_to_raise
+        self._add(slot, 1)
+        self.hands += 1
+
+        self.hand_flags = 0
+        self.hand_aggressive = 0
+        self.hand_calls = 0
+        self.hand_faced_raise = 0
+        self.hand_folded_to_raise = 0
+
+    def _add(self, slot, sign):
+        flags = self.flags[slot]
+        self.vpip_hands += sign * (flags & VPIP and 1)
+        self.pfr_hands += sign * (flags & PFR and 1)
+        self.flop_hands += sign * (flags & SAW_FLOP and 1)
+        self.showdown_hands += sign * (flags & SHOWDOWN and 1)
+        self.won_showdown_hands += sign * (flags & WON_SHOWDOWN and 1)
+        self.total_aggressive += sign * self.aggressive[slot]
+        self.total_calls += sign * self.calls[slot]
+        self.total_faced_raise += sign * self.faced_raise[slot]
+        self.total_folded_to_raise += sign * self.folded_to_raise[slot]
+
+    @property
+    def sample_hands(self):
+        return min(self.hands, self.window)
+
+    @property
+    def vpip(self):
+        return self.vpip_hands / self.sample_hands if self.hands else 0.0
+
+    @property
+    def pfr(self):
+        return self.pfr_hands / self.sample_hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self):
+        if not self.total_calls:
+            return float(self.total_aggressive)
+        return self.total_aggressive / self.total_calls
+
+    @property
+    def fold_to_raise(self):
+        if not self.total_faced_raise:
+            return 0.0
+        return self.total_folded_to_raise / self.total_faced_raise
+
+    @property
+    def went_to_showdown(self):
+        return self.showdown_hands / self.flop_hands if self.flop_hands else 0.0
+
+    @property
+    def won_at_showdown(self):
+        return self.won_showdown_hands / self.showdown_hands if self.showdown_hands else 0.0
+
+    def summary(self):
+        return {
+            "hands": self.sample_hands,
+            "vpip": self.vpip,
+            "pfr": self.pfr,
+            "aggression_factor": self.aggression_factor,
+            "fold_to_raise": self.fold_to_raise,
+            "went_to_showdown": self.went_to_showdown,
+            "won_at_showdown": self.won_at_showdown,
+        }
+
+
+class TableStats:
+    """PlayerStats for everyone at a table, keyed by player name."""
+
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.players = {}
+        self.in_hand = set()
+
+    def get(self, name):
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats(self.window)
+        return stats
+
+    def start_hand(self, players):
+        self.in_hand = {p.name for p in players if not p.folded}
+        for name in self.in_hand:
+            self.get(name)
+
+    def record_action(self, player, required, raise_count, stage):
+        """
+        Records ``player``'s last action. Call it after the action was applied, with
+        the amount the player had to call and the raise count from before it.
+        """
+        word, _, amount = player.last_action.partition(" ")
+        if word == "Fold":
+            kind = "fold"
+            self.in_hand.discard(player.name)
+        elif word == "Check":
+            kind = "check"
+        elif word == "Raise":
+            kind = "raise"
+        elif word == "All-In" and amount.isdigit():
+            # Shoving more than the call counts as a raise
+            kind = "raise" if int(amount) > required else "call"
+        else:
+            kind = "call"
+        self.get(player.name).record_action(kind, stage, raise_count > 0 and required > 0)
+
+    def record_flop(self, players):
+        for p in players:
+            if not p.folded:
+                self.get(p.name).record_flop()
+
+    def record_showdown(self, players, winners):
+        for p in players:
+            if not p.folded:
+                self.get(p.name).record_showdown(p in winners)
+
+    def end_hand(self, players):
+        for p in players:
+            self.get(p.name).end_hand()
+        self.in_hand = set()
+
+    def opponent_tendencies(self, name):
+        """
+        Averages of fold-to-raise and aggression factor over the opponents still in
+        the hand that have enough history; None where nobody qualifies.
+        """
+        fold_to_raise = []
+        aggression = []
+        for other in self.in_hand:
+            if other == name:
+                continue
+            stats = self.players[other]
+            if stats.total_faced_raise >= MIN_SAMPLE:
+                fold_to_raise.append(stats.fold_to_raise)
+            if stats.total_aggressive + stats.total_calls >= MIN_SAMPLE:
+                aggression.append(stats.aggression_factor)
+        return (
+            sum(fold_to_raise) / len(fold_to_raise) if fold_to_raise else None,
+            sum(aggression) / len(aggression) if aggression else None,
+        )
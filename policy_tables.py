@@ -0,0 +1,357 @@
+"""
+Lookup-table versions of the rule-based AI styles.
+
+The straightforward, risk_taker and strategic styles only look at a handful
+of discrete facts: the hand category, how the stack compares with the call,
+the raise count, whether a bet is open, the pot odds (strategic's score only
+crosses a threshold at odds of 0, 1/2 and 1), the seat's position score and,
+for strategic, the two opponent tendencies it reacts to. Each table is a
+bytearray of action codes indexed by state_index(), filled in by calling the
+style's function in every state the first time the style is looked up, so
+the table can't drift from the rules.
+
+Two codes are resolved at lookup time, in the same order as the original
+functions, so the random draws match too: CALL_IF_DRAWING calls only with a
+draw worth chasing, CALL_SOMETIMES is straightforward's random call.
+Raise sizes still come from ai_raise_size, with the BettingState's figures. Pot odds outside 0-1 (a pot
+smaller than the bet) and the other styles go to ai_decision as before.
+
+    python policy_tables.py    compiles the tables and times them against the style functions
+    python -m pytest test_policy_tables.py    checks they decide exactly as the functions do
+"""
+import functools
+import random
+import sys
+import threading
+import time
+
+import texasholdem
+from betting import decision_figures
+from texasholdem import (
+    AI_RAISE_AMOUNT, BLUFF_FOLD_RATE, CALLDOWN_AGGRESSION, POSITION_SCORES, RANK_TUPLES, Player,
+    ai_decision, ai_random, ai_raise_size, drawing_odds, hand_rank,
+)
+
+TABULATED_STYLES = ["straightforward", "risk_taker", "strategic"]
+
+# Action codes
+FOLD = 0
+CALL = 1
+RAISE = 2
+ALL_IN = 3
+CALL_IF_DRAWING = 4
+CALL_SOMETIMES = 5
+ACTION_NAMES = ["fold", "call", "raise", "all-in", "call if drawing", "call sometimes"]
+
+# State dimensions, outermost first
+RAISE_BUCKETS = 3     # raise count 0, 1, 2 or more
+STACK_BUCKETS = 4     # no chips, chips <= the call, <= the call + AI_RAISE_AMOUNT, more
+BET_OPEN = 2          # current bet is zero, or not
+ODDS_BUCKETS = 5      # pot odds 0, below 1/2, exactly 1/2, below 1, exactly 1
+POSITIONS = 3         # evaluate_position: 1-3
+HAND_CATEGORIES = 10  # evaluate_hand: 0 before the flop, then 1-9
+TENDENCIES = 4        # bit 0: opponents fold to raises, bit 1: opponents are very aggressive
+NUM_STATES = (RAISE_BUCKETS * STACK_BUCKETS * BET_OPEN * ODDS_BUCKETS * POSITIONS
+              * HAND_CATEGORIES * TENDENCIES)
+
+# A pot odds value inside each odds bucket, for probing the style functions
+ODDS_SAMPLES = [0.0, 0.25, 0.5, 0.75, 1.0]
+# CATEGORY[dense hand rank] -> evaluate_hand's category
+CATEGORY = [0] + [t[0] for t in RANK_TUPLES[1:]]
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def state_index(hand_strength, raise_count, stack, bet_open, odds, position, tendencies):
+    index = min(raise_count, 2)
+    index = index * STACK_BUCKETS + stack
+    index = index * BET_OPEN + bet_open
+    index = index * ODDS_BUCKETS + odds
+    index = index * POSITIONS + position - 1
+    index = index * HAND_CATEGORIES + hand_strength
+    return index * TENDENCIES + tendencies
+
+
+def decode_state(index):
+    """The inverse of state_index, as a tuple in the same order."""
+    index, tendencies = divmod(index, TENDENCIES)
+    index, hand_strength = divmod(index, HAND_CATEGORIES)
+    index, position = divmod(index, POSITIONS)
+    index, odds = divmod(index, ODDS_BUCKETS)
+    raise_count, index = divmod(index, STACK_BUCKETS * BET_OPEN)
+    stack, bet_open = divmod(index, BET_OPEN)
+    return hand_strength, raise_count, stack, bet_open, odds, position + 1, tendencies
+
+
+def stack_bucket(chips, to_call):
+    if chips <= 0:
+        return 0
+    if chips <= to_call:
+        return 1
+    if chips <= to_call + AI_RAISE_AMOUNT:
+        return 2
+    return 3
+
+
+def odds_bucket(to_call, pot, current_bet):
+    """
+    The bucket of calculate_pot_odds, compared exactly in integers, or None
+    when the odds are outside 0-1 and the table doesn't cover them.
+    """
+    total = pot + current_bet
+    if total <= 0 or to_call == 0:
+        return 0
+    if to_call < 0 or to_call > total:
+        return None
+    if 2 * to_call < total:
+        return 1
+    if 2 * to_call == total:
+        return 2
+    return 3 if to_call < total else 4
+
+
+def tendency_bits(stats, name):
+    if stats is None:
+        return 0
+    fold_to_raise, aggression = stats.opponent_tendencies(name)
+    bits = 0
+    if fold_to_raise is not None and fold_to_raise > BLUFF_FOLD_RATE:
+        bits |= 1
+    if aggression is not None and aggression > CALLDOWN_AGGRESSION:
+        bits |= 2
+    return bits
+
+
+def hand_category(cards, community_cards):
+    """evaluate_hand, read from the dense hand rank."""
+    if not community_cards:
+        return 0
+    return CATEGORY[hand_rank(cards + community_cards)]
+
+
+def player_state(player, community_cards, current_bet, pot, raise_count, stats=None):
+    """state_index for ``player`` facing the given table, or None if it isn't tabulated."""
+    to_call = current_bet - player.current_bet
+    odds = odds_bucket(to_call, pot, current_bet)
+    if odds is None:
+        return None
+    return state_index(
+        hand_category(player.cards, community_cards), raise_count,
+        stack_bucket(player.chips, to_call), int(current_bet == 0), odds,
+        POSITION_SCORES.get(player.name, 1), tendency_bits(stats, player.name),
+    )
+
+
+class _Probe:
+    """Stands in for the random source, evaluate_hand, drawing_odds and the table stats while a style is tabulated."""
+
+    def __init__(self):
+        self.roll = 0.0
+        self.hand_strength = 0
+        self.tendencies = 0
+        self.drawing = False
+
+    def random(self):
+        return self.roll
+
+    def randint(self, a, b):
+        return a
+
+    def evaluate_hand(self, cards, community_cards):
+        return self.hand_strength
+
+    def drawing_odds(self, player, community_cards, current_bet, pot):
+        return self.drawing
+
+    def opponent_tendencies(self, name):
+        return (
+            1.0 if self.tendencies & 1 else None,
+            CALLDOWN_AGGRESSION + 1 if self.tendencies & 2 else None,
+        )
+
+
+def _probe_state(style_function, probe, index):
+    """Action code for ``style_function`` (bound to ``probe``) in state ``index``."""
+    hand_strength, raise_count, stack, bet_open, odds, position, tendencies = decode_state(index)
+    # Table amounts that land in the buckets: bet 0 or 1000, a stack inside its bucket
+    current_bet = 0 if bet_open else 1000
+    player = Player("Probe", 0)
+    # pot odds = to_call / (pot + current_bet) with nothing of the player's in yet
+    to_call = current_bet
+    if to_call == 0:
+        if odds:
+            return FOLD  # can't happen: nothing to call means pot odds of 0
+        pot = 100
+    else:
+        pot = round(to_call / ODDS_SAMPLES[odds]) - current_bet if odds else 100
+        if odds == 0:
+            player.current_bet = current_bet
+            to_call = 0
+    if stack == 1 and to_call == 0:
+        return FOLD  # can't happen: no chips at or below a zero call but some chips
+    player.chips = [0, to_call, to_call + AI_RAISE_AMOUNT, to_call + 10 * AI_RAISE_AMOUNT][stack]
+
+    probe.hand_strength = hand_strength
+    probe.tendencies = tendencies
+    outcomes = {}
+    for roll in (0.0, 1.0):
+        for drawing in (False, True):
+            probe.roll = roll
+            probe.drawing = drawing
+            action, _ = style_function(player, [], current_bet, pot, "flop", raise_count, probe, position)
+            outcomes[roll, drawing] = action
+
+    actions = set(outcomes.values())
+    if len(actions) == 1:
+        return ACTION_NAMES.index(actions.pop())
+    if outcomes == {(0.0, False): "fold", (0.0, True): "call", (1.0, False): "fold", (1.0, True): "call"}:
+        return CALL_IF_DRAWING
+    if outcomes == {(0.0, False): "fold", (0.0, True): "call", (1.0, False): "call", (1.0, True): "call"}:
+        return CALL_SOMETIMES
+    raise ValueError(f"{style_function.__name__} can't be tabulated in state {decode_state(index)}")
+
+
+def _style_function(style, probe):
+    """
+    The style's function, drawing its random numbers, hand strength and
+    draws from ``probe``, called as (player, community_cards, current_bet,
+    pot, stage, raise_count, stats, position).
+    """
+    function = getattr(texasholdem, f"ai_decision_{style}")
+    if style == "strategic":
+        probed = functools.partial(function, rng=probe, evaluate=probe.evaluate_hand, drawing=probe.drawing_odds)
+    else:
+        probes = {"rng": probe, "evaluate": probe.evaluate_hand}
+        if style == "straightforward":
+            probes["drawing"] = probe.drawing_odds
+        probed = lambda player, cards, current_bet, pot, stage, raise_count, stats, position: function(
+            player, cards, current_bet, pot, stage, raise_count, **probes)
+    probed.__name__ = function.__name__
+    return probed
+
+
+def compile_policy(style):
+    """Tabulates every state of ``style`` into a bytearray of action codes."""
+    probe = _Probe()
+    function = _style_function(style, probe)
+    return bytearray(_probe_state(function, probe, i) for i in range(NUM_STATES))
+
+
+def policy_table(style):
+    """The table for ``style``, compiled the first time it is asked for."""
+    table = _tables.get(style)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(style)
+            if table is None:
+                table = _tables[style] = compile_policy(style)
+    return table
+
+
+def lookup_actions(style, states):
+    """Action codes for many ``states`` (e.g. one per table) of one style."""
+    table = policy_table(style)
+    return [table[i] for i in states]
+
+
+def resolve_action(code, player, community_cards, current_bet, pot, betting=None):
+    """Turns an action code into ai_decision's (action, amount)."""
+    if code == RAISE:
+        return "raise", ai_raise_size(hand_category(player.cards, community_cards), pot,
+                                      *decision_figures(betting, player, current_bet))
+    if code == CALL_SOMETIMES:
+        code = CALL if ai_random.random() > 0.8 else CALL_IF_DRAWING
+    if code == CALL_IF_DRAWING:
+        code = CALL if drawing_odds(player, community_cards, current_bet, pot) else FOLD
+    return ACTION_NAMES[code], 0
+
+
+def policy_decision(player, community_cards, current_bet, pot, stage, raise_count, game=None, betting=None):
+    """Drop-in for ai_decision that reads the TABULATED_STYLES from their tables."""
+    if player.play_style in TABULATED_STYLES:
+        return table_decision(player, community_cards, current_bet, pot, stage, raise_count, game, betting)
+    return ai_decision(player, community_cards, current_bet, pot, stage, raise_count, game, betting)
+
+
+def table_decision(player, community_cards, current_bet, pot, stage, raise_count, game=None, betting=None):
+    """ai_decision for a player of one of the TABULATED_STYLES, read from its table."""
+    style = player.play_style
+    # Only strategic reacts to the opponents
+    stats = getattr(game, "stats", None) if style == "strategic" else None
+    state = player_state(player, community_cards, current_bet, pot, raise_count, stats)
+    if state is None:
+        return ai_decision(player, community_cards, current_bet, pot, stage, raise_count, game, betting)
+    return resolve_action(policy_table(style)[state], player, community_cards, current_bet, pot, betting)
+
+
+def random_decisions(samples=20000, seed=0):
+    """
+    ``samples`` random decisions of the tabulated styles, as (player,
+    community_cards, current_bet, pot, raise_count, game) tuples, with table
+    stats that give strategic clear opponent tendencies half the time.
+    """
+    from engine import DECK_ORDER
+    from opponent_stats import TableStats
+
+    rng = random.Random(seed)
+    decisions = []
+    for _ in range(samples):
+        style = rng.choice(TABULATED_STYLES)
+        cards = rng.sample(DECK_ORDER, 2 + rng.choice([0, 3, 4, 5]))
+        player = Player(rng.choice(list(POSITION_SCORES) + ["Stranger"]), rng.choice([0, 40, 100, 1000, 5000]),
+                        play_style=style)
+        player.cards = cards[:2]
+        player.current_bet = rng.choice([0, 0, 50, 100])
+        current_bet = player.current_bet + rng.choice([0, 0, 50, 100, 400, 2000])
+        pot = current_bet + rng.choice([0, 100, 150, 800, 5000])
+        raise_count = rng.choice([0, 1, 2, 3])
+        game = type("Game", (), {})()
+        game.stats = TableStats()
+        if rng.random() < 0.5:
+            # Opponents with a clear tendency
+            for name in ("Opponent 1", "Opponent 2"):
+                stats = game.stats.get(name)
+                stats.total_faced_raise = stats.total_folded_to_raise = 10
+                stats.total_aggressive = 20 if rng.random() < 0.5 else 0
+                stats.total_calls = 1
+            game.stats.in_hand = {"Opponent 1", "Opponent 2", player.name}
+        decisions.append((player, cards[2:], current_bet, pot, raise_count, game))
+    return decisions
+
+
+def time_decisions(decides, decisions, rounds=7):
+    """
+    Best time per decision of each of ``decides`` over ``decisions``, in
+    microseconds. They take turns in every round, so a change in the
+    machine's load hits them alike.
+    """
+    best = [None] * len(decides)
+    for _ in range(rounds):
+        for i, decide in enumerate(decides):
+            start = time.perf_counter()
+            for player, community_cards, current_bet, pot, raise_count, game in decisions:
+                decide(player, community_cards, current_bet, pot, "flop", raise_count, game)
+            elapsed = time.perf_counter() - start
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return [b / len(decisions) * 1e6 for b in best]
+
+
+def main():
+    for style in TABULATED_STYLES:
+        start = time.perf_counter()
+        table = _tables[style] = compile_policy(style)
+        elapsed = time.perf_counter() - start
+        print(f"{style}: {len(table)} states compiled in {elapsed:.2f} s")
+    decisions = random_decisions()
+    for style in TABULATED_STYLES:
+        function, tables = time_decisions([ai_decision, table_decision],
+                                          [d for d in decisions if d[0].play_style == style])
+        print(f"{style}: {function:.1f} us per decision from the function, {tables:.1f} us from the tables")
+    function, tables = time_decisions([ai_decision, policy_decision], decisions)
+    print(f"All styles: {function:.1f} us per decision with ai_decision, {tables:.1f} us with policy_decision")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Heads-up preflop equity of every hand against every other, precomputed.
+
+build() works out the share of the pot each of the 1326 two-card combos
+wins against each other combo (ties split) over every five-card board, and
+writes the 1326 x 1326 float32 matrix to ``path``/matrix.npy, with each
+combo's equity against a random hand (the average of its row) in
+``path``/vs_random.npy. Rows and columns are ranges.COMBOS indexes; pairs
+of combos sharing a card are NaN.
+
+Suits are interchangeable before the flop, so the 812,175 pairs of combos
+fall into 47,008 matchups that differ by more than a suit relabelling.
+One pair per matchup is played out with fasteval.equity (a matchup that
+is its own mirror image, like AhKh v AsKs, is 1/2 without it): every board
+by default, which takes about an hour with the compiled evaluator and days
+without it, or ``samples`` random boards per matchup.
+
+The files are memory-mapped on first use, so lookups read only the pages
+they touch and every process on a machine shares one page-cached copy.
+NumPy can map the same files: numpy.load(path + "/matrix.npy", mmap_mode="r").
+hand_vs_hand and hand_vs_random raise FileNotFoundError if nothing has been
+built in ``path``: a sampled build still plays out millions of boards, far
+too long to start behind a lookup. meta.json is written last, so a
+half-finished build is never loaded.
+
+    python preflop_equity.py --build --workers 8          exact, every board
+    python preflop_equity.py --build --samples 2000       quicker, sampled
+    python preflop_equity.py AhAs KdKc                    look up a matchup
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from array import array
+from itertools import permutations
+
+import columnar
+import fasteval
+from engine import DECK_ORDER
+from ranges import COMBO_INDEX, COMBO_MASKS, COMBOS, NUM_COMBOS, RANK_CHARS, SUIT_CHARS, combo_index
+
+EQUITY_PATH = "preflop_equity"
+MATRIX_FILE = "matrix.npy"
+VS_RANDOM_FILE = "vs_random.npy"
+META_FILE = "meta.json"
+
+
+def matchup_classes():
+    """
+    The matchups up to suit relabelling. Returns (pairs, mirrored,
+    class_of): pairs holds one (hero, villain) combo index pair per matchup,
+    mirrored[matchup] is 1 when swapping hero and villain gives the same
+    matchup (so its equity is exactly 1/2), and
+    class_of[hero * NUM_COMBOS + villain] is matchup * 2, plus 1 when the
+    pair is that matchup with hero and villain swapped, or -1 for combos
+    sharing a card.
+    """
+    relabel = []
+    for suits in permutations(range(4)):
+        card = [suits[c // 13] * 13 + c % 13 for c in range(52)]
+        relabel.append([COMBO_INDEX[(card[a], card[b]) if card[a] < card[b] else (card[b], card[a])]
+                        for a, b in COMBOS])
+    pairs = []
+    mirrored = bytearray()
+    index = {}
+    class_of = array("i", [-1]) * (NUM_COMBOS * NUM_COMBOS)
+    for i in range(NUM_COMBOS):
+        mask = COMBO_MASKS[i]
+        for j in range(i + 1, NUM_COMBOS):
+            if mask & COMBO_MASKS[j]:
+                continue
+            forward = min((r[i], r[j]) for r in relabel)
+            backward = min((r[j], r[i]) for r in relabel)
+            key = min(forward, backward)
+            matchup = index.get(key)
+            if matchup is None:
+                matchup = index[key] = len(pairs)
+                pairs.append(key)
+                mirrored.append(forward == backward)
+            swapped = backward < forward
+            class_of[i * NUM_COMBOS + j] = matchup * 2 + swapped
+            class_of[j * NUM_COMBOS + i] = matchup * 2 + (not swapped)
+    return pairs, mirrored, class_of
+
+
+def _matchup_equity(args):
+    # Runs in a worker process
+    hero, villain, samples, seed = args
+    return fasteval.equity(COMBOS[hero], COMBOS[villain], (), samples, seed)
+
+
+def build(path=EQUITY_PATH, workers=1, samples=0, seed=0, progress=None):
+    """
+    Computes the matrix and writes it to ``path``; ``samples`` 0 plays out
+    every board. Matchup i is sampled with seed ``seed`` * 1000003 + i, so
+    the result doesn't depend on the number of workers. ``progress(done,
+    total)`` is called as matchups finish.
+    """
+    pairs, mirrored, class_of = matchup_classes()
+    equities = array("d", [0.5]) * len(pairs)
+    jobs = [(hero, villain, samples, seed * 1000003 + i)
+            for i, (hero, villain) in enumerate(pairs) if not mirrored[i]]
+    played = [i for i in range(len(pairs)) if not mirrored[i]]
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap(_matchup_equity, jobs, chunksize=16) if pool else map(_matchup_equity, jobs)
+        for done, (i, equity) in enumerate(zip(played, results), start=1):
+            equities[i] = equity
+            if progress is not None:
+                progress(done, len(jobs))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    matrix = array("f", [math.nan]) * (NUM_COMBOS * NUM_COMBOS)
+    vs_random = array("f", bytes(4 * NUM_COMBOS))
+    for i in range(NUM_COMBOS):
+        row = i * NUM_COMBOS
+        total = 0.0
+        count = 0
+        for j in range(NUM_COMBOS):
+            c = class_of[row + j]
+            if c < 0:
+                continue
+            equity = equities[c >> 1]
+            if c & 1:
+                equity = 1.0 - equity
+            matrix[row + j] = equity
+            total += equity
+            count += 1
+        vs_random[i] = total / count
+
+    os.makedirs(path, exist_ok=True)
+    columnar.write_npy(os.path.join(path, MATRIX_FILE), matrix, (NUM_COMBOS, NUM_COMBOS))
+    columnar.write_npy(os.path.join(path, VS_RANDOM_FILE), vs_random)
+    # Last, and in one step: load() takes a matrix with a meta.json as finished
+    meta_path = os.path.join(path, META_FILE)
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump({"samples": samples, "seed": seed, "matchups": len(pairs), "backend": fasteval.BACKEND}, f)
+    os.replace(meta_path + ".tmp", meta_path)
+    return len(pairs)
+
+
+class PreflopEquity:
+    """The matrices built in ``path``, memory-mapped. Hands are two Cards."""
+
+    def __init__(self, path=EQUITY_PATH):
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.matrix, shape = columnar.map_npy(os.path.join(path, MATRIX_FILE))
+        if shape != (NUM_COMBOS, NUM_COMBOS):
+            raise ValueError(f"{path}/{MATRIX_FILE} is {shape}, not {NUM_COMBOS} x {NUM_COMBOS}")
+        self.vs_random, _ = columnar.map_npy(os.path.join(path, VS_RANDOM_FILE))
+
+    def covers(self, samples):
+        """Whether the matrix is at least as exact as ``samples`` random boards per matchup."""
+        return self.meta["samples"] == 0 or self.meta["samples"] >= samples
+
+    def combo_equity(self, hero, villain):
+        """Equity of combo index ``hero`` against combo index ``villain``."""
+        equity = self.matrix[hero * NUM_COMBOS + villain]
+        if equity != equity:
+            raise ValueError(f"{COMBOS[hero]} and {COMBOS[villain]} share a card")
+        return equity
+
+    def hand_vs_hand(self, hand, villain):
+        return self.combo_equity(combo_index(*hand), combo_index(*villain))
+
+    def hand_vs_random(self, hand):
+        return self.vs_random[combo_index(*hand)]
+
+    def hand_vs_range(self, hand, villain_range):
+        """Equity against a ranges.HandRange, over the combos that don't share a card with ``hand``."""
+        hero = combo_index(*hand)
+        row = hero * NUM_COMBOS
+        won = 0.0
+        total = 0.0
+        for i, w in villain_range.combos():
+            if not COMBO_MASKS[i] & COMBO_MASKS[hero]:
+                won += w * self.matrix[row + i]
+                total += w
+        return won / total if total else 0.0
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def load(path=EQUITY_PATH):
+    """
+    The PreflopEquity built in ``path``, or None if nothing has been built
+    there yet. Only a loaded matrix is kept, so a later call finds one built
+    in the meantime.
+    """
+    table = _tables.get(path)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(path)
+            if table is None:
+                try:
+                    table = _tables[path] = PreflopEquity(path)
+                except FileNotFoundError:
+                    return None
+    return table
+
+
+def _require(path):
+    """The PreflopEquity in ``path``; raises FileNotFoundError if there isn't one."""
+    table = load(path)
+    if table is None:
+        raise FileNotFoundError(f"No preflop equity matrix in {path}; build one with "
+                                f"python preflop_equity.py --build --path {path} (add --samples 2000 "
+                                f"for a quicker sampled one)")
+    return table
+
+
+def hand_vs_hand(hand, villain, path=EQUITY_PATH):
+    """Share of the pot ``hand`` wins against ``villain`` before the flop (ties split)."""
+    return _require(path).hand_vs_hand(hand, villain)
+
+
+def hand_vs_random(hand, path=EQUITY_PATH):
+    """Share of the pot ``hand`` wins against a random hand before the flop (ties split)."""
+    return _require(path).hand_vs_random(hand)
+
+
+def check_equities(table, pairs=20000, seed=0):
+    """
+    Asserts the matrix is consistent: a pair and its reverse add up to 1,
+    relabelling the suits changes nothing, and vs_random is each row's
+    average. Returns the number of pairs checked.
+    """
+    import random
+
+    rng = random.Random(seed)
+    matrix = table.matrix
+    for _ in range(pairs):
+        hero, villain = rng.sample(range(NUM_COMBOS), 2)
+        if COMBO_MASKS[hero] & COMBO_MASKS[villain]:
+            continue
+        equity = table.combo_equity(hero, villain)
+        assert abs(equity + table.combo_equity(villain, hero) - 1) < 1e-6, f"{hero} v {villain} isn't symmetric"
+        suits = rng.sample(range(4), 4)
+        card = [suits[c // 13] * 13 + c % 13 for c in range(52)]
+        relabelled = [COMBO_INDEX[tuple(sorted(card[c] for c in COMBOS[i]))] for i in (hero, villain)]
+        assert table.combo_equity(*relabelled) == equity, f"{hero} v {villain} changes with the suits"
+    for hero in range(0, NUM_COMBOS, 97):
+        row = [matrix[hero * NUM_COMBOS + j] for j in range(NUM_COMBOS)]
+        average = math.fsum(e for e in row if e == e) / sum(1 for e in row if e == e)
+        assert abs(table.vs_random[hero] - average) < 1e-6, f"vs_random of {hero} isn't its row average"
+    return pairs
+
+
+def parse_hand(text):
+    return [DECK_ORDER[SUIT_CHARS.index(text[i + 1]) * 13 + RANK_CHARS.index(text[i])] for i in (0, 2)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the heads-up preflop equity matrix.")
+    parser.add_argument("hands", nargs="*", help="a hand (e.g. AhKh) to look up against a random hand, "
+                                                 "or two hands to look up against each other")
+    parser.add_argument("--path", default=EQUITY_PATH, help="directory for the matrix")
+    parser.add_argument("--build", action="store_true", help="compute the matrix and write it to --path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--samples", type=int, default=0,
+                        help="random boards per matchup; 0 plays out every board")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not args.build and not args.hands:
+        parser.error("give one or two hands to look up, or --build")
+
+    if args.build:
+        start = time.perf_counter()
+
+        def progress(done, total):
+            if done % 1000 == 0 or done == total:
+                print(f"  {done}/{total} matchups ({time.perf_counter() - start:.0f} s)", flush=True)
+
+        print(f"Built {build(args.path, args.workers, args.samples, args.seed, progress)} matchups "
+              f"in {time.perf_counter() - start:.0f} s")
+        table = load(args.path)
+        print(f"Checked {check_equities(table)} pairs for consistency")
+    if not args.hands:
+        return 0
+
+    try:
+        table = _require(args.path)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if len(args.hands) == 1:
+        hand = parse_hand(args.hands[0])
+        print(f"{args.hands[0]} v random: {table.hand_vs_random(hand):.4f}")
+    elif len(args.hands) == 2:
+        hand, villain = parse_hand(args.hands[0]), parse_hand(args.hands[1])
+        print(f"{args.hands[0]} v {args.hands[1]}: {table.hand_vs_hand(hand, villain):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
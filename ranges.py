@@ -0,0 +1,319 @@
+"""
+Hand ranges and range equity.
+
+A HandRange is a weight per two-card combo (1326 of them), parsed from the
+usual shorthand, e.g. "QQ+, AKs, A5s-A2s, KQo:0.5, AhKh". Equity is computed
+one board runout at a time: every live combo is ranked once per runout and
+range-vs-range results come from a single sweep over the combos sorted by
+rank, with per-card running weights removing card conflicts without
+comparing every pair.
+"""
+import random
+from array import array
+
+from engine import CARD_INDEX, DECK_ORDER
+from texasholdem import hand_rank
+
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "hdcs"  # same order as SUITS
+
+# All two-card combos as pairs of card ids (positions in DECK_ORDER), low id first
+COMBOS = [(a, b) for a in range(52) for b in range(a + 1, 52)]
+NUM_COMBOS = len(COMBOS)  # 1326
+COMBO_INDEX = {combo: i for i, combo in enumerate(COMBOS)}
+COMBO_MASKS = [(1 << a) | (1 << b) for a, b in COMBOS]
+
+RUNOUT_SAMPLES = 200  # sampled boards when there are too many runouts to enumerate
+
+
+def combo_index(card1, card2):
+    a, b = CARD_INDEX[card1], CARD_INDEX[card2]
+    return COMBO_INDEX[(a, b) if a < b else (b, a)]
+
+
+def card_mask(cards):
+    mask = 0
+    for c in cards:
+        mask |= 1 << CARD_INDEX[c]
+    return mask
+
+
+def _parse_rank(char):
+    index = RANK_CHARS.find(char.upper())
+    if index < 0:
+        raise ValueError(f"Unknown rank {char!r}")
+    return index
+
+
+def _class_combos(high, low, shape):
+    """Combo indexes for a hand class such as AKs (shape "s"), AKo ("o"), AK ("") or QQ."""
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            a = s1 * 13 + high
+            b = s2 * 13 + low
+            if a == b:
+                continue
+            if high == low and s1 > s2:
+                continue
+            if shape == "s" and s1 != s2:
+                continue
+            if shape == "o" and s1 == s2:
+                continue
+            combos.append(COMBO_INDEX[(a, b) if a < b else (b, a)])
+    return combos
+
+
+def _parse_class(token):
+    """Splits e.g. "AKs" into (high, low, shape), with high >= low."""
+    if len(token) not in (2, 3):
+        raise ValueError(f"Can't parse hand {token!r}")
+    high, low = _parse_rank(token[0]), _parse_rank(token[1])
+    shape = token[2].lower() if len(token) == 3 else ""
+    if shape not in ("", "s", "o"):
+        raise ValueError(f"Can't parse hand {token!r}")
+    if high == low and shape:
+        raise ValueError(f"Pairs can't be suited or offsuit: {token!r}")
+    if low > high:
+        high, low = low, high
+    return high, low, shape
+
+
+def _token_combos(token):
+    if token.lower() in ("random", "any", "*"):
+        return list(range(NUM_COMBOS))
+    if len(token) == 4 and token[1].lower() in SUIT_CHARS and token[3].lower() in SUIT_CHARS:
+        a = SUIT_CHARS.index(token[1].lower()) * 13 + _parse_rank(token[0])
+        b = SUIT_CHARS.index(token[3].lower()) * 13 + _parse_rank(token[2])
+        if a == b:
+            raise ValueError(f"Duplicate card in {token!r}")
+        return [COMBO_INDEX[(a, b) if a < b else (b, a)]]
+
+    combos = []
+    if "-" in token:
+        first, last = (_parse_class(part.strip()) for part in token.split("-", 1))
+        if first[2] != last[2] or (first[0] == first[1]) != (last[0] == last[1]):
+            raise ValueError(f"Range ends don't match: {token!r}")
+        if first[0] == first[1]:
+            # "22-55"
+            for r in range(min(first[0], last[0]), max(first[0], last[0]) + 1):
+                combos += _class_combos(r, r, "")
+        else:
+            # "A2s-A5s": same top card, a span of kickers
+            if first[0] != last[0]:
+                raise ValueError(f"Range ends need the same top card: {token!r}")
+            for low in range(min(first[1], last[1]), max(first[1], last[1]) + 1):
+                combos += _class_combos(first[0], low, first[2])
+        return combos
+
+    if token.endswith("+"):
+        high, low, shape = _parse_class(token[:-1])
+        if high == low:
+            # "QQ+": every pair from QQ up
+            for r in range(high, 13):
+                combos += _class_combos(r, r, "")
+        else:
+            # "ATs+": kickers from T up to one below the top card
+            for k in range(low, high):
+                combos += _class_combos(high, k, shape)
+        return combos
+
+    high, low, shape = _parse_class(token)
+    return _class_combos(high, low, shape)
+
+
+class HandRange:
+    def __init__(self, weights=None):
+        if weights is None:
+            self.weights = array("d", bytes(8 * NUM_COMBOS))
+        else:
+            self.weights = array("d", weights)
+            if len(self.weights) != NUM_COMBOS:
+                raise ValueError(f"A range needs {NUM_COMBOS} weights")
+
+    @classmethod
+    def parse(cls, text):
+        """Parses comma-separated hands, each optionally weighted with ":w" (default 1)."""
+        hand_range = cls()
+        for token in text.replace("10", "T").split(","):
+            token = token.strip()
+            if not token:
+                continue
+            weight = 1.0
+            if ":" in token:
+                token, _, w = token.partition(":")
+                weight = float(w)
+                token = token.strip()
+            for i in _token_combos(token):
+                hand_range.weights[i] = weight
+        return hand_range
+
+    @classmethod
+    def random(cls):
+        return cls(array("d", [1.0]) * NUM_COMBOS)
+
+    def set(self, card1, card2, weight=1.0):
+        self.weights[combo_index(card1, card2)] = weight
+
+    def combos(self):
+        """(combo index, weight) for every combo with a positive weight."""
+        return [(i, w) for i, w in enumerate(self.weights) if w > 0]
+
+    def total_weight(self):
+        return sum(self.weights)
+
+    def without(self, dead_cards):
+        """Copy with every combo that uses one of ``dead_cards`` removed."""
+        dead = card_mask(dead_cards)
+        weights = array("d", self.weights)
+        for i, mask in enumerate(COMBO_MASKS):
+            if mask & dead:
+                weights[i] = 0.0
+        return HandRange(weights)
+
+    def __len__(self):
+        return sum(1 for w in self.weights if w > 0)
+
+    def __contains__(self, cards):
+        return self.weights[combo_index(*cards)] > 0
+
+
+def runouts(board, dead_mask, samples=RUNOUT_SAMPLES, rng=None):
+    """
+    Yields the cards that complete ``board`` to five: every possible river when only
+    one card is missing, otherwise ``samples`` random completions.
+    """
+    needed = 5 - len(board)
+    live = [DECK_ORDER[i] for i in range(52) if not dead_mask >> i & 1]
+    if needed <= 0:
+        yield []
+    elif needed == 1:
+        for c in live:
+            yield [c]
+    else:
+        rng = rng if rng is not None else random.Random()
+        for _ in range(samples):
+            yield rng.sample(live, needed)
+
+
+def _rank_combos(combos, board_cards, board_mask):
+    """Ranks each (combo index, weight) that doesn't clash with the board; returns sorted rows."""
+    rows = []
+    for i, w in combos:
+        if COMBO_MASKS[i] & board_mask:
+            continue
+        a, b = COMBOS[i]
+        rows.append((hand_rank([DECK_ORDER[a], DECK_ORDER[b]] + board_cards), i, w))
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def hand_vs_range_equity(hand, villain_range, board=(), samples=RUNOUT_SAMPLES, rng=None):
+    """
+    Share of the pot ``hand`` wins on average against ``villain_range`` (ties
+    split). Before the flop this is a lookup once preflop_equity has been
+    built from every board, or from at least ``samples`` per matchup.
+    """
+    if not board:
+        # Imported here because preflop_equity indexes its matrix by this module's combos
+        import preflop_equity
+        table = preflop_equity.load()
+        if table is not None and table.covers(samples):
+            return table.hand_vs_range(hand, villain_range)
+    board = list(board)
+    hero_mask = card_mask(hand)
+    villain = villain_range.combos()
+    won = 0.0
+    total = 0.0
+    for runout in runouts(board, hero_mask | card_mask(board), samples, rng):
+        final_board = board + runout
+        board_mask = card_mask(final_board)
+        hero_rank = hand_rank(list(hand) + final_board)
+        for i, w in villain:
+            mask = COMBO_MASKS[i]
+            if mask & board_mask or mask & hero_mask:
+                continue
+            a, b = COMBOS[i]
+            villain_rank = hand_rank([DECK_ORDER[a], DECK_ORDER[b]] + final_board)
+            if hero_rank > villain_rank:
+                won += w
+            elif hero_rank == villain_rank:
+                won += w / 2
+            total += w
+    return won / total if total else 0.0
+
+
+def range_vs_range_equity(hero_range, villain_range, board=(), samples=RUNOUT_SAMPLES, rng=None):
+    """Weighted equity of ``hero_range`` against ``villain_range`` over compatible combo pairs."""
+    board = list(board)
+    hero = hero_range.combos()
+    villain = villain_range.combos()
+    won = 0.0
+    total = 0.0
+    for runout in runouts(board, card_mask(board), samples, rng):
+        final_board = board + runout
+        board_mask = card_mask(final_board)
+        hero_rows = _rank_combos(hero, final_board, board_mask)
+        villain_rows = _rank_combos(villain, final_board, board_mask)
+        runout_won, runout_total = _sweep(hero_rows, villain_rows)
+        won += runout_won
+        total += runout_total
+    return won / total if total else 0.0
+
+
+def _sweep(hero_rows, villain_rows):
+    """
+    Walks both rank-sorted lists once. Villain weight below (and equal to) each hero
+    rank is kept overall and per card, so the combos sharing a card with the hero
+    hand can be subtracted instead of checked pair by pair.
+    """
+    villain_weight = {i: w for _, i, w in villain_rows}
+    card_total = [0.0] * 52
+    total_weight = 0.0
+    for _, i, w in villain_rows:
+        a, b = COMBOS[i]
+        card_total[a] += w
+        card_total[b] += w
+        total_weight += w
+
+    card_below = [0.0] * 52
+    below = 0.0
+    v = 0
+    n = len(villain_rows)
+    won = 0.0
+    total = 0.0
+    h = 0
+    while h < len(hero_rows):
+        rank = hero_rows[h][0]
+        # Villain combos strictly below this rank
+        while v < n and villain_rows[v][0] < rank:
+            _, i, w = villain_rows[v]
+            a, b = COMBOS[i]
+            card_below[a] += w
+            card_below[b] += w
+            below += w
+            v += 1
+        # Villain combos tied with this rank
+        card_equal = {}
+        equal = 0.0
+        e = v
+        while e < n and villain_rows[e][0] == rank:
+            _, i, w = villain_rows[e]
+            a, b = COMBOS[i]
+            card_equal[a] = card_equal.get(a, 0.0) + w
+            card_equal[b] = card_equal.get(b, 0.0) + w
+            equal += w
+            e += 1
+        # Every hero combo with this rank
+        while h < len(hero_rows) and hero_rows[h][0] == rank:
+            _, i, w = hero_rows[h]
+            a, b = COMBOS[i]
+            same = villain_weight.get(i, 0.0)  # the villain holding the very same cards
+            # A combo sharing both cards has the same rank, so it is never below
+            win_w = below - card_below[a] - card_below[b]
+            tie_w = equal - card_equal.get(a, 0.0) - card_equal.get(b, 0.0) + same
+            all_w = total_weight - card_total[a] - card_total[b] + same
+            won += w * (win_w + tie_w / 2)
+            total += w * all_w
+            h += 1
+    return won, total
@@ -0,0 +1,118 @@
+"""
+The "search" play style.
+
+Instead of a fixed score, ai_decision_search estimates the chip EV of folding,
+calling and raising by playing the rest of the hand out on cloned
+HoldemEngine tables. The cards the player can't see (opponents' hole cards
+and the deck) are reshuffled for every rollout, opponents play their own
+styles, and the search stops when its per-decision time budget runs out,
+or after a fixed number of deals (fixed_rollouts) when the choices have to
+be the same on any machine, as in seeded simulations.
+"""
+import time
+
+from betting import decision_figures
+from engine import HoldemEngine
+from texasholdem import AI_RAISE_AMOUNT, ai_decision_strategic, ai_random, ai_raise_size, evaluate_hand
+
+SEARCH_TIME_BUDGET_MS = 200
+# How the searching seat (and any other search seat) plays later decisions inside a rollout
+ROLLOUT_STYLE = "strategic"
+
+
+def ai_decision_search(player, community_cards, current_bet, pot, stage, raise_count,
+                       game=None, time_budget_ms=SEARCH_TIME_BUDGET_MS, rng=None, rollouts=None, betting=None):
+    """
+    Plays deals until the time budget runs out, or exactly ``rollouts``
+    deals without looking at the clock.
+    """
+    if not isinstance(game, HoldemEngine):
+        # Nothing to search on without the table, so play like the strategic style
+        return ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count,
+                                     betting=betting)
+
+    deadline = time.perf_counter() + time_budget_ms / 1000.0
+    # Like the other styles, draw from ai_random, which a seeded run points at its own Random
+    rng = rng if rng is not None else ai_random
+    root = game.clone()
+    seat = game.players.index(player)
+
+    candidates = candidate_actions(player, community_cards, current_bet, pot, raise_count, betting)
+    # Folding forfeits nothing more than what is already in the pot
+    totals = {c: 0 for c in candidates}
+    counts = {c: 0 for c in candidates}
+    searched = [c for c in candidates if c[0] != "fold"]
+    deals = 0
+    while searched:
+        # Every action is played against the same deal, which keeps the comparison
+        # fair with only a handful of rollouts.
+        sampled = root.clone(rng=rng)
+        deal_unknown_cards(sampled, seat, rng)
+        for action, amount in searched:
+            totals[(action, amount)] += rollout(sampled, seat, action, amount)
+            counts[(action, amount)] += 1
+        deals += 1
+        if deals == rollouts or (rollouts is None and time.perf_counter() >= deadline):
+            break
+
+    return max(candidates, key=lambda c: totals[c] / counts[c] if counts[c] else 0)
+
+
+def fixed_rollouts(decide, rollouts):
+    """
+    ``decide`` (ai_decision or a drop-in for it) with the search seats
+    playing exactly ``rollouts`` deals per decision.
+    """
+    def decide_fixed(player, community_cards, current_bet, pot, stage, raise_count, game=None, betting=None):
+        if player.play_style == "search":
+            return ai_decision_search(player, community_cards, current_bet, pot, stage, raise_count,
+                                      game, rollouts=rollouts, betting=betting)
+        return decide(player, community_cards, current_bet, pot, stage, raise_count, game, betting)
+    return decide_fixed
+
+
+def candidate_actions(player, community_cards, current_bet, pot, raise_count, betting=None):
+    candidates = []
+    required = current_bet - player.current_bet
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
+    if required > 0:
+        candidates.append(("fold", 0))
+    candidates.append(("call", 0))
+    if raise_count < 2 and player.chips > required + AI_RAISE_AMOUNT:
+        hand_strength = evaluate_hand(player.cards, community_cards)
+        candidates.append(("raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack)))
+    elif player.chips > required:
+        candidates.append(("all-in", 0))
+    return candidates
+
+
+def rollout(sampled, seat, action, amount):
+    """Plays the rest of a sampled hand after ``action`` and returns the chips won or lost."""
+    table = sampled.clone()
+    me = table.players[seat]
+    start_chips = me.chips
+
+    for p in table.players:
+        p.is_human = False
+        if p.play_style == "search":
+            p.play_style = ROLLOUT_STYLE
+    table.human_turn = False
+
+    table.process_ai_action(me, action, amount)
+    table.run_betting_round()
+    return me.chips - start_chips
+
+
+def deal_unknown_cards(table, seat, rng):
+    """Re-deals every card the player in ``seat`` can't see."""
+    unknown = list(table.deck)
+    for i, p in enumerate(table.players):
+        if i != seat:
+            unknown.extend(p.cards)
+    rng.shuffle(unknown)
+    for i, p in enumerate(table.players):
+        if i != seat:
+            n = len(p.cards)
+            p.cards = unknown[-n:] if n else []
+            del unknown[len(unknown) - n:]
+    table.deck = unknown
@@ -0,0 +1,79 @@
+"""
+Counters and histograms in shared memory, for totals over many processes.
+
+A SharedCounters is one multiprocessing.shared_memory block of int64
+counters: named fields (a counter is a field of size 1, a histogram a field
+of one counter per bucket) repeated once per slot. Each worker process
+claims a slot and adds to it in place, so there are no locks and nothing is
+pickled per update. The parent reads the block directly, summing the slots,
+while the workers are still running.
+
+Pickling a SharedCounters (e.g. as a Pool initializer argument under the
+spawn start method) attaches to the same block by name.
+"""
+from multiprocessing import shared_memory
+
+COUNTER_SIZE = 8  # bytes per int64 counter
+
+
+class SharedCounters:
+    """
+    ``fields`` is a list of (name, number of counters). ``slots`` is how many
+    writers there are. Pass ``name`` to attach to an existing block;
+    otherwise a zeroed one is created and unlinked again by close().
+    """
+
+    def __init__(self, fields, slots=1, name=None):
+        self.fields = list(fields)
+        self.slots = slots
+        self.offsets = {}
+        offset = 0
+        for field, size in self.fields:
+            self.offsets[field] = (offset, size)
+            offset += size
+        self.row_size = offset
+        nbytes = COUNTER_SIZE * self.row_size * slots
+        self.owner = name is None
+        if self.owner:
+            # New shared memory is zero-filled
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name)
+        self.counts = self.shm.buf[:nbytes].cast("q")
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __reduce__(self):
+        return SharedCounters, (self.fields, self.slots, self.name)
+
+    def add(self, slot, field, index=0, amount=1):
+        """Adds ``amount`` to counter ``index`` of ``field`` in ``slot``."""
+        offset, size = self.offsets[field]
+        if not 0 <= index < size:
+            raise IndexError(f"{field} has {size} counters, not {index + 1}")
+        self.counts[slot * self.row_size + offset + index] += amount
+
+    def totals(self, field):
+        """``field``'s counters summed over every slot."""
+        offset, size = self.offsets[field]
+        totals = [0] * size
+        counts = self.counts
+        for start in range(offset, len(counts), self.row_size):
+            for i in range(size):
+                totals[i] += counts[start + i]
+        return totals
+
+    def close(self):
+        # The view must go before the block can be closed
+        self.counts.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,412 @@
+"""
+Headless simulation runner.
+
+Plays all-AI tables on HoldemEngine and streams one result per hand as JSONL
+or CSV, or collects them into columns for Parquet / .npy files (columnar.py).
+Hands are played in sessions of SESSION_HANDS: each session is its own table
+with fresh stacks and a seed derived from --seed, so the output is the same
+for any number of workers. Busted seats rebuy before the next hand. Results
+go through generators from the tables to the output, so memory stays flat
+however many hands are played.
+
+Sessions run on a pool of processes by default, or of threads with --pool
+thread. Each session's table, players and AI random source belong to the
+thread playing it, so threads share nothing but the read-only evaluator
+tables and skip the process start-up and pickling. Threads only run in
+parallel on a free-threaded (3.13t) build; with the GIL they take turns.
+
+    python texasholdem.py simulate --hands 100000 --seats strategic,chaos,risk_taker --workers 4
+    python simulate.py --hands 1000 --format csv --output hands.csv
+    python simulate.py --hands 1000000 --format npy --output hands/
+    python simulate.py --hands 100000 --workers 8 --pool thread --output /dev/null
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import columnar
+from shared_stats import SharedCounters
+from engine import STAGES, HoldemEngine
+from ranges import RANK_CHARS, SUIT_CHARS
+from texasholdem import (
+    DEFAULT_SEATS, STARTING_CHIPS, Player, ai_decision, ai_random, hand_description, hand_rank,
+)
+
+PLAY_STYLES = ["straightforward", "risk_taker", "strategic", "chaos", "search", "cfr"]
+SESSION_HANDS = 1000
+FORMATS = ["jsonl", "csv", "parquet", "npy"]
+POOLS = ["process", "thread"]
+COLUMNAR_FORMATS = ["parquet", "npy"]
+# Codes for the winning_hand column (0: nobody showed down)
+HAND_NAMES = ["", "High Card", "One Pair", "Two Pair", "Three of a Kind", "Straight", "Flush",
+              "Full House", "Four of a Kind", "Straight Flush", "Royal Flush"]
+BOARD_STAGES = {0: "preflop", 3: "flop", 4: "turn", 5: "river"}
+# --summary histogram of pot sizes in big blinds: under 1, then doubling up to 256 and more
+POT_BUCKETS = 10
+PROGRESS_INTERVAL = 0.5  # seconds between --summary progress reports
+# Deals per search decision. A fixed count rather than search_ai's time budget keeps seeded runs repeatable.
+SEARCH_ROLLOUTS = 100
+
+
+class SimulationConfig:
+    def __init__(self, styles, hands, small_blind=50, big_blind=100, chips=STARTING_CHIPS, seed=0,
+                 policy_tables=False, search_rollouts=SEARCH_ROLLOUTS):
+        self.styles = list(styles)
+        self.hands = hands
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.chips = chips
+        self.seed = seed
+        # Rule-based styles decide from policy_tables lookups (the same decisions)
+        self.policy_tables = policy_tables
+        # 0 lets search seats use their time budget instead
+        self.search_rollouts = search_rollouts
+
+    @property
+    def sessions(self):
+        return (self.hands + SESSION_HANDS - 1) // SESSION_HANDS
+
+
+def card_code(card):
+    return RANK_CHARS[card.id % 13] + SUIT_CHARS[card.id // 13]
+
+
+def seat_names(styles):
+    return [f"Seat {i + 1}" for i in range(len(styles))]
+
+
+def play_session(config, session):
+    """Yields the result of every hand in ``session``."""
+    seed = config.seed * 1000003 + session
+    # The AIs draw from this thread's ai_random, the deck from the table's own rng
+    ai_random.rng = random.Random(seed)
+    players = [
+        Player(name, config.chips, play_style=style)
+        for name, style in zip(seat_names(config.styles), config.styles)
+    ]
+    decide = ai_decision
+    if config.policy_tables:
+        from policy_tables import policy_decision
+        decide = policy_decision
+    if config.search_rollouts and "search" in config.styles:
+        from search_ai import fixed_rollouts
+        decide = fixed_rollouts(decide, config.search_rollouts)
+    table = HoldemEngine(players, config.small_blind, config.big_blind,
+                         dealer_index=session % len(players), rng=random.Random(seed), decide=decide)
+
+    first = session * SESSION_HANDS
+    for hand in range(first, min(first + SESSION_HANDS, config.hands)):
+        for p in players:
+            if p.chips <= 0:
+                p.chips = config.chips
+        before = [p.chips for p in players]
+        table.start_hand()
+        net = [p.chips - b for p, b in zip(players, before)]
+        contenders = [p for p in players if not p.folded]
+        winning_hand = ""
+        if len(contenders) > 1:
+            board = table.community_cards
+            winning_hand = hand_description(max(hand_rank(p.cards + board) for p in contenders))
+        yield {
+            "hand": hand,
+            "dealer": table.dealer_index,
+            # Where the hand ended: a showdown, or the street everyone else folded on
+            "stage": "showdown" if winning_hand else BOARD_STAGES[len(table.community_cards)],
+            "pot": sum(table.player_contributions),
+            "board": " ".join(card_code(c) for c in table.community_cards),
+            "winners": [p.name for p, n in zip(players, net) if n > 0],
+            "winning_hand": winning_hand,
+            "net": net,
+        }
+        table.dealer_index = (table.dealer_index + 1) % len(players)
+
+
+def _session_rows(args):
+    # Runs in a worker, so the session comes back as one list
+    config, session = args
+    return list(play_session(config, session))
+
+
+def simulate(config, workers=1, pool="process"):
+    """Yields hand results in order, playing sessions on ``workers`` processes or threads."""
+    if workers <= 1:
+        for session in range(config.sessions):
+            yield from play_session(config, session)
+        return
+
+    if pool == "thread":
+        executor = ThreadPoolExecutor(workers)
+        run = executor.map
+    else:
+        executor = multiprocessing.Pool(workers)
+        run = executor.imap
+    with executor:
+        # Submitting a few sessions per worker at a time keeps finished results
+        # from piling up when the output is slower than the tables.
+        window = workers * 2
+        for start in range(0, config.sessions, window):
+            batch = [(config, s) for s in range(start, min(start + window, config.sessions))]
+            for rows in run(_session_rows, batch):
+                yield from rows
+
+
+def summary_fields(styles):
+    """SharedCounters fields for --summary: per-style fields have one counter per distinct style."""
+    count = len(dict.fromkeys(styles))
+    return [("hands", 1), ("stage", len(STAGES)), ("winning_hand", len(HAND_NAMES)), ("pot", POT_BUCKETS),
+            ("seat_hands", count), ("won", count), ("net", count)]
+
+
+def pot_bucket(pot, big_blind):
+    return min((pot // big_blind).bit_length(), POT_BUCKETS - 1)
+
+
+def record_hand(counters, slot, row, config, style_of_seat):
+    """Adds one hand result to ``slot`` of the summary counters."""
+    counters.add(slot, "hands")
+    counters.add(slot, "stage", STAGES.index(row["stage"]))
+    counters.add(slot, "winning_hand", HAND_NAMES.index(row["winning_hand"]))
+    counters.add(slot, "pot", pot_bucket(row["pot"], config.big_blind))
+    for seat, amount in enumerate(row["net"]):
+        style = style_of_seat[seat]
+        counters.add(slot, "seat_hands", style)
+        counters.add(slot, "net", style, amount)
+        if amount > 0:
+            counters.add(slot, "won", style)
+
+
+def _record_session(counters, slot, config, session):
+    style_order = list(dict.fromkeys(config.styles))
+    style_of_seat = [style_order.index(style) for style in config.styles]
+    for row in play_session(config, session):
+        record_hand(counters, slot, row, config, style_of_seat)
+
+
+_summary_slot = None  # (counters, slot) in a --summary worker process
+
+
+def _init_summary_worker(counters, next_slot):
+    global _summary_slot
+    with next_slot.get_lock():
+        slot = next_slot.value
+        next_slot.value += 1
+    _summary_slot = counters, slot
+
+
+def _summary_session(session_args):
+    # Runs in a worker process; the results go to shared memory, not back to the parent
+    config, session = session_args
+    counters, slot = _summary_slot
+    _record_session(counters, slot, config, session)
+
+
+def summarize(config, workers=1, pool="process", progress=None):
+    """
+    Plays ``config``'s hands and returns their totals in SharedCounters (see
+    summary_fields; close() them when done). Worker processes add every hand
+    to their own slot of the shared block instead of sending rows back, and
+    ``progress(counters)`` is called about every PROGRESS_INTERVAL seconds
+    while they play. Worker threads share memory anyway, so their rows are
+    added up here.
+    """
+    fields = summary_fields(config.styles)
+    if workers <= 1 or pool == "thread":
+        counters = SharedCounters(fields)
+        style_order = list(dict.fromkeys(config.styles))
+        style_of_seat = [style_order.index(style) for style in config.styles]
+        due = time.perf_counter() + PROGRESS_INTERVAL
+        for row in simulate(config, workers, pool):
+            record_hand(counters, 0, row, config, style_of_seat)
+            if progress is not None and time.perf_counter() >= due:
+                progress(counters)
+                due = time.perf_counter() + PROGRESS_INTERVAL
+        return counters
+
+    counters = SharedCounters(fields, workers)
+    next_slot = multiprocessing.Value("i", 0)
+    try:
+        with multiprocessing.Pool(workers, _init_summary_worker, (counters, next_slot)) as workers_pool:
+            result = workers_pool.map_async(_summary_session, [(config, s) for s in range(config.sessions)],
+                                            chunksize=1)
+            while not result.ready():
+                result.wait(PROGRESS_INTERVAL)
+                if progress is not None:
+                    progress(counters)
+            result.get()
+    except BaseException:
+        counters.close()
+        raise
+    return counters
+
+
+def format_summary(counters, config):
+    """Lines of text reporting the totals from summarize()."""
+    hands = counters.totals("hands")[0]
+    lines = [f"{hands:,} hands"]
+    lines.append(f"{'style':<16} {'seat hands':>10} {'won':>7} {'net chips':>12} {'per 100':>9}")
+    seat_hands, won, net = counters.totals("seat_hands"), counters.totals("won"), counters.totals("net")
+    for i, style in enumerate(dict.fromkeys(config.styles)):
+        share = won[i] / seat_hands[i] if seat_hands[i] else 0.0
+        per_100 = 100 * net[i] / seat_hands[i] if seat_hands[i] else 0.0
+        lines.append(f"{style:<16} {seat_hands[i]:>10,} {share:>7.1%} {net[i]:>12,} {per_100:>9,.0f}")
+
+    def histogram(title, names, counts):
+        lines.append("")
+        lines.append(title)
+        for name, n in zip(names, counts):
+            if n:
+                lines.append(f"  {name:<16} {n:>10,} {n / hands:>7.1%}")
+
+    histogram("Stage reached", STAGES, counters.totals("stage"))
+    histogram("Winning hand", ["(no showdown)"] + HAND_NAMES[1:], counters.totals("winning_hand"))
+    pot_names = ["< 1 BB"] + [f"{2 ** (b - 1)}-{2 ** b} BB" for b in range(1, POT_BUCKETS - 1)]
+    histogram("Pot size", pot_names + [f">= {2 ** (POT_BUCKETS - 2)} BB"], counters.totals("pot"))
+    return lines
+
+
+def jsonl_lines(results):
+    for row in results:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def csv_lines(results, styles):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    names = seat_names(styles)
+    writer.writerow(["hand", "dealer", "stage", "pot", "board", "winners", "winning_hand"]
+                    + [f"{name} ({style})" for name, style in zip(names, styles)])
+    header = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    yield header
+    for row in results:
+        writer.writerow([row["hand"], row["dealer"], row["stage"], row["pot"], row["board"],
+                         ";".join(row["winners"]), row["winning_hand"]] + row["net"])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_results(config, out, fmt="jsonl", workers=1, pool="process"):
+    """Streams ``config``'s hands to the file object ``out``; returns the number of hands."""
+    results = simulate(config, workers, pool)
+    lines = jsonl_lines(results) if fmt == "jsonl" else csv_lines(results, config.styles)
+    count = 0
+    for line in lines:
+        out.write(line)
+        count += 1
+    return count - (fmt == "csv")  # the CSV header isn't a hand
+
+
+def column_schema(styles):
+    schema = [("hand", "q"), ("dealer", "B"), ("winner", "b"), ("pot", "i"), ("stage", "B"),
+              ("winning_hand", "B")]
+    return schema + [(f"net_{style}", "q") for style in dict.fromkeys(styles)]
+
+
+def write_columns(config, path, fmt=None, workers=1, pool="process"):
+    """
+    Collects ``config``'s hands into typed columns and writes them to ``path``
+    (a Parquet file, or a directory of .npy files). Returns the number of hands.
+
+    winner is the seat that won the most chips (-1 when nobody did), stage and
+    winning_hand are codes into the "stages" and "hands" lists in the metadata,
+    and net_<style> sums the chip deltas of every seat playing that style.
+    """
+    style_order = list(dict.fromkeys(config.styles))
+    style_of_seat = [style_order.index(style) for style in config.styles]
+    metadata = {"stages": STAGES, "hands": HAND_NAMES, "styles": config.styles, "seed": config.seed}
+    schema = column_schema(config.styles)
+    columns = columnar.ColumnBuffer(schema, columnar.open_sink(path, schema, metadata, fmt))
+    for row in simulate(config, workers, pool):
+        net = row["net"]
+        best = max(net)
+        per_style = [0] * len(style_order)
+        for seat, amount in enumerate(net):
+            per_style[style_of_seat[seat]] += amount
+        columns.append([
+            row["hand"], row["dealer"], net.index(best) if best > 0 else -1, row["pot"],
+            STAGES.index(row["stage"]), HAND_NAMES.index(row["winning_hand"]),
+        ] + per_style)
+    return columns.close()
+
+
+def parse_seats(text):
+    styles = [s.strip() for s in text.split(",") if s.strip()]
+    for style in styles:
+        if style not in PLAY_STYLES:
+            raise argparse.ArgumentTypeError(
+                f"unknown play style {style!r} (choose from {', '.join(PLAY_STYLES)})")
+    if not 2 <= len(styles) <= 10:
+        raise argparse.ArgumentTypeError("a table needs 2 to 10 seats")
+    return styles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="simulate", description="Play headless Texas Hold'em hands.")
+    parser.add_argument("--seats", type=parse_seats,
+                        default=[style for _, style in DEFAULT_SEATS],
+                        help="comma-separated play style per seat")
+    parser.add_argument("--hands", type=int, default=1000)
+    parser.add_argument("--small-blind", type=int, default=50)
+    parser.add_argument("--big-blind", type=int, default=100)
+    parser.add_argument("--chips", type=int, default=STARTING_CHIPS, help="starting (and rebuy) stack")
+    parser.add_argument("--seed", type=int, default=None, help="random when omitted")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--pool", choices=POOLS, default="process",
+                        help="run the workers as processes or threads")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--output", default="-", help="file to write, - for stdout")
+    parser.add_argument("--policy-tables", action="store_true",
+                        help="look the rule-based styles' decisions up in precomputed tables")
+    parser.add_argument("--search-rollouts", type=int, default=SEARCH_ROLLOUTS,
+                        help="deals the search style plays per decision; 0 searches for a fixed time "
+                             "instead, which makes the run depend on the machine's speed")
+    parser.add_argument("--summary", action="store_true",
+                        help="print totals per style, stage, winning hand and pot size instead of every hand")
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    config = SimulationConfig(args.seats, args.hands, args.small_blind, args.big_blind,
+                              args.chips, seed, args.policy_tables, args.search_rollouts)
+    start = time.perf_counter()
+    if args.summary:
+        def progress(counters):
+            print(f"\r{counters.totals('hands')[0]:,} of {config.hands:,} hands", end="", file=sys.stderr,
+                  flush=True)
+
+        counters = summarize(config, args.workers, args.pool, progress)
+        progress(counters)
+        print(file=sys.stderr)
+        lines = format_summary(counters, config)
+        count = counters.totals("hands")[0]
+        counters.close()
+        print("\n".join(lines))
+    elif args.format in COLUMNAR_FORMATS:
+        if args.output == "-":
+            parser.error(f"--format {args.format} needs an --output path")
+        if args.format == "parquet" and columnar.pyarrow is None:
+            parser.error("--format parquet needs pyarrow; use --format npy instead")
+        count = write_columns(config, args.output, args.format, args.workers, args.pool)
+    elif args.output == "-":
+        try:
+            count = write_results(config, sys.stdout, args.format, args.workers, args.pool)
+        except BrokenPipeError:
+            # The reader went away (e.g. piped into head); stop quietly
+            sys.stdout = None
+            return
+    else:
+        with open(args.output, "w", newline="") as out:
+            count = write_results(config, out, args.format, args.workers, args.pool)
+    elapsed = time.perf_counter() - start
+    print(f"Played {count} hands in {elapsed:.1f} s (seed {seed})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Spectator mode: every seat is an AI and the window is a live dashboard.
+
+The table plays on the headless HoldemEngine in its own process, as fast as
+it can. A few times a second it posts a sample to a queue: hands played so
+far, each seat's net chips and a snapshot of the hand in progress. Posting
+never waits (a sample the window hasn't collected yet is simply skipped), so
+however slow the drawing is, it can't hold the table back. The window shows
+hands per second, a net chips graph per seat and the sampled hand.
+
+    python spectator.py --seats strategic,chaos,risk_taker,straightforward
+    python texasholdem.py spectate --seats strategic,cfr --seed 7
+"""
+import argparse
+import multiprocessing
+import queue
+import random
+import time
+import tkinter as tk
+from tkinter import font as tkFont
+
+from engine import HoldemEngine
+from simulate import card_code, parse_seats, seat_names
+from texasholdem import DEFAULT_SEATS, STARTING_CHIPS, Player
+
+SAMPLE_INTERVAL = 0.1  # seconds between samples from the table
+POLL_INTERVAL = 100    # ms between checks of the sample queue
+MAX_POINTS = 600       # graph points kept; older ones are thinned out
+GRAPH_WIDTH = 900
+GRAPH_HEIGHT = 320
+SEAT_COLORS = ["#1F77B4", "#FF7F0E", "#2CA02C", "#D62728", "#9467BD",
+               "#8C564B", "#E377C2", "#7F7F7F", "#BCBD22", "#17BECF"]
+
+
+def play_table(styles, chips, seed, samples, stop, interval=SAMPLE_INTERVAL):
+    """
+    Plays hands until ``stop`` is set, posting a sample to the ``samples``
+    queue every ``interval`` seconds. Runs in the spectator's worker process.
+    """
+    random.seed(seed)
+    players = [Player(name, chips, play_style=style) for name, style in zip(seat_names(styles), styles)]
+    bought = [chips] * len(players)
+    net = [0] * len(players)
+    start = time.perf_counter()
+    due = start
+    hands = 0
+
+    def on_update(table):
+        nonlocal due
+        now = time.perf_counter()
+        if now < due:
+            return
+        try:
+            samples.put_nowait({
+                "hands": hands,
+                "elapsed": now - start,
+                "net": list(net),
+                "snapshot": table.snapshot(),
+            })
+            due = now + interval
+        except queue.Full:
+            pass  # the window is behind; try again on the next update
+
+    table = HoldemEngine(players, rng=random.Random(seed), on_update=on_update)
+    while not stop.is_set():
+        for i, p in enumerate(players):
+            if p.chips <= 0:
+                # Busted seats rebuy, and the graph counts the rebuy as a loss
+                p.chips = chips
+                bought[i] += chips
+        table.start_hand()
+        hands += 1
+        for i, p in enumerate(players):
+            net[i] = p.chips - bought[i]
+        table.dealer_index = (table.dealer_index + 1) % len(players)
+
+
+class SpectatorApp:
+    def __init__(self, root, styles, chips=STARTING_CHIPS, seed=None):
+        self.root = root
+        self.styles = styles
+        self.names = seat_names(styles)
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.points = []       # (hands, net per seat)
+        self.last_sample = None
+        self.rate = 0.0
+
+        self.samples = multiprocessing.Queue(maxsize=4)
+        self.stop = multiprocessing.Event()
+        self.worker = multiprocessing.Process(
+            target=play_table, args=(styles, chips, self.seed, self.samples, self.stop), daemon=True
+        )
+
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL, self.poll)
+
+    def setup_ui(self):
+        self.root.title("Texas Hold'em spectator")
+        bold = tkFont.Font(family="Helvetica", size=14, weight="bold")
+        self.rate_label = tk.Label(self.root, text="Starting...", font=bold, anchor="w")
+        self.rate_label.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+        self.graph = tk.Canvas(self.root, width=GRAPH_WIDTH, height=GRAPH_HEIGHT, bg="white")
+        self.graph.pack(side=tk.TOP, padx=10)
+
+        legend = tk.Frame(self.root)
+        legend.pack(side=tk.TOP, fill=tk.X, padx=10)
+        for i, (name, style) in enumerate(zip(self.names, self.styles)):
+            color = SEAT_COLORS[i % len(SEAT_COLORS)]
+            tk.Label(legend, text=f"■ {name} ({style})", fg=color).pack(side=tk.LEFT, padx=5)
+
+        self.hand_text = tk.Text(self.root, height=len(self.names) + 4, width=100, font=("Courier", 12))
+        self.hand_text.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+    def poll(self):
+        latest = None
+        try:
+            while True:
+                sample = self.samples.get_nowait()
+                self.add_point(sample)
+                latest = sample
+        except queue.Empty:
+            pass
+        if latest is not None:
+            self.show(latest)
+        self.root.after(POLL_INTERVAL, self.poll)
+
+    def add_point(self, sample):
+        if self.last_sample is not None:
+            seconds = sample["elapsed"] - self.last_sample["elapsed"]
+            if seconds > 0:
+                self.rate = (sample["hands"] - self.last_sample["hands"]) / seconds
+        self.last_sample = sample
+        self.points.append((sample["hands"], sample["net"]))
+        if len(self.points) > MAX_POINTS:
+            # Thin the history so drawing stays cheap however long the table runs
+            self.points = self.points[::2]
+
+    def show(self, sample):
+        average = sample["hands"] / sample["elapsed"] if sample["elapsed"] > 0 else 0.0
+        self.rate_label.config(
+            text=f"{sample['hands']:,} hands   {self.rate:,.0f} hands/s now, "
+                 f"{average:,.0f} on average   (seed {self.seed})"
+        )
+        self.draw_graph()
+        self.draw_hand(HoldemEngine.from_snapshot(sample["snapshot"]))
+
+    def draw_graph(self):
+        canvas = self.graph
+        canvas.delete("all")
+        if len(self.points) < 2:
+            return
+        first, last = self.points[0][0], self.points[-1][0]
+        low = min(min(net) for _, net in self.points)
+        high = max(max(net) for _, net in self.points)
+        low, high = min(low, 0), max(high, 0)
+        span_x = max(last - first, 1)
+        span_y = max(high - low, 1)
+        pad = 10
+
+        def x(hands):
+            return pad + (hands - first) * (GRAPH_WIDTH - 2 * pad) / span_x
+
+        def y(value):
+            return GRAPH_HEIGHT - pad - (value - low) * (GRAPH_HEIGHT - 2 * pad) / span_y
+
+        canvas.create_line(pad, y(0), GRAPH_WIDTH - pad, y(0), fill="#CCCCCC")
+        canvas.create_text(pad + 2, pad, text=f"{high:+,}", anchor="nw", fill="#666666")
+        canvas.create_text(pad + 2, GRAPH_HEIGHT - pad, text=f"{low:+,}", anchor="sw", fill="#666666")
+        for seat in range(len(self.names)):
+            coords = []
+            for hands, net in self.points:
+                coords += [x(hands), y(net[seat])]
+            canvas.create_line(*coords, fill=SEAT_COLORS[seat % len(SEAT_COLORS)], width=2)
+
+    def draw_hand(self, table):
+        lines = [f"{table.stage.capitalize()}   pot {table.pot}   "
+                 f"board {' '.join(card_code(c) for c in table.community_cards) or '-'}", ""]
+        for i, p in enumerate(table.players):
+            dealer = "(D)" if i == table.dealer_index else "   "
+            cards = "folded" if p.folded else " ".join(card_code(c) for c in p.cards)
+            lines.append(f"{dealer} {p.name:<8} {p.play_style:<16} {p.chips:>7}  {cards:<7}  {p.last_action}")
+        lines += ["", table.status]
+        self.hand_text.delete("1.0", tk.END)
+        self.hand_text.insert("1.0", "\n".join(lines))
+
+    def close(self):
+        self.stop.set()
+        self.worker.join(timeout=2)
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.root.destroy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="spectate", description="Watch an all-AI table at full speed.")
+    parser.add_argument("--seats", type=parse_seats, default=[style for _, style in DEFAULT_SEATS],
+                        help="comma-separated play style per seat")
+    parser.add_argument("--chips", type=int, default=STARTING_CHIPS, help="starting (and rebuy) stack")
+    parser.add_argument("--seed", type=int, default=None, help="random when omitted")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    SpectatorApp(root, args.seats, args.chips, args.seed)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
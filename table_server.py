@@ -0,0 +1,501 @@
+"""
+Local network table server.
+
+Every connection gets its own HoldemEngine table and takes the human seat
+("You"); the other seats are played by the AI. After each action the server
+sends only the table fields that changed, using a small binary protocol:
+
+    frame   = 2-byte big-endian payload length, payload
+    payload = message type byte, body
+
+Integers are unsigned LEB128 varints and cards are single bytes (their
+position in engine.DECK_ORDER), so a typical action costs a few dozen bytes.
+
+Run ``python table_server.py`` to serve, or ``python table_server.py --bots 200``
+to play scripted loopback clients against a local server.
+"""
+import argparse
+import asyncio
+import random
+import struct
+import time
+
+from engine import CARD_INDEX, STAGES, HoldemEngine
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+MAX_CONNECTIONS = 512
+WRITE_BUFFER_LIMIT = 64 * 1024  # drain() blocks a table once this much output is queued
+IDLE_TIMEOUT = 300  # seconds without a client message before the table is closed
+MAX_VARINT_BYTES = 10  # enough for any 64-bit value
+
+# Server -> client
+MSG_HELLO = 1   # your seat, seat count, then each name as length + utf-8
+MSG_DELTA = 2   # field count, then (field id, value) pairs
+MSG_NOTICE = 3  # utf-8 text, e.g. why an action was rejected
+# Client -> server
+MSG_ACTION = 16    # action code, varint amount (only used by raises)
+MSG_CONTINUE = 17  # deal the next hand once the current one is over
+MSG_BYE = 18
+
+ACTION_FOLD = 0
+ACTION_CALL = 1
+ACTION_RAISE = 2
+ACTION_ALL_IN = 3
+
+# Table fields. Per-seat fields start at SEAT_FIELD_BASE + seat * SEAT_FIELDS.
+F_STAGE = 0
+F_POT = 1
+F_CURRENT_BET = 2
+F_RAISE_COUNT = 3
+F_DEALER = 4
+F_YOUR_TURN = 5
+F_HAND_OVER = 6
+F_BOARD = 7
+SEAT_FIELD_BASE = 8
+SEAT_FIELDS = 5
+S_CHIPS = 0
+S_BET = 1
+S_FOLDED = 2
+S_ACTION = 3  # action code | amount << 3
+S_CARDS = 4
+
+# Codes for Player.last_action
+LAST_ACTION_CODES = {"Fold": 1, "Check": 2, "Call": 3, "Raise": 4, "All-In": 5}
+LAST_ACTION_NAMES = {code: name for name, code in LAST_ACTION_CODES.items()}
+
+_frame_header = struct.Struct(">H")
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """Returns (value, position after it). Raises ValueError for a truncated or overlong varint."""
+    value = 0
+    shift = 0
+    end = min(len(data), pos + MAX_VARINT_BYTES)
+    while pos < end:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+    raise ValueError("Truncated or overlong varint")
+
+
+def frame(payload):
+    return _frame_header.pack(len(payload)) + payload
+
+
+def is_bytes_field(field):
+    return field == F_BOARD or (
+        field >= SEAT_FIELD_BASE and (field - SEAT_FIELD_BASE) % SEAT_FIELDS == S_CARDS
+    )
+
+
+def encode_last_action(last_action):
+    if not last_action:
+        return 0
+    name, _, amount = last_action.partition(" ")
+    code = LAST_ACTION_CODES.get(name, 0)
+    return code | (int(amount) << 3 if amount.isdigit() else 0)
+
+
+def decode_last_action(value):
+    """Turns an S_ACTION value back into Player.last_action text."""
+    name = LAST_ACTION_NAMES.get(value & 7, "")
+    amount = value >> 3
+    return f"{name} {amount}" if amount else name
+
+
+def table_view(engine, seat):
+    """Flat list of field values as the player in ``seat`` may see them."""
+    view = [
+        STAGES.index(engine.stage),
+        engine.pot,
+        engine.current_bet,
+        engine.raise_count,
+        engine.dealer_index,
+        1 if engine.human_turn and engine.current_player_index == seat else 0,
+        1 if engine.hand_over else 0,
+        bytes(CARD_INDEX[c] for c in engine.community_cards),
+    ]
+    showdown = engine.stage == "showdown"
+    for i, p in enumerate(engine.players):
+        view.append(p.chips)
+        view.append(p.current_bet)
+        view.append(1 if p.folded else 0)
+        view.append(encode_last_action(p.last_action))
+        if i == seat or showdown:
+            view.append(bytes(CARD_INDEX[c] for c in p.cards))
+        else:
+            view.append(b"")
+    return view
+
+
+def encode_delta(old, new):
+    """Encodes the fields of ``new`` that differ from ``old``; None if nothing changed."""
+    body = bytearray()
+    count = 0
+    for field, value in enumerate(new):
+        if field < len(old) and old[field] == value:
+            continue
+        count += 1
+        body.append(field)
+        if is_bytes_field(field):
+            body.append(len(value))
+            body += value
+        else:
+            encode_varint(value, body)
+    if not count:
+        return None
+    return bytes([MSG_DELTA, count]) + bytes(body)
+
+
+def apply_delta(view, body):
+    """
+    Applies a MSG_DELTA body to ``view`` and returns the changed field ids.
+    Raises ValueError, leaving ``view`` as it was, for a truncated or
+    malformed body.
+    """
+    if not body:
+        raise ValueError("Empty delta")
+    count = body[0]
+    pos = 1
+    fields = []
+    for _ in range(count):
+        if pos >= len(body):
+            raise ValueError("Truncated delta")
+        field = body[pos]
+        pos += 1
+        if is_bytes_field(field):
+            if pos >= len(body) or pos + 1 + body[pos] > len(body):
+                raise ValueError("Truncated delta")
+            length = body[pos]
+            value = bytes(body[pos + 1:pos + 1 + length])
+            pos += 1 + length
+        else:
+            value, pos = decode_varint(body, pos)
+        fields.append((field, value))
+    if pos != len(body):
+        raise ValueError("Trailing bytes after delta")
+    for field, value in fields:
+        if field >= len(view):
+            view.extend([0] * (field + 1 - len(view)))
+        view[field] = value
+    return [field for field, _ in fields]
+
+
+def encode_hello(seat, names):
+    body = bytearray([MSG_HELLO, seat, len(names)])
+    for name in names:
+        raw = name.encode("utf-8")
+        body.append(len(raw))
+        body += raw
+    return bytes(body)
+
+
+def decode_hello(body):
+    """Returns (seat, names). Raises ValueError for a truncated or malformed body."""
+    if len(body) < 2:
+        raise ValueError("Truncated hello")
+    seat, count = body[0], body[1]
+    pos = 2
+    names = []
+    for _ in range(count):
+        if pos >= len(body) or pos + 1 + body[pos] > len(body):
+            raise ValueError("Truncated hello")
+        length = body[pos]
+        names.append(bytes(body[pos + 1:pos + 1 + length]).decode("utf-8"))
+        pos += 1 + length
+    if pos != len(body):
+        raise ValueError("Trailing bytes after hello")
+    return seat, names
+
+
+def encode_action(action, amount=0):
+    body = bytearray([MSG_ACTION, action])
+    encode_varint(amount, body)
+    return frame(bytes(body))
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(_frame_header.size)
+    (length,) = _frame_header.unpack(header)
+    return await reader.readexactly(length)
+
+
+class TableSession:
+    """One connection's table. Collects a delta frame every time the engine updates."""
+
+    def __init__(self, seat=0, **engine_options):
+        self.seat = seat
+        self.view = []
+        self.frames = []
+        self.engine = HoldemEngine(on_update=self.on_update, **engine_options)
+
+    def on_update(self, engine):
+        view = table_view(engine, self.seat)
+        payload = encode_delta(self.view, view)
+        if payload is not None:
+            self.frames.append(frame(payload))
+        self.view = view
+
+    def start(self):
+        names = [p.name for p in self.engine.players]
+        self.frames.append(frame(encode_hello(self.seat, names)))
+        self.engine.start_hand()
+
+    def handle(self, payload):
+        """
+        Applies one client message. Returns False when the client is leaving.
+        Malformed messages are answered with a notice and otherwise ignored.
+        """
+        msg_type = payload[0]
+        engine = self.engine
+        if msg_type == MSG_ACTION:
+            if len(payload) < 2:
+                self.notice("Malformed action: no action code.")
+                return True
+            action = payload[1]
+            amount, end = 0, 2
+            if len(payload) > 2:
+                try:
+                    amount, end = decode_varint(payload, 2)
+                except ValueError as e:
+                    self.notice(f"Malformed action: {e}.")
+                    return True
+            if end != len(payload):
+                self.notice("Malformed action: trailing bytes.")
+                return True
+            if action == ACTION_FOLD:
+                accepted = engine.human_fold()
+            elif action == ACTION_CALL:
+                accepted = engine.human_call()
+            elif action == ACTION_RAISE:
+                accepted = engine.human_bet(amount)
+            elif action == ACTION_ALL_IN:
+                accepted = engine.human_all_in()
+            else:
+                accepted = False
+            if not accepted:
+                self.notice(engine.status if engine.human_turn else "It is not your turn.")
+        elif msg_type == MSG_CONTINUE:
+            if engine.hand_over:
+                engine.end_hand()
+            else:
+                self.notice("The hand is still in progress.")
+        elif msg_type == MSG_BYE:
+            return False
+        else:
+            self.notice(f"Unknown message type {msg_type}.")
+        return True
+
+    def notice(self, text):
+        self.frames.append(frame(bytes([MSG_NOTICE]) + text.encode("utf-8")))
+
+    def take_frames(self):
+        data = b"".join(self.frames)
+        self.frames.clear()
+        return data
+
+
+class TableServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_connections=MAX_CONNECTIONS,
+                 idle_timeout=IDLE_TIMEOUT, **engine_options):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.engine_options = engine_options
+        self.connections = 0
+        self.hands_played = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, backlog=self.max_connections
+        )
+        # Port 0 asks the OS for a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+    async def handle_connection(self, reader, writer):
+        if self.connections >= self.max_connections:
+            writer.write(frame(bytes([MSG_NOTICE]) + b"Table server is full."))
+            await self.close_writer(writer)
+            return
+        self.connections += 1
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        session = TableSession(**self.engine_options)
+        try:
+            session.start()
+            while True:
+                writer.write(session.take_frames())
+                # Backpressure: a slow reader pauses its own table, not the server
+                await writer.drain()
+                try:
+                    payload = await asyncio.wait_for(read_frame(reader), self.idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                if not payload:
+                    continue
+                was_over = session.engine.hand_over
+                if not session.handle(payload):
+                    break
+                if was_over and not session.engine.hand_over:
+                    self.hands_played += 1
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            await self.close_writer(writer)
+
+    async def close_writer(self, writer):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class TableClient:
+    """Minimal client that keeps a local copy of the table from the server's deltas."""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.seat = None
+        self.names = []
+        self.view = []
+        self.bytes_received = 0
+
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def receive(self):
+        """Reads one message. Returns (message type, changed fields or notice text)."""
+        payload = await read_frame(self.reader)
+        self.bytes_received += len(payload) + _frame_header.size
+        msg_type = payload[0]
+        if msg_type == MSG_HELLO:
+            self.seat, self.names = decode_hello(payload[1:])
+            return msg_type, []
+        if msg_type == MSG_DELTA:
+            return msg_type, apply_delta(self.view, payload[1:])
+        return msg_type, payload[1:].decode("utf-8")
+
+    async def send(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def act(self, action, amount=0):
+        await self.send(encode_action(action, amount))
+
+    async def next_hand(self):
+        await self.send(frame(bytes([MSG_CONTINUE])))
+
+    async def close(self):
+        try:
+            await self.send(frame(bytes([MSG_BYE])))
+        except ConnectionError:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def field(self, field, seat=None):
+        if seat is not None:
+            field = SEAT_FIELD_BASE + seat * SEAT_FIELDS + field
+        return self.view[field] if field < len(self.view) else 0
+
+
+async def play_bot(host, port, hands, rng=None):
+    """Scripted client: mostly calls, sometimes raises or folds. Returns bytes received."""
+    rng = rng if rng is not None else random.Random()
+    client = TableClient()
+    await client.connect(host, port)
+    played = 0
+    while played < hands:
+        msg_type, info = await client.receive()
+        if msg_type == MSG_NOTICE:
+            if client.field(F_YOUR_TURN):
+                # Rejected raise: fall back to calling
+                await client.act(ACTION_CALL)
+            continue
+        if msg_type != MSG_DELTA:
+            continue
+        if F_HAND_OVER in info and client.field(F_HAND_OVER):
+            played += 1
+            if played < hands:
+                await client.next_hand()
+        elif F_YOUR_TURN in info and client.field(F_YOUR_TURN):
+            roll = rng.random()
+            if roll < 0.1:
+                await client.act(ACTION_FOLD)
+            elif roll < 0.25:
+                await client.act(ACTION_RAISE, 200)
+            else:
+                await client.act(ACTION_CALL)
+    await client.close()
+    return client.bytes_received
+
+
+async def run_loopback(bots, hands, max_connections=MAX_CONNECTIONS):
+    server = await TableServer(port=0, max_connections=max_connections).start()
+    start = time.perf_counter()
+    try:
+        received = await asyncio.gather(*(
+            play_bot(DEFAULT_HOST, server.port, hands, random.Random(i)) for i in range(bots)
+        ))
+        # Let the tables see each client's BYE before shutting down
+        while server.connections:
+            await asyncio.sleep(0.01)
+    finally:
+        server.close()
+    elapsed = time.perf_counter() - start
+    total_hands = bots * hands
+    print(f"{bots} clients played {total_hands} hands in {elapsed:.2f}s "
+          f"({total_hands / elapsed:.0f} hands/s, {sum(received) / total_hands:.0f} bytes/hand)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Texas Hold'em tables over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS)
+    parser.add_argument("--bots", type=int, default=0,
+                        help="play this many scripted loopback clients against a local server")
+    parser.add_argument("--hands", type=int, default=10, help="hands per bot")
+    args = parser.parse_args(argv)
+
+    if args.bots:
+        asyncio.run(run_loopback(args.bots, args.hands, max(args.max_connections, args.bots)))
+    else:
+        server = TableServer(args.host, args.port, args.max_connections)
+        print(f"Serving tables on {args.host}:{args.port}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Tests for betting: the figures kept incrementally agree with a scan of the
+seats at every AI decision.
+"""
+import random
+
+from engine import HoldemEngine
+from texasholdem import Player, ai_decision
+
+
+def scanned_effective_stack(players, player):
+    others = [p.chips + p.current_bet for p in players if p is not player and not p.folded]
+    return max(min(player.chips + player.current_bet, max(others, default=0)) - player.current_bet, 0)
+
+
+def test_figures_match_a_scan():
+    rng = random.Random(11)
+    styles = ["straightforward", "strategic", "strategic", "chaos"]
+    players = [Player(f"Seat {i}", play_style=rng.choice(styles)) for i in range(6)]
+    table = HoldemEngine(players, rng=rng)
+    checked = 0
+
+    def decide(player, community_cards, current_bet, pot, stage, raise_count, game=None, betting=None):
+        nonlocal checked
+        assert betting is table.betting
+        assert betting.effective_stack(player) == scanned_effective_stack(table.players, player)
+        assert betting.to_call(player) == min(max(current_bet - player.current_bet, 0), player.chips)
+        assert pot == sum(table.player_contributions)
+        checked += 1
+        return ai_decision(player, community_cards, current_bet, pot, stage, raise_count, game, betting)
+    table.decide = decide
+
+    for _ in range(200):
+        # Uneven stacks, so the deepest seats folding matters
+        for p in players:
+            p.chips = rng.randint(200, 3000)
+        table.start_hand()
+    assert checked > 1000
@@ -0,0 +1,44 @@
+"""
+Tests for cfr_ai: the card buckets keep hand categories apart, and the
+trained tables are found once they exist.
+"""
+import json
+import os
+
+import pytest
+
+import cfr_ai
+from texasholdem import RANK_TUPLES
+
+
+def test_rank_buckets_follow_categories():
+    buckets = {}
+    for rank in RANK_TUPLES[1:]:
+        category = rank[0]
+        if category == 2:
+            category = 2.5 if rank[1] >= 10 else 2  # the pair split: tens or better
+        buckets.setdefault(category, set()).add(cfr_ai.rank_bucket(rank))
+    assert all(len(b) == 1 for b in buckets.values())
+    in_order = [buckets[c].pop() for c in sorted(buckets)]
+    # One bucket per category, capped at the top bucket: full house, quads and straight flush share it
+    assert in_order == [0, 1, 2, 3, 4, 5, 6, 7, 7, 7]
+
+
+def test_load_policy_finds_tables_trained_later(tmp_path):
+    path = str(tmp_path / "tables")
+    assert cfr_ai.load_policy(path) is None
+    cfr_ai.train(path, iterations=20, seed=1)
+    policy = cfr_ai.load_policy(path)
+    assert policy is not None and policy.iterations == 20
+
+
+def test_other_bucketing_is_refused(tmp_path):
+    path = str(tmp_path / "tables")
+    cfr_ai.train(path, iterations=1, seed=1)
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    del meta["bucketing"]  # as written before the buckets were versioned
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    with pytest.raises(ValueError):
+        cfr_ai.CfrPolicy(path)
@@ -0,0 +1,106 @@
+"""
+Tests for engine snapshots and clones: from_snapshot(snapshot()) and
+clone() reproduce the table, a clone plays on without touching the
+original, and from_snapshot() refuses what it can't read.
+"""
+import random
+
+import pytest
+
+from engine import SNAPSHOT_MAGIC, HoldemEngine
+
+
+def waiting_table(seed=0):
+    """A table stopped mid-hand at the human seat's turn."""
+    table = HoldemEngine(rng=random.Random(seed))
+    table.start_hand()
+    return table
+
+
+def table_state(table):
+    """Everything a snapshot keeps, with players and cards as plain values."""
+    def cards(cs):
+        return [(c.rank, c.suit) for c in cs]
+    seat = {id(p): i for i, p in enumerate(table.players)}
+    return (
+        table.small_blind, table.big_blind, table.ante, table.dealer_index, table.current_player_index,
+        table.pot, table.current_bet, table.betting.min_raise, table.raise_count, table.stage,
+        table.betting_completed, table.hand_over, table.human_turn, table.status,
+        [(p.name, p.chips, p.current_bet, p.folded, p.is_human, p.play_style, p.last_action, cards(p.cards))
+         for p in table.players],
+        list(table.player_contributions), cards(table.community_cards), cards(table.deck),
+        [seat[id(p)] for p in table.players_to_act],
+        [(sorted(seat[id(p)] for p in pot["players"]), pot["amount"]) for pot in table.side_pots],
+        [table.betting.effective_stack(p) for p in table.players],
+    )
+
+
+def human_turns(seed):
+    """Tables at each turn of the human seat over a few hands with uneven stacks."""
+    rng = random.Random(seed)
+    table = HoldemEngine(rng=rng)
+    for _ in range(6):
+        for p in table.players:
+            p.chips = rng.randint(150, 3000)
+        table.start_hand()
+        while table.human_turn:
+            yield table
+            if rng.random() < 0.3:
+                table.human_bet(table.betting.raise_limits(table.players[0])[1])
+            else:
+                table.human_call()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_snapshot_round_trip(seed):
+    checked = 0
+    for table in human_turns(seed):
+        restored = HoldemEngine.from_snapshot(table.snapshot())
+        assert table_state(restored) == table_state(table)
+        assert restored.snapshot() == table.snapshot()
+        checked += 1
+    assert checked >= 6
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_clone_is_independent(seed):
+    for table in human_turns(seed):
+        before = table_state(table)
+        snapshot = table.snapshot()
+        copy = table.clone(rng=random.Random(seed))
+        assert table_state(copy) == before
+        # Play the copy's hand out
+        copy.human_fold()
+        while not copy.hand_over:
+            if copy.human_turn:
+                copy.human_call()
+            else:
+                copy.step()
+        assert table_state(copy) != before
+        assert table_state(table) == before
+        assert table.snapshot() == snapshot
+
+
+def test_long_text_is_kept():
+    table = waiting_table()
+    table.players[1].name = "Ünïcödé " * 40  # over 255 bytes of UTF-8
+    table.status = "x" * 70000  # over the 2-byte limit: cut, not an error
+    restored = HoldemEngine.from_snapshot(table.snapshot())
+    assert restored.players[1].name == table.players[1].name
+    assert restored.status == table.status[:0xFFFF]
+
+
+def test_long_text_cut_on_a_character():
+    table = waiting_table()
+    table.status = "é" * 40000  # 80000 bytes, two per character
+    assert HoldemEngine.from_snapshot(table.snapshot()).status == "é" * (0xFFFF // 2)
+
+
+def test_foreign_and_damaged_snapshots_are_refused():
+    data = waiting_table().snapshot()
+    for bad in (b"", b"XYZ" + data[3:], SNAPSHOT_MAGIC + bytes([99]) + data[4:], data + b"\0"):
+        with pytest.raises(ValueError):
+            HoldemEngine.from_snapshot(bad)
+    for cut in range(len(data)):
+        with pytest.raises(ValueError):
+            HoldemEngine.from_snapshot(data[:cut])
@@ -0,0 +1,53 @@
+"""
+Tests for fasteval: the compiled backend agrees with the pure-Python
+evaluator (skipped when it isn't built), and the pure-Python evaluator
+allocates nothing per hand.
+"""
+import random
+import tracemalloc
+
+import pytest
+
+import fasteval
+from engine import DECK_ORDER
+from texasholdem import python_hand_rank
+
+native = pytest.mark.skipif(not fasteval._use_native(), reason="the compiled backend isn't built")
+
+
+@native
+@pytest.mark.parametrize("n", [5, 6, 7])
+def test_backend_ranks(n):
+    rng = random.Random(n)
+    batch = [rng.sample(range(52), n) for _ in range(6000)]
+    expected = [fasteval._python_rank(h) for h in batch]
+    assert fasteval.rank_many(batch) == expected
+    for h, rank in zip(batch[:200], expected):
+        assert fasteval.rank_ids(h) == rank, f"rank differs for {h}"
+
+
+@native
+@pytest.mark.parametrize("board_size", [3, 4])
+def test_backend_equity(board_size):
+    cards = random.Random(board_size).sample(range(52), 4 + board_size)
+    hero, villain, board = cards[:2], cards[2:4], cards[4:]
+    fast = fasteval.equity(hero, villain, board)
+    assert fast == pytest.approx(fasteval._python_equity(hero, villain, board, 0, None), abs=1e-9)
+
+
+def test_python_rank_allocates_nothing():
+    """With tracemalloc running, neither the memory in use nor its peak moves during an evaluation."""
+    rng = random.Random(0)
+    batch = [rng.sample(DECK_ORDER, rng.choice([5, 6, 7])) for _ in range(2000)]
+    python_hand_rank(batch[0])  # builds the lookup tables outside the measurement
+    tracemalloc.start()
+    try:
+        for cards in batch:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            python_hand_rank(cards)
+            current, peak = tracemalloc.get_traced_memory()
+            assert current == before and peak == before, (
+                f"ranking {len(cards)} cards allocated {peak - before} bytes ({current - before} kept)")
+    finally:
+        tracemalloc.stop()
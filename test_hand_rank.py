@@ -0,0 +1,156 @@
+"""
+Correctness and speed tests for the hand evaluator.
+
+Every 5-card hand is ranked by each evaluator and the hands per category
+are compared with the known counts; the same check over all 133,784,560
+7-card hands only runs with RUN_EXHAUSTIVE=1 (in parallel, one chunk per
+pair of lowest cards, on every core). The edge cases are hands the
+evaluator has got wrong before or could: wheels, two trips making a full
+house, a flush next to a straight flush in another suit, and so on.
+
+The timing gates rank the same hands with a candidate evaluator and the
+reference one (_raw_rank, what every faster path must agree with) in
+alternating rounds. A gate passes only if the two agree on every hand and
+the candidate is faster in most rounds, so a speedup is proven correct and
+faster on the same machine at the same moment, not against an old number.
+
+    python -m pytest test_hand_rank.py
+    RUN_EXHAUSTIVE=1 python -m pytest test_hand_rank.py
+"""
+import multiprocessing
+import os
+import random
+import time
+from itertools import combinations
+
+import pytest
+
+from engine import DECK_ORDER
+from ranges import RANK_CHARS, SUIT_CHARS
+from texasholdem import (
+    HAND_RANK_BACKEND, NUM_HAND_RANKS, RANK_TUPLES, _DENSE_RANK, _raw_rank, check_straight,
+    hand_rank, python_hand_rank,
+)
+
+# Hands per category among all 5-card and all 7-card hands (royal flushes are straight flushes)
+FIVE_CARD_COUNTS = [0, 1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 40]
+SEVEN_CARD_COUNTS = [0, 23294460, 58627800, 31433400, 6461620, 6180020, 4047644, 3473184, 224848, 41584]
+# Distinct hand values per category, 7462 in all
+CLASS_COUNTS = [0, 1277, 2860, 858, 858, 10, 1277, 156, 156, 10]
+
+# CATEGORY[rank] -> hand category of a dense rank
+CATEGORY = bytes([0] + [t[0] for t in RANK_TUPLES[1:]])
+
+TIMING_HANDS = 20000
+TIMING_ROUNDS = 7
+
+# (cards, expected rank_tuple)
+EDGE_CASES = [
+    ("Ah 2c 3d 4s 5h", (5, 5)),                     # the wheel is 5-high
+    ("Ah 2c 3d 4s 5h 6c", (5, 6)),                  # a six makes it 6-high
+    ("Ah Kc Qd Js Th 2c 3d", (5, 14)),              # broadway
+    ("Ah 2c 3d 4s Kh Qc Jd", (1, 14, 13, 12, 11, 4)),  # no wraparound straight
+    ("Ah Ac Ad Kh Kc Kd 2s", (7, 14, 13)),          # two trips make a full house
+    ("7h 7c 7d 5h 5c 2s 2d", (7, 7, 5)),            # the higher pair fills the house
+    ("9h 9c 9d 9s 5h 5c 5d", (8, 9, 5)),            # quads with trips: the kicker is one card
+    ("Kh Kc Qd Qs Jh Jc 2d", (3, 13, 12, 11)),      # three pairs: the third pair's card kicks
+    ("9h Th Jh Qh 2h Kc 8d", (6, 12, 11, 10, 9, 2)),  # flush beats the off-suit straight
+    ("9h Th Jh Qh Kh 8c 7c", (9, 13)),              # straight flush
+    ("Ah 2h 3h 4h 5h 6c", (9, 5)),                  # steel wheel over the 6-high straight
+    ("2h 3h 4h 5h 7h 6c 8d", (6, 7, 5, 4, 3, 2)),   # straight in one suit, flush in another: just a flush
+    ("Th Jh Qh Kh Ah 9c", (9, 14)),                 # royal flush
+    ("2c 3c 4c 5c 6c 7c 8c", (9, 8)),               # seven suited cards: best straight flush
+]
+
+
+def parse_cards(text):
+    return [DECK_ORDER[SUIT_CHARS.index(code[1]) * 13 + RANK_CHARS.index(code[0])]
+            for code in text.split()]
+
+
+def reference_hand_rank(cards):
+    """The reference every faster evaluator is checked against."""
+    return _DENSE_RANK[_raw_rank(cards)]
+
+
+# Every evaluator there is here; the faster ones are also checked against the reference
+FAST_EVALUATORS = [("python", python_hand_rank)]
+if HAND_RANK_BACKEND != "python":
+    FAST_EVALUATORS.append((HAND_RANK_BACKEND, hand_rank))
+EVALUATORS = [("reference", reference_hand_rank)] + FAST_EVALUATORS
+
+
+@pytest.mark.parametrize("name, rank", EVALUATORS, ids=[name for name, _ in EVALUATORS])
+@pytest.mark.parametrize("text, expected", EDGE_CASES, ids=[text for text, _ in EDGE_CASES])
+def test_edge_cases(name, rank, text, expected):
+    assert RANK_TUPLES[rank(parse_cards(text))] == expected
+
+
+def test_check_straight_wheel():
+    assert check_straight([14, 2, 3, 4, 5]) == (True, 5)
+    assert check_straight([14, 13, 12, 11, 10]) == (True, 14)
+    assert check_straight([14, 13, 2, 3, 4]) == (False, None)
+
+
+@pytest.mark.parametrize("name, rank", FAST_EVALUATORS, ids=[name for name, _ in FAST_EVALUATORS])
+def test_five_card_counts(name, rank):
+    """Every 5-card hand: the counts per category, and all 7462 values occur."""
+    counts = [0] * 10
+    seen = bytearray(NUM_HAND_RANKS + 1)
+    for cards in combinations(DECK_ORDER, 5):
+        r = rank(cards)
+        counts[CATEGORY[r]] += 1
+        seen[r] = 1
+    assert counts == FIVE_CARD_COUNTS
+    classes = [0] * 10
+    for r in range(1, NUM_HAND_RANKS + 1):
+        classes[CATEGORY[r]] += seen[r]
+    assert classes == CLASS_COUNTS
+
+
+def _seven_card_chunk(lowest):
+    # Every 7-card hand whose two lowest cards are ``lowest``
+    a, b = lowest
+    head = (DECK_ORDER[a], DECK_ORDER[b])
+    counts = [0] * 10
+    for rest in combinations(DECK_ORDER[b + 1:], 5):
+        counts[CATEGORY[hand_rank(head + rest)]] += 1
+    return counts
+
+
+@pytest.mark.skipif(not os.environ.get("RUN_EXHAUSTIVE"),
+                    reason="ranks all 133,784,560 7-card hands; set RUN_EXHAUSTIVE=1")
+def test_seven_card_counts():
+    chunks = list(combinations(range(52), 2))
+    counts = [0] * 10
+    workers = os.cpu_count() or 1
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap_unordered(_seven_card_chunk, chunks) if pool else map(_seven_card_chunk, chunks)
+        for chunk_counts in results:
+            for category, n in enumerate(chunk_counts):
+                counts[category] += n
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    assert counts == SEVEN_CARD_COUNTS
+
+
+@pytest.mark.parametrize("name, candidate", FAST_EVALUATORS, ids=[name for name, _ in FAST_EVALUATORS])
+def test_timing_gate(name, candidate):
+    """``candidate`` agrees with the reference and beats it in most alternating rounds."""
+    rng = random.Random(0)
+    batch = [rng.sample(DECK_ORDER, 7) for _ in range(TIMING_HANDS)]
+    assert [candidate(cards) for cards in batch] == [reference_hand_rank(cards) for cards in batch]
+
+    faster = 0
+    for _ in range(TIMING_ROUNDS):
+        times = []
+        for rank in (candidate, reference_hand_rank):
+            start = time.perf_counter()
+            for cards in batch:
+                rank(cards)
+            times.append(time.perf_counter() - start)
+        faster += times[0] < times[1]
+    assert faster > TIMING_ROUNDS // 2, f"{name} was faster in only {faster} of {TIMING_ROUNDS} rounds"
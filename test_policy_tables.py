@@ -0,0 +1,43 @@
+"""
+Tests for policy_tables: the tables decide exactly as the style functions
+they were read from, with the same random draws.
+"""
+import pytest
+
+import policy_tables
+import simulate
+from policy_tables import TABULATED_STYLES, table_decision
+from texasholdem import ai_decision, ai_random
+
+DECISIONS = policy_tables.random_decisions(20000, seed=0)
+
+
+@pytest.mark.parametrize("style", TABULATED_STYLES)
+def test_tables_match_style_functions(style):
+    for player, community_cards, current_bet, pot, raise_count, game in DECISIONS:
+        if player.play_style != style:
+            continue
+        state = ai_random.getstate()
+        expected = ai_decision(player, community_cards, current_bet, pot, "flop", raise_count, game)
+        ai_random.setstate(state)
+        got = table_decision(player, community_cards, current_bet, pot, "flop", raise_count, game)
+        assert got == expected, f"table says {got}, function says {expected}"
+
+
+def test_state_index_round_trip():
+    for index in range(policy_tables.NUM_STATES):
+        assert policy_tables.state_index(*policy_tables.decode_state(index)) == index
+
+
+@pytest.mark.parametrize("style", TABULATED_STYLES)
+def test_lookup_actions_match_compiled(style):
+    states = list(range(0, policy_tables.NUM_STATES, 7))
+    compiled = policy_tables.compile_policy(style)
+    assert policy_tables.lookup_actions(style, states) == [compiled[i] for i in states]
+
+
+def test_simulation_unchanged():
+    seats = ["straightforward", "risk_taker", "strategic", "strategic", "chaos"]
+    plain = list(simulate.simulate(simulate.SimulationConfig(seats, 300, seed=7)))
+    tabled = list(simulate.simulate(simulate.SimulationConfig(seats, 300, seed=7, policy_tables=True)))
+    assert tabled == plain
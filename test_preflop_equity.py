@@ -0,0 +1,28 @@
+"""
+Tests for preflop_equity: a lookup with no matrix built fails at once and
+says how to build one, instead of building one behind the caller's back.
+"""
+import os
+
+import pytest
+
+import preflop_equity
+from preflop_equity import parse_hand
+
+
+def test_missing_matrix_points_to_build(tmp_path):
+    path = str(tmp_path / "equity")
+    with pytest.raises(FileNotFoundError, match="--build"):
+        preflop_equity.hand_vs_random(parse_hand("AhKh"), path=path)
+    with pytest.raises(FileNotFoundError, match="--build"):
+        preflop_equity.hand_vs_hand(parse_hand("AhKh"), parse_hand("QsQc"), path=path)
+    assert not os.path.exists(path)
+
+
+def test_main_without_hands_builds_nothing(tmp_path):
+    path = str(tmp_path / "equity")
+    with pytest.raises(SystemExit):
+        preflop_equity.main(["--path", path])
+    with pytest.raises(SystemExit):
+        preflop_equity.main(["AhKh", "--path", path])
+    assert not os.path.exists(path)
@@ -0,0 +1,153 @@
+"""
+Tests for the table server's wire protocol: varints and deltas round-trip,
+and truncated or malformed frames are refused without touching the table.
+"""
+import asyncio
+import random
+
+import pytest
+
+import table_server
+from table_server import (
+    ACTION_CALL, ACTION_RAISE, MAX_VARINT_BYTES, MSG_BYE, MSG_CONTINUE, MSG_DELTA, MSG_HELLO, MSG_NOTICE,
+    TableSession, apply_delta, decode_hello, decode_varint, encode_action, encode_delta, encode_hello,
+    encode_varint, table_view,
+)
+
+VARINTS = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 31 - 1, 2 ** 32, 2 ** 63, 2 ** 64 - 1]
+
+
+@pytest.mark.parametrize("value", VARINTS)
+def test_varint_round_trip(value):
+    out = bytearray(b"\xff")  # decoding starts mid-buffer
+    encode_varint(value, out)
+    out += b"\x07"
+    assert decode_varint(out, 1) == (value, len(out) - 1)
+
+
+@pytest.mark.parametrize("value", VARINTS[3:])
+def test_truncated_varint_is_refused(value):
+    out = bytearray()
+    encode_varint(value, out)
+    for cut in range(len(out)):
+        with pytest.raises(ValueError):
+            decode_varint(out[:cut], 0)
+
+
+def test_overlong_varint_is_refused():
+    with pytest.raises(ValueError):
+        decode_varint(b"\x80" * MAX_VARINT_BYTES + b"\x01", 0)
+
+
+def payloads(session):
+    """The payloads of the frames ``session`` has queued for its client."""
+    data = session.take_frames()
+    out = []
+    while data:
+        length = int.from_bytes(data[:2], "big")
+        out.append(data[2:2 + length])
+        data = data[2 + length:]
+    return out
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_delta_round_trip(seed):
+    """A client applying every delta frame sees what the table shows its seat."""
+    rng = random.Random(seed)
+    session = TableSession(rng=rng)
+    session.start()
+    client = []
+    deltas = 0
+    for _ in range(200):
+        for payload in payloads(session):
+            if payload[0] == MSG_HELLO:
+                assert decode_hello(payload[1:]) == (0, [p.name for p in session.engine.players])
+            elif payload[0] == MSG_DELTA:
+                apply_delta(client, payload[1:])
+                deltas += 1
+        assert client == table_view(session.engine, session.seat)
+        engine = session.engine
+        if engine.hand_over:
+            session.handle(bytes([MSG_CONTINUE]))
+        elif rng.random() < 0.2:
+            session.handle(encode_action(ACTION_RAISE, engine.betting.raise_limits(engine.players[0])[0])[2:])
+        else:
+            session.handle(encode_action(ACTION_CALL)[2:])
+    assert deltas > 100
+    assert encode_delta(client, client) is None
+
+
+def test_truncated_delta_is_refused():
+    view = table_view(TableSession(rng=random.Random(1)).engine, 0)
+    view[table_server.F_BOARD] = bytes([1, 2, 3])
+    body = encode_delta([], view)[1:]
+    for cut in range(len(body)):
+        client = [0] * 3
+        with pytest.raises(ValueError):
+            apply_delta(client, body[:cut])
+        assert client == [0] * 3  # left as it was
+    with pytest.raises(ValueError):
+        apply_delta([], body + b"\x00")
+
+
+def test_hello_round_trip_and_truncation():
+    names = ["You", "Bob", "Ünïcödé"]
+    payload = encode_hello(2, names)
+    assert payload[0] == MSG_HELLO
+    assert decode_hello(payload[1:]) == (2, names)
+    for cut in range(1, len(payload) - 1):
+        with pytest.raises(ValueError):
+            decode_hello(payload[1:cut])
+
+
+def waiting_session():
+    session = TableSession(rng=random.Random(0))
+    session.start()
+    session.take_frames()
+    assert session.engine.human_turn
+    return session
+
+
+def notices(session):
+    return [p[1:].decode("utf-8") for p in payloads(session) if p[0] == MSG_NOTICE]
+
+
+@pytest.mark.parametrize("payload", [
+    bytes([table_server.MSG_ACTION]),                          # no action code
+    bytes([table_server.MSG_ACTION, ACTION_RAISE, 0x80]),      # amount cut off mid-varint
+    bytes([table_server.MSG_ACTION, ACTION_RAISE]) + b"\xff" * MAX_VARINT_BYTES,  # overlong amount
+    encode_action(ACTION_CALL)[2:] + b"\x00",                 # trailing bytes
+    bytes([99]),                                               # unknown message type
+    bytes([MSG_CONTINUE]),                                     # the hand isn't over
+], ids=["no code", "cut varint", "overlong varint", "trailing", "unknown type", "early continue"])
+def test_malformed_frames_are_refused(payload):
+    session = waiting_session()
+    before = session.engine.snapshot()
+    assert session.handle(payload) is True
+    assert len(notices(session)) == 1
+    assert session.engine.snapshot() == before
+
+
+def test_bye_ends_the_session():
+    assert waiting_session().handle(bytes([MSG_BYE])) is False
+
+
+def test_loopback_clients_play():
+    async def run():
+        server = await table_server.TableServer(port=0).start()
+        try:
+            received = await table_server.play_bot(table_server.DEFAULT_HOST, server.port, 2, random.Random(0))
+            # A frame the server can't parse gets a notice back, not a dropped connection
+            client = table_server.TableClient()
+            await client.connect(table_server.DEFAULT_HOST, server.port)
+            assert (await client.receive())[0] == MSG_HELLO
+            await client.send(table_server.frame(bytes([table_server.MSG_ACTION, ACTION_RAISE, 0x80])))
+            while True:
+                msg_type, info = await client.receive()
+                if msg_type == MSG_NOTICE:
+                    break
+            await client.close()
+        finally:
+            server.close()
+        return received
+    assert asyncio.run(run()) > 0
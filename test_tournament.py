@@ -0,0 +1,37 @@
+"""
+Tests for tournament: a new blind level reaches the tables' betting.
+"""
+import random
+
+from engine import HoldemEngine
+from texasholdem import ai_decision, Player
+from tournament import BlindLevel, Tournament
+
+
+def test_level_change_sets_min_raise():
+    schedule = [BlindLevel(25, 50), BlindLevel(100, 200)]
+    players = [Player(f"Player {i}", play_style="straightforward") for i in range(4)]
+    tournament = Tournament(players, table_size=4, schedule=schedule, hands_per_level=1,
+                            rng=random.Random(3))
+    table = tournament.tables[0]
+    seen = []
+
+    def decide(*args, **kwargs):
+        seen.append(table.betting.min_raise)
+        return ai_decision(*args, **kwargs)
+    table.decide = decide
+
+    tournament.play_round()
+    assert table.betting.big_blind == 50
+    seen.clear()
+    tournament.play_round()
+    assert table.betting.big_blind == 200
+    assert seen and min(seen) >= 200, f"min_raise was {min(seen)} under a 200 big blind"
+
+
+def test_big_blind_forwards_to_betting():
+    table = HoldemEngine(big_blind=100, rng=random.Random(0))
+    table.big_blind = 400
+    assert table.betting.big_blind == 400
+    table.betting.start_round(table.players)
+    assert table.betting.min_raise == 400
@@ -1,10 +1,11 @@
-import tkinter as tk
-from tkinter import font as tkFont, simpledialog
 import random
 import os
-from collections import defaultdict, Counter
-from itertools import combinations
-import time
+import threading
+from collections import Counter
+from itertools import combinations, product
+
+import fasteval
+from betting import decision_figures
 
 # Constants for suits and ranks
 SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
@@ -17,33 +18,32 @@ MEDIUM_HAND_THRESHOLD = 3  # Three of a Kind or better
 RAISE_THRESHOLD = 6        # For strategic player
 CALL_THRESHOLD = 2        # For strategic player
 
-# Table and chip constants
-TABLE_COLOR = "#2F5D3D"
-CHIP_COLORS = ["black", "blue", "green", "red", "white"]
-CHIP_VALUES = {"black": 5, "blue": 10, "green": 20, "red": 50, "white": 100}
-CHIP_IMAGE_NAMES = {
-    "black": "black_chip.png",
-    "blue": "blue_chip.png",
-    "green": "green_chip.png",
-    "red": "red_chip.png",
-    "white": "white_chip.png",
-}
-CHIP_STACK_HEIGHT = 100
-CHIP_STACK_WIDTH = 90
-CHIP_STACK_LIMIT = 6  # Maximum chips in a stack
-MAX_STACKS_PER_PLAYER = 3 # Maximum Stacks allowed for each player
+# Opponent tendencies the strategic player exploits (see opponent_stats)
+BLUFF_FOLD_RATE = 0.6      # Raise marginal hands when opponents fold to raises this often
+CALLDOWN_AGGRESSION = 3.0  # Call lighter against opponents this aggressive
+CALLDOWN_DISCOUNT = 0.5
 
 # AI constants
 AI_RAISE_AMOUNT = 50
-UPDATE_DELAY = 100
-MIN_AI_DELAY = 500
-MAX_AI_DELAY = 1500
+
+# Default table: (name, play_style) per seat. The first seat is the human player.
+DEFAULT_SEATS = [
+    ("You", "strategic"),
+    ("Bob", "risk_taker"),
+    ("Fernando", "strategic"),
+    ("Alice", "risk_taker"),
+    ("Lee", "risk_taker"),
+    ("Tara", "risk_taker"),
+]
+STARTING_CHIPS = 5000
 
 class Card:
     def __init__(self, rank, suit, image_path):
         self.rank = rank
         self.suit = suit
         self.image_path = image_path
+        # Position in a fresh, unshuffled deck (engine.DECK_ORDER)
+        self.id = SUITS.index(suit) * 13 + RANKS.index(rank)
 
     def __str__(self):
         return f"{self.rank} of {self.suit}"
@@ -65,56 +65,120 @@ class Deck:
             return self.cards.pop()
         return None
 
+# Rank masks: one bit per rank value, bit 0 for a deuce up to bit 12 for an ace.
+ACE_LOW_STRAIGHT = 0b1000000001111  # A-2-3-4-5
+
+def rank_mask(vals):
+    mask = 0
+    for v in vals:
+        mask |= 1 << (v - 2)
+    return mask
+
+def _build_straight_table():
+    # The top card of the highest 5-card run, the wheel counting as 5-high. Each
+    # run marks every mask that contains it, lowest run first so the highest wins.
+    table = [0] * 8192
+    runs = [(5, ACE_LOW_STRAIGHT)] + [(high, 0b11111 << (high - 6)) for high in range(6, 15)]
+    for high, run in runs:
+        rest = 8191 & ~run
+        sub = rest
+        while True:
+            table[run | sub] = high
+            if not sub:
+                break
+            sub = (sub - 1) & rest
+    return table
+
+def _build_mask_values():
+    # Each mask is its top rank in front of the mask without it
+    table = [()] * 8192
+    for mask in range(1, 8192):
+        top = mask.bit_length() - 1
+        table[mask] = (top + 2,) + table[mask ^ 1 << top]
+    return table
+
+# STRAIGHT_HIGH[rank mask] -> high card of the best straight in the mask, or 0
+STRAIGHT_HIGH = _build_straight_table()
+# MASK_VALUES[rank mask] -> the rank values in the mask, highest first
+MASK_VALUES = _build_mask_values()
+
 def check_straight(vals):
     """
     Returns (True, high_card) if there's a straight, otherwise (False, None).
     'high_card' should be the topmost card of that 5-card run.
     """
-    # Ace can act as '1' in A-2-3-4-5
-    if 14 in vals:
-        temp = vals + [1]
-    else:
-        temp = vals
-
-    longest_run = 1
-    best_run_high = None
-    run_length = 1
-    run_start_index = 0
-
-    for i in range(len(temp) - 1):
-        if temp[i] - 1 == temp[i + 1]:
-            run_length += 1
-            if run_length >= 5:
-                top_of_run = temp[run_start_index]
-                if best_run_high is None or top_of_run > best_run_high:
-                    best_run_high = top_of_run
-        else:
-            # If the current and next card are the same, ignore it but don't reset
-            if temp[i] == temp[i + 1]:
-                continue
-            run_length = 1
-            run_start_index = i + 1
-
-    if best_run_high:
-        return True, best_run_high
+    high = STRAIGHT_HIGH[rank_mask(vals)]
+    if high:
+        return True, high
     return False, None
 
-def rank_hand(cards):
+def suit_masks(cards):
+    """Rank mask of the cards in each suit."""
+    masks = {}
+    for c in cards:
+        masks[c.suit] = masks.get(c.suit, 0) | 1 << (RANK_VALUES[c.rank] - 2)
+    return masks
+
+def flush_mask(cards):
+    """Rank mask of the flush suit, or 0 without five cards of one suit."""
+    for mask in suit_masks(cards).values():
+        if len(MASK_VALUES[mask]) >= 5:
+            return mask
+    return 0
+
+# Hand ranks: every distinct five-card hand value is one of 7462 classes. hand_rank()
+# numbers them densely from 1 (7-5-4-3-2 high) to 7462 (royal flush), so ranks
+# compare with a single integer comparison. Internally a hand is first packed into
+# a raw key: the category above bit 20, then the tie-break values four bits each,
+# in the same order as the tuple rank_hand() returns.
+CATEGORY_SHIFT = 20
+
+def _pack_values(vals):
+    key = 0
+    for v in vals:
+        key = key << 4 | v
+    return key
+
+# TOP_FIVE[rank mask] -> the five highest values of the mask, packed
+TOP_FIVE = [_pack_values(MASK_VALUES[mask][:5]) for mask in range(8192)]
+
+def _rank_classes():
+    vals = list(range(14, 1, -1))
+    no_straight = [c for c in combinations(vals, 5) if not STRAIGHT_HIGH[rank_mask(c)]]
+    classes = [(1,) + c for c in no_straight]
+    for p in vals:
+        classes += [(2, p) + ks for ks in combinations([v for v in vals if v != p], 3)]
+    for a, b in combinations(vals, 2):
+        classes += [(3, a, b, k) for k in vals if k != a and k != b]
+    for t in vals:
+        classes += [(4, t) + ks for ks in combinations([v for v in vals if v != t], 2)]
+    classes += [(5, high) for high in range(5, 15)]
+    classes += [(6,) + c for c in no_straight]
+    classes += [(7, t, p) for t in vals for p in vals if p != t]
+    classes += [(8, q, k) for q in vals for k in vals if k != q]
+    classes += [(9, high) for high in range(5, 15)]
+    classes.sort()
+    return classes
+
+# RANK_TUPLES[rank] -> the rank_hand() tuple for a dense rank (index 0 unused)
+RANK_TUPLES = [None] + _rank_classes()
+NUM_HAND_RANKS = len(RANK_TUPLES) - 1  # 7462
+_DENSE_RANK = {c[0] << CATEGORY_SHIFT | _pack_values(c[1:]): rank for rank, c in enumerate(RANK_TUPLES) if c}
+
+def _raw_rank(cards):
     values = sorted([RANK_VALUES[c.rank] for c in cards], reverse=True)
-    suits = [c.suit for c in cards]
     vcount = Counter(values)
-    scount = Counter(suits)
 
-    is_flush = any(count >= 5 for count in scount.values())
-    unique_vals = sorted(set(values), reverse=True)
-    is_straight, straight_high = check_straight(unique_vals)
+    flush = flush_mask(cards)
+    mask = rank_mask(values)
+    straight_high = STRAIGHT_HIGH[mask]
     freqs = sorted(vcount.values(), reverse=True)
 
     # Four of a Kind
     if 4 in freqs:
         quad_val = max(k for k, cnt in vcount.items() if cnt == 4)
         kicker = max(v for v in values if v != quad_val)
-        return (8, quad_val, kicker)
+        return 8 << CATEGORY_SHIFT | quad_val << 4 | kicker
 
     # Full House (fixed):
     # Look for any card that appears at least 3 times, and then check if there is any other card
@@ -125,25 +189,24 @@ def rank_hand(cards):
         pair_candidates = [k for k, cnt in vcount.items() if cnt >= 2 and k != best_three]
         if pair_candidates:
             best_pair = max(pair_candidates)
-            return (7, best_three, best_pair)
+            return 7 << CATEGORY_SHIFT | best_three << 4 | best_pair
 
     # Check for Flush or Straight Flush
-    if is_flush:
-        sf_high = straight_flush_high(cards)
+    if flush:
+        sf_high = STRAIGHT_HIGH[flush]
         if sf_high:
-            return (9, sf_high)  # Straight Flush (or Royal if sf_high == 14)
-        flush_cards = flush_top_values(cards)
-        return (6,) + tuple(flush_cards)
+            return 9 << CATEGORY_SHIFT | sf_high  # Straight Flush (or Royal if sf_high == 14)
+        return 6 << CATEGORY_SHIFT | TOP_FIVE[flush]
 
     # Straight
-    if is_straight:
-        return (5, straight_high)
+    if straight_high:
+        return 5 << CATEGORY_SHIFT | straight_high
 
     # Three of a Kind
     if 3 in freqs:
         three_val = max(k for k, cnt in vcount.items() if cnt == 3)
-        kickers = sorted((v for v in values if v != three_val), reverse=True)[:2]
-        return (4, three_val) + tuple(kickers)
+        kickers = [v for v in values if v != three_val][:2]
+        return 4 << CATEGORY_SHIFT | three_val << 8 | _pack_values(kickers)
 
     # Two Pair
     if freqs.count(2) >= 2:
@@ -151,47 +214,191 @@ def rank_hand(cards):
         pairs = sorted(pairs, reverse=True)
         top_two = pairs[:2]
         kicker = max(v for v in values if v not in top_two)
-        return (3, top_two[0], top_two[1], kicker)
+        return 3 << CATEGORY_SHIFT | top_two[0] << 8 | top_two[1] << 4 | kicker
 
     # One Pair
     if 2 in freqs:
         pair_val = max(k for k, cnt in vcount.items() if cnt == 2)
-        kickers = sorted((v for v in values if v != pair_val), reverse=True)[:3]
-        return (2, pair_val) + tuple(kickers)
+        kickers = [v for v in values if v != pair_val][:3]
+        return 2 << CATEGORY_SHIFT | pair_val << 12 | _pack_values(kickers)
 
     # High Card
-    top_five = values[:5]
-    return (1,) + tuple(top_five)
+    return 1 << CATEGORY_SHIFT | TOP_FIVE[mask]
+
+# python_hand_rank walks lookup tables one card at a time instead of calling
+# _raw_rank, so it allocates nothing: no lists, counters or generators, and no
+# garbage for the collector in long simulations. There are three tables, each a
+# DAG of lists indexed by the next card:
+#   ranks:  the multiset of ranks so far, value in slot 13 (the best hand
+#           ignoring suits); seven cards end on the value itself
+#   suits:  the count per suit so far, slot 4 holds the suit with five or more
+#           cards, or -1
+#   flush:  the set of ranks in the flush suit, value in slot 13
+# They are built on first use, which takes about a second.
+_RANK_ROOT = None
+_SUIT_ROOT = None
+_FLUSH_ROOT = None
+_walk_lock = threading.Lock()
+
+def _build_rank_walk():
+    # Nodes are keyed by their rank counts, three bits per rank
+    deck = [[Card(rank, suit, "") for rank in RANKS] for suit in SUITS]
+    level = {0: [None] * 13 + [0]}
+    root = level[0]
+    for size in range(1, 8):
+        below, level = level, {}
+        for key, parent in below.items():
+            value = parent[13]
+            for r in range(13):
+                if key >> 3 * r & 7 == 4:
+                    continue
+                child_key = key + (1 << 3 * r)
+                if size == 7:
+                    # Best of the six-card hands it contains
+                    if level.get(child_key, 0) < value:
+                        level[child_key] = value
+                    continue
+                child = level.get(child_key)
+                if child is None:
+                    child = level[child_key] = [None] * 13 + [0]
+                    if size == 5:
+                        # Suits cycle through the five cards, so never a flush
+                        vals = [v for v in range(13) for _ in range(child_key >> 3 * v & 7)]
+                        cards = [deck[i % 4][v] for i, v in enumerate(vals)]
+                        child[13] = _DENSE_RANK[_raw_rank(cards)]
+                if size == 6 and child[13] < value:
+                    child[13] = value
+                parent[r] = child
+    # Seven-card hands store the value in place of a node
+    for key, parent in below.items():
+        for r in range(13):
+            if key >> 3 * r & 7 < 4:
+                parent[r] = level[key + (1 << 3 * r)]
+    return root
+
+def _build_suit_walk():
+    nodes = {}
+    for counts in sorted(
+        (c for c in product(range(8), repeat=4) if sum(c) <= 7), key=sum, reverse=True
+    ):
+        flush_suit = next((s for s in range(4) if counts[s] >= 5), -1)
+        node = [None, None, None, None, flush_suit]
+        if sum(counts) < 7:
+            for s in range(4):
+                node[s] = nodes[counts[:s] + (counts[s] + 1,) + counts[s + 1:]]
+        nodes[counts] = node
+    return nodes[(0, 0, 0, 0)]
+
+def _build_flush_walk():
+    nodes = {}
+    for mask in sorted((m for m in range(8192) if len(MASK_VALUES[m]) <= 7),
+                       key=lambda m: len(MASK_VALUES[m]), reverse=True):
+        node = [None] * 13 + [0]
+        if len(MASK_VALUES[mask]) >= 5:
+            high = STRAIGHT_HIGH[mask]
+            raw = 9 << CATEGORY_SHIFT | high if high else 6 << CATEGORY_SHIFT | TOP_FIVE[mask]
+            node[13] = _DENSE_RANK[raw]
+        if len(MASK_VALUES[mask]) < 7:
+            for r in range(13):
+                if not mask >> r & 1:
+                    node[r] = nodes[mask | 1 << r]
+        nodes[mask] = node
+    return nodes[0]
+
+def _build_walk_tables():
+    global _RANK_ROOT, _SUIT_ROOT, _FLUSH_ROOT
+    with _walk_lock:
+        # Another thread may have built them while this one waited
+        if _RANK_ROOT is not None:
+            return
+        _SUIT_ROOT = _build_suit_walk()
+        _FLUSH_ROOT = _build_flush_walk()
+        # Set last: python_hand_rank checks it to know the tables are ready
+        _RANK_ROOT = _build_rank_walk()
+
+def python_hand_rank(cards):
+    """Dense rank (1-7462, higher is better) of the best hand in five to seven cards."""
+    if _RANK_ROOT is None:
+        _build_walk_tables()
+    node = _RANK_ROOT
+    suits = _SUIT_ROOT
+    n = len(cards)
+    # Index loops: a for loop would allocate an iterator
+    i = 0
+    while i < n:
+        card_id = cards[i].id
+        node = node[card_id % 13]
+        suits = suits[card_id // 13]
+        i += 1
+    flush_suit = suits[4]
+    if flush_suit >= 0:
+        # A flush beats anything the other cards could make
+        node = _FLUSH_ROOT
+        i = 0
+        while i < n:
+            card_id = cards[i].id
+            if card_id // 13 == flush_suit:
+                node = node[card_id % 13]
+            i += 1
+        return node[13]
+    return node if n == 7 else node[13]
+
+# The compiled evaluator from fasteval takes over when it has been built
+hand_rank = fasteval.load(sorted(_DENSE_RANK)) or python_hand_rank
+HAND_RANK_BACKEND = fasteval.BACKEND if hand_rank is not python_hand_rank else "python"
+
+def rank_tuple(rank):
+    """The tuple form of a dense rank, e.g. (6, 14, 12, 9, 7, 3) for an ace-high flush."""
+    return RANK_TUPLES[rank]
+
+def rank_hand(cards):
+    return RANK_TUPLES[hand_rank(cards)]
 
 def flush_top_values(cards):
-    suit_cards = defaultdict(list)
-    for c in cards:
-        suit_cards[c.suit].append(RANK_VALUES[c.rank])
-    for s, vals in suit_cards.items():
-        if len(vals) >= 5:
-            return sorted(vals, reverse=True)[:5]
-    return []
+    return list(MASK_VALUES[flush_mask(cards)][:5])
 
 def straight_flush_high(cards):
-    suit_cards = defaultdict(list)
-    for c in cards:
-        suit_cards[c.suit].append(RANK_VALUES[c.rank])
-    for s, vals in suit_cards.items():
-        vals = sorted(set(vals), reverse=True)
-        is_str, high = check_straight(vals)
-        if is_str:
+    for mask in suit_masks(cards).values():
+        high = STRAIGHT_HIGH[mask]
+        if high:
             return high
     return None
 
 def best_five_from_seven(cards):
-    best = None
-    for combo in combinations(cards, 5):
-        val = rank_hand(list(combo))
-        if best is None or val > best:
-            best = val
-    return best
+    # rank_hand already picks the best five of six or seven cards, so a single
+    # pass matches ranking all 21 five-card combinations at a fraction of the cost.
+    if len(cards) < 5:
+        return None
+    return rank_hand(cards)
+
+def build_side_pots(players, contributions):
+    """
+    Splits the contributions into a main pot and side pots, one per all-in level.
+    Chips from folded players stay in the pots they reached but can't be won by them.
+    """
+    levels = sorted(set(
+        contributions[i] for i, p in enumerate(players)
+        if not p.folded and contributions[i] > 0
+    ))
+    side_pots = []
+    previous_level = 0
+    for n, level in enumerate(levels):
+        if n == len(levels) - 1:
+            # The last pot also takes any dead money above the top level
+            amount = sum(max(0, c - previous_level) for c in contributions)
+        else:
+            amount = sum(min(c, level) - min(c, previous_level) for c in contributions)
+        involved_players = [
+            p for i, p in enumerate(players)
+            if not p.folded and contributions[i] >= level
+        ]
+        side_pots.append({'players': involved_players, 'amount': amount})
+        previous_level = level
+    return side_pots
 
 def hand_description(val):
+    if isinstance(val, int):
+        val = RANK_TUPLES[val]
     rank_type = val[0]
     if rank_type == 9:
         high_card = val[1]
@@ -244,83 +451,162 @@ class Player:
         self.folded = True
         self.last_action = "Fold"
 
+    def copy(self):
+        # Shallow copy; the Card objects themselves are shared
+        other = Player.__new__(Player)
+        other.__dict__.update(self.__dict__)
+        other.cards = list(self.cards)
+        other.placed_chips = list(self.placed_chips)
+        return other
+
     def __str__(self):
         return f"{self.name}: {self.chips} chips"
 
-def ai_decision_straightforward(player, community_cards, current_bet, pot, stage, raise_count):
-    hand_strength = evaluate_hand(player.cards, community_cards)
+def default_players():
+    return [
+        Player(name, STARTING_CHIPS, is_human=(i == 0), play_style=style)
+        for i, (name, style) in enumerate(DEFAULT_SEATS)
+    ]
+
+class ThreadRandom(threading.local):
+    """
+    The AI styles' source of randomness, one per thread. A thread that sets
+    ``rng`` (say, a random.Random(seed) for the table it plays) draws from
+    it; every other thread draws from the random module as before.
+    """
+    rng = None
+
+    def __getattr__(self, name):
+        return getattr(random if self.rng is None else self.rng, name)
+
+ai_random = ThreadRandom()
+
+def drawing_odds(player, community_cards, current_bet, pot):
+    # Imported here because draws builds its tables from this module
+    from draws import worth_drawing
+    return worth_drawing(player.cards, community_cards, current_bet - player.current_bet, pot)
+
+def evaluate_hand(cards, community_cards):
+    best_hand = best_five_from_seven(cards + community_cards)
+    return best_hand[0] if best_hand else 0
+
+# The styles below are passed the table's BettingState as ``betting`` (see
+# betting.decision_figures), draw their random numbers from ``rng`` and size
+# up the hand with ``evaluate`` and ``drawing``; policy_tables passes
+# stand-ins to read the rules off them.
+
+def ai_decision_straightforward(player, community_cards, current_bet, pot, stage, raise_count,
+                                betting=None, rng=ai_random, evaluate=evaluate_hand, drawing=drawing_odds):
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
+    hand_strength = evaluate(player.cards, community_cards)
     if hand_strength >= STRONG_HAND_THRESHOLD:
-        if player.chips > current_bet and raise_count < 2:
-            return "raise", ai_raise_amount(hand_strength, pot, player.chips)
+        if player.chips > to_call and raise_count < 2:
+            return "raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack, rng)
         else:
             return "call", 0
-    elif hand_strength >= MEDIUM_HAND_THRESHOLD or random.random() > 0.8:
+    elif hand_strength >= MEDIUM_HAND_THRESHOLD or rng.random() > 0.8:
+        return "call", 0
+    elif drawing(player, community_cards, current_bet, pot):
         return "call", 0
     else:
         return "fold", 0
 
-def ai_decision_risk_taker(player, community_cards, current_bet, pot, stage, raise_count):
+def ai_decision_risk_taker(player, community_cards, current_bet, pot, stage, raise_count,
+                           betting=None, rng=ai_random, evaluate=evaluate_hand):
     # Fixed this to make it predictable for testing
-    hand_strength = evaluate_hand(player.cards, community_cards)
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
+    hand_strength = evaluate(player.cards, community_cards)
     if current_bet == 0:
         if player.chips > 0:
             return "call", 0
         else:
             return "fold", 0
-    if player.chips > current_bet + AI_RAISE_AMOUNT and raise_count < 2:
-        return "raise", ai_raise_amount(hand_strength, pot, player.chips)
-    elif player.chips > current_bet:
+    if player.chips > to_call + AI_RAISE_AMOUNT and raise_count < 2:
+        return "raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack, rng)
+    elif player.chips > to_call:
         return "call", 0
     else:
         return "all-in", 0
 
-def ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count):
-    hand_strength = evaluate_hand(player.cards, community_cards)
-    position_factor = evaluate_position(player)
+def ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count, stats=None,
+                          position=None, betting=None, rng=ai_random, evaluate=evaluate_hand,
+                          drawing=drawing_odds):
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
+    hand_strength = evaluate(player.cards, community_cards)
+    position_factor = evaluate_position(player) if position is None else position
     pot_odds = calculate_pot_odds(current_bet, pot, player)
     decision_score = (hand_strength * 0.6) + (position_factor * 0.2) + (pot_odds * 0.2)
 
+    call_threshold = CALL_THRESHOLD
+    bluff = False
+    if stats is not None:
+        fold_to_raise, aggression = stats.opponent_tendencies(player.name)
+        # Opponents who usually give up to a raise can be pushed off the pot
+        bluff = fold_to_raise is not None and fold_to_raise > BLUFF_FOLD_RATE
+        # Aggressive opponents bet weaker hands, so call them down lighter
+        if aggression is not None and aggression > CALLDOWN_AGGRESSION:
+            call_threshold -= CALLDOWN_DISCOUNT
+
     if decision_score > RAISE_THRESHOLD:
-        if player.chips > current_bet + AI_RAISE_AMOUNT and raise_count < 2:
-            return "raise", ai_raise_amount(hand_strength, pot, player.chips)
+        if player.chips > to_call + AI_RAISE_AMOUNT and raise_count < 2:
+            return "raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack, rng)
         else:
             return "all-in", 0
-    elif decision_score > CALL_THRESHOLD:
+    elif decision_score > call_threshold:
+        if bluff and player.chips > to_call + AI_RAISE_AMOUNT and raise_count == 0:
+            return "raise", ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack, rng)
+        return "call", 0
+    elif drawing(player, community_cards, current_bet, pot):
         return "call", 0
     else:
         return "fold", 0
 
-def ai_decision_chaos(player, community_cards, current_bet, pot, stage, raise_count):
+def ai_decision_chaos(player, community_cards, current_bet, pot, stage, raise_count, betting=None):
+    to_call, min_raise, effective_stack = decision_figures(betting, player, current_bet)
     actions = ["fold", "call", "raise", "all-in"]
     probabilities = [0.2, 0.3, 0.3, 0.2]
-    action = random.choices(actions, probabilities)[0]
+    action = ai_random.choices(actions, probabilities)[0]
     
     hand_strength = evaluate_hand(player.cards, community_cards)
 
-    if action == "raise" and player.chips <= current_bet + AI_RAISE_AMOUNT:
-        return ("call", 0) if player.chips > current_bet else ("fold", 0)
+    if action == "raise" and player.chips <= to_call + AI_RAISE_AMOUNT:
+        return ("call", 0) if player.chips > to_call else ("fold", 0)
     elif action == "all-in" and player.chips < current_bet:
         return "fold", 0
     if action == "raise" and raise_count < 2:
-        return action, ai_raise_amount(hand_strength, pot, player.chips)
+        return action, ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack)
     else:
         return "call", 0
     
 
-def ai_decision(player, community_cards, current_bet, pot, stage, raise_count):
+def ai_decision(player, community_cards, current_bet, pot, stage, raise_count, game=None, betting=None):
     if player.play_style == "straightforward":
-        action, raise_amount = ai_decision_straightforward(player, community_cards, current_bet, pot, stage, raise_count)
+        action, raise_amount = ai_decision_straightforward(player, community_cards, current_bet, pot, stage, raise_count,
+                                                           betting)
     elif player.play_style == "risk_taker":
-        action, raise_amount = ai_decision_risk_taker(player, community_cards, current_bet, pot, stage, raise_count)
+        action, raise_amount = ai_decision_risk_taker(player, community_cards, current_bet, pot, stage, raise_count,
+                                                      betting)
     elif player.play_style == "strategic":
-        action, raise_amount = ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count)
+        stats = getattr(game, "stats", None)
+        action, raise_amount = ai_decision_strategic(player, community_cards, current_bet, pot, stage, raise_count, stats,
+                                                     betting=betting)
     elif player.play_style == "chaos":
-        action, raise_amount = ai_decision_chaos(player, community_cards, current_bet, pot, stage, raise_count)
+        action, raise_amount = ai_decision_chaos(player, community_cards, current_bet, pot, stage, raise_count, betting)
+    elif player.play_style == "search":
+        # Imported here because the search plays hands out on engine.HoldemEngine
+        from search_ai import ai_decision_search
+        action, raise_amount = ai_decision_search(player, community_cards, current_bet, pot, stage, raise_count, game,
+                                                  betting=betting)
+    elif player.play_style == "cfr":
+        # Imported here because cfr_ai loads its trained tables from disk
+        from cfr_ai import ai_decision_cfr
+        action, raise_amount = ai_decision_cfr(player, community_cards, current_bet, pot, stage, raise_count, game,
+                                               betting=betting)
     else:
         return "call", 0
     return action, raise_amount
 
-def ai_raise_amount(hand_strength, pot, player_chips):
+def ai_raise_amount(hand_strength, pot, player_chips, rng=ai_random):
     # Define weights for each factor (adjust as needed)
     hand_weight = 0.4
     pot_weight = 0.3
@@ -349,855 +635,69 @@ def ai_raise_amount(hand_strength, pot, player_chips):
     dynamic_raise = int(base_raise * (1 + raise_multiplier))
 
     # Add a bit of randomness
-    dynamic_raise += random.randint(-5, 5)
+    dynamic_raise += rng.randint(-5, 5)
     
     return max(1, dynamic_raise)  # Ensure the raise is always at least 1
 
-def evaluate_hand(cards, community_cards):
-    best_hand = best_five_from_seven(cards + community_cards)
-    return best_hand[0] if best_hand else 0
+def ai_raise_size(hand_strength, pot, to_call, min_raise, effective_stack, rng=ai_random):
+    """
+    ai_raise_amount scaled to the effective stack, at least the minimum raise
+    and at most what an opponent still in the hand can match.
+    """
+    amount = max(ai_raise_amount(hand_strength, pot, effective_stack, rng), min_raise)
+    return max(1, min(amount, effective_stack - to_call))
+
+# Example position scores, by seat name. Adjust as desired.
+POSITION_SCORES = {
+    "You": 3,    # Late position
+    "Bob": 1,
+    "Fernando": 2,
+    "Alice": 1,
+    "Lee": 2,
+    "Tara": 1,
+}
 
 def evaluate_position(player):
-    # Example position scores. Adjust as desired.
-    position_scores = {
-        "You": 3,    # Late position
-        "Bob": 1,
-        "Fernando": 2,
-        "Alice": 1,
-        "Lee": 2,
-        "Tara": 1,
-    }
-    return position_scores.get(player.name, 1)
+    return POSITION_SCORES.get(player.name, 1)
 
 def calculate_pot_odds(current_bet, pot, player):
     if (pot + current_bet) == 0:
         return 0
     return (current_bet - player.current_bet) / (pot + current_bet) if (pot+current_bet)> 0 else 0
 
-class TexasHoldemGame:
-    def __init__(self, root):
-        self.root = root
-        self.root.geometry("1500x900")
-
-        self.deck = Deck()
-        self.players = [
-            Player("You", 5000, is_human=True, play_style="strategic"),
-            Player("Bob", 5000, play_style="risk_taker"),
-            Player("Fernando", 5000, play_style="strategic"),
-            Player("Alice", 5000, play_style="risk_taker"),
-            Player("Lee", 5000, play_style="risk_taker"),
-            Player("Tara", 5000, play_style="risk_taker")
-        ]
-
-        self.dealer_index = 0
-        self.small_blind = 50
-        self.big_blind = 100
-
-        self.current_player_index = 0
-        self.community_cards = []
-        self.pot = 0
-        self.current_bet = 0
-        self.stage = "preflop"
-        self.betting_completed = False
-        self.continue_button = None
-
-        self.player_contributions = [0 for _ in self.players]
-        self.side_pots = []
-
-        self.human_turn = False
-        self.players_to_act = []
-        self.raise_count = 0
-
-        self.card_images = {}
-        self.card_back_image = None
-        self.load_images("cards")
-        
-        self.chip_images = {}
-        self.load_chip_images("chips")
-        self.chip_cache = {}
-        
-        self.setup_ui()
-        self.bind_keys()
-        self.start_hand()
-
-    def load_images(self, folder):
-        scale_factor = (3, 3)
-        back_path = os.path.join(folder, "card_back.png")
-        back_img = tk.PhotoImage(file=back_path).subsample(*scale_factor)
-        self.card_back_image = back_img
-
-        for suit in SUITS:
-            for rank in RANKS:
-                filename = f"{rank}_of_{suit}.png"
-                path = os.path.join(folder, filename)
-                img = tk.PhotoImage(file=path).subsample(*scale_factor)
-                self.card_images[(rank, suit)] = img
-
-    def load_chip_images(self, folder):
-        scale_factor = 5  # adjust if needed
-        for color, filename in CHIP_IMAGE_NAMES.items():
-            path = os.path.join(folder, filename)
-            if os.path.exists(path):
-                img = tk.PhotoImage(file=path).subsample(scale_factor)
-                self.chip_images[color] = img
-            else:
-                raise FileNotFoundError(f"Missing chip image: {path}")
-    
-    def get_chip_image(self, color):
-        if color not in self.chip_cache:
-            self.chip_cache[color] = self.chip_images.get(color)
-        return self.chip_cache[color]
-
-    def setup_ui(self):
-        self.root.title("♣︎ ♦︎ ♠︎ ♥︎ Texas Hold'em ♣︎ ♦︎ ♠︎ ♥︎")
-
-        bg_main = "#F0F0F0"
-        bg_info = "#F8F8F8"
-        bg_game = TABLE_COLOR
-        bg_player_frame = "#FFFFFF"
-        bg_community_frame = "#DDDDDD"
-        bg_action = "#D0D0D0"
-
-        self.bold_font = tkFont.Font(family="Helvetica", size=14, weight="bold")
-        self.status_font = tkFont.Font(family="Helvetica", size=18, slant="italic")
-
-        self.root.configure(bg=bg_main)
-
-        # Top info bar
-        self.info_frame = tk.Frame(self.root, bg=bg_info)
-        self.info_frame.pack(side=tk.TOP, fill=tk.X)
-        self.status_label = tk.Label(
-            self.info_frame, text="Welcome to Texas Hold'em!",
-            fg="black", bg=bg_info, font=self.status_font
-        )
-        self.status_label.pack(side=tk.LEFT, padx=10)
-
-        # Action frame
-        self.action_frame = tk.Frame(self.root, bg=bg_action, bd=2, relief=tk.RAISED)
-        self.action_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=5)
-
-        self.call_button = tk.Button(
-            self.action_frame, text="Call/Check (C)",
-            command=self.human_call, bg="#C0C0C0", fg="black", state=tk.DISABLED
-        )
-        self.call_button.pack(side=tk.LEFT, padx=5)
-
-        self.fold_button = tk.Button(
-            self.action_frame, text="Fold (F)",
-            command=self.human_fold, bg="#C0C0C0", fg="black", state=tk.DISABLED
-        )
-        self.fold_button.pack(side=tk.LEFT, padx=5)
-
-        self.bet_button = tk.Button(
-            self.action_frame, text="Bet/Raise (B)",
-            command=self.human_bet, bg="#C0C0C0", fg="black", state=tk.DISABLED
-        )
-        self.bet_button.pack(side=tk.LEFT, padx=5)
-
-        self.all_in_button = tk.Button(
-            self.action_frame, text="All-In (A)",
-            command=self.human_all_in, bg="#C0C0C0", fg="black", state=tk.DISABLED
-        )
-        self.all_in_button.pack(side=tk.LEFT, padx=5)
-
-        # Main game area
-        self.game_frame = tk.Frame(self.root, bg=bg_game)
-        self.game_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Top area for community cards
-        top_area = tk.Frame(self.game_frame, bg=bg_game)
-        top_area.pack(side=tk.TOP, pady=10)
-
-        self.stage_label = tk.Label(top_area, text="Stage: Preflop", font=self.bold_font, fg="white", bg=bg_game)
-        self.stage_label.pack(side=tk.TOP, pady=5)
-
-        self.pot_label = tk.Label(top_area, text="Pot: 0", font=self.bold_font, fg="white", bg=bg_game)
-        self.pot_label.pack(side=tk.TOP, pady=5)
-
-        self.community_frame = tk.Frame(top_area, bd=2, relief=tk.RIDGE, bg=bg_community_frame, padx=5, pady=5)
-        self.community_frame.pack(side=tk.TOP, pady=10)
-
-        # Players frame
-        self.players_frame = tk.Frame(self.game_frame, bg=bg_game)
-        self.players_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
-
-        self.player_frames = []
-        for p in self.players:
-            f = tk.Frame(self.players_frame, bd=2, relief=tk.GROOVE, bg=bg_player_frame, padx=5, pady=5)
-            f.pack(side=tk.LEFT, padx=5)
-            self.player_frames.append(f)
-
-    def bind_keys(self):
-        self.root.bind('<c>', lambda event: self.human_call())
-        self.root.bind('<C>', lambda event: self.human_call())
-        self.root.bind('<f>', lambda event: self.human_fold())
-        self.root.bind('<F>', lambda event: self.human_fold())
-        self.root.bind('<b>', lambda event: self.human_bet())
-        self.root.bind('<B>', lambda event: self.human_bet())
-        self.root.bind('<a>', lambda event: self.human_all_in())
-        self.root.bind('<A>', lambda event: self.human_all_in())
-        self.root.focus_set()
-
-    def reset_for_new_hand(self):
-        self.pot = 0
-        self.current_bet = 0
-        self.stage = "preflop"
-        self.betting_completed = False
-        self.player_contributions = [0 for _ in self.players]
-        self.side_pots = []
-        self.players_to_act = []
-        self.raise_count = 0
-
-    def start_hand(self):
-        self.deck = Deck()
-        for p in self.players:
-            p.reset_hand()
-        self.community_cards = []
-        self.reset_for_new_hand()
-
-        if self.continue_button:
-            self.continue_button.destroy()
-            self.continue_button = None
-
-        self.deal_hole_cards()
-        self.post_blinds()
-        self.update_ui()
-
-        # Preflop: first to act is (dealer+3) % len(players) 
-        first_player_offset = 3
-        self.current_player_index = (self.dealer_index + first_player_offset) % len(self.players)
-
-        # Players to act on preflop is all players except big blind
-        self.players_to_act = [
-            p for p in self.players 
-            if not p.folded and p != self.players[(self.dealer_index + 2) % len(self.players)]
-        ]
-        self.human_turn = False
-        self.root.after(UPDATE_DELAY, self.run_betting_round)  # Reduced delay to 100ms
-
-    def deal_hole_cards(self):
-        for _ in range(2):
-            for p in self.players:
-                p.cards.append(self.deck.deal())
-
-    def post_blinds(self):
-        sb_player = self.players[(self.dealer_index + 1) % len(self.players)]
-        bb_player = self.players[(self.dealer_index + 2) % len(self.players)]
-
-        sb_amount = self.take_bet_from_player(sb_player, self.small_blind)
-        bb_amount = self.take_bet_from_player(bb_player, self.big_blind)
-        self.current_bet = self.big_blind
-
-        self.status_label.config(
-            text=f"{sb_player.name} posts SB {sb_amount}, {bb_player.name} posts BB {bb_amount}"
-        )
-    def take_bet_from_player(self, player, amount):
-        actual = min(amount, player.chips)
-        player.chips -= actual
-        player.current_bet += actual
-        self.player_contributions[self.players.index(player)] += actual
-        return actual
-    def run_betting_round(self):
-        active_players = [p for p in self.players if not p.folded]
-        if len(active_players) == 1:
-            self.single_player_win(active_players[0])
-            return
-        
-        if self.betting_completed:
-            self.next_stage()
-            return
-
-        if not self.players_to_act:
-            self.betting_completed = True
-            self.root.after(UPDATE_DELAY, self.run_betting_round)  # Reduced delay to 100ms
-            return
-
-        current_player = self.players[self.current_player_index]
-        if current_player.folded:
-            self.next_player()
-            return
-
-        # Human or AI
-        if current_player.is_human:
-            self.status_label.config(text=f"Your turn. Choose an action. (Max 2 Raises Per Betting Round)")
-            self.human_turn = True
-            self.enable_action_buttons()
-            self.update_ui()
-            return
-        else:
-            self.root.after(random.randint(MIN_AI_DELAY, MAX_AI_DELAY),
-                lambda: self.process_ai_turn(current_player)
-            )
-
-    def process_ai_turn(self, current_player):
-            action, raise_amount = ai_decision(
-                current_player, self.community_cards, 
-                self.current_bet, self.pot, self.stage, self.raise_count
-            )
-            self.process_ai_action(current_player, action, raise_amount)
-
-    def process_ai_action(self, player, action, raise_amount):
-        required = self.current_bet - player.current_bet
-        if action == "fold":
-            player.fold()
-            player.last_action = "Fold"
-            self.status_label.config(text=f"{player.name} folds.")
-        elif action == "call":
-            if required > 0:
-                if player.chips < required:
-                    all_in_amount = player.chips
-                    self.place_bet_with_chips(player, all_in_amount)
-                    player.last_action = f"All-In {all_in_amount}"
-                    self.status_label.config(
-                        text=f"{player.name} goes all-in with {all_in_amount}."
-                    )
-                else:
-                    added = self.place_bet_with_chips(player, required)
-                    player.last_action = "Call"
-                    self.status_label.config(text=f"{player.name} calls {required}.")
-            else:
-                player.last_action = "Check"
-                self.status_label.config(text=f"{player.name} checks.")
-        elif action == "raise":
-            # AI is hard-coded to raise AI_RAISE_AMOUNT if possible
-            if player.chips > required + raise_amount:
-                if required > 0:
-                    self.place_bet_with_chips(player, required)
-                
-                if raise_amount > 0 :
-                    extra = self.place_bet_with_chips(player, raise_amount)
-                    self.current_bet += extra
-                    player.last_action = f"Raise {raise_amount}"
-                    self.status_label.config(
-                        text=f"{player.name} raises by {raise_amount}"   
-                    )                        
-                    self.raise_count += 1
-                    # Everyone else must act again
-                    self.players_to_act = [
-                        p for p in self.players if not p.folded and p != player
-                    ]
-            else:
-                all_in_amount = player.chips
-                self.place_bet_with_chips(player, all_in_amount)
-                player.last_action = f"All-In {all_in_amount}"
-                self.status_label.config(
-                    text=f"{player.name} all-in with {all_in_amount}."
-                )
-        elif action == "all-in":
-            all_in_amount = player.chips
-            self.place_bet_with_chips(player, all_in_amount)
-            player.last_action = f"All-In {all_in_amount}"
-            self.status_label.config(
-                text=f"{player.name} all-in with {all_in_amount}."
-            )
-
-        self.update_pot()
-        self.update_ui()
-
-        if player in self.players_to_act:
-            self.players_to_act.remove(player)
-
-        active_players = [p for p in self.players if not p.folded]
-        if len(active_players) == 1:
-            self.single_player_win(active_players[0])
-            return
-        
-        # Added this check so that if all players are all in, then we end the betting round.
-        all_players_all_in = all(p.chips == 0 for p in self.players if not p.folded)
-        if all_players_all_in:
-              self.betting_completed = True
-              self.root.after(UPDATE_DELAY, self.run_betting_round) # Reduced delay to 100ms
-              return
-        
-        self.next_player()
-
-    def place_bet_with_chips(self, player, amount):
-        actual = min(amount, player.chips)
-        player.chips -= actual
-        player.current_bet += actual
-        self.player_contributions[self.players.index(player)] += actual
-
-        # Use integer division to determine how many chips of each value to use
-        denominations = sorted(CHIP_VALUES.values(), reverse=True)
-        placed_chips = []
-        remaining_amount = actual
-        for denomination in denominations:
-            while remaining_amount >= denomination:
-                placed_chips.append(denomination)
-                remaining_amount -= denomination
-        
-        player.placed_chips = placed_chips
-        
-        return actual
-    
-    def update_pot(self):
-        self.pot = sum(self.player_contributions)
-
-    def next_player(self):
-        # Check if betting is complete before continuing
-        if self.check_betting_complete():
-            self.create_side_pots()
-            self.betting_completed = True
-            self.root.after(UPDATE_DELAY, self.run_betting_round)
-            return
-
-        # Iterate through players until finding one who hasn't folded and is in players_to_act
-        for _ in range(len(self.players)):  # safeguard against infinite loop
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
-            current = self.players[self.current_player_index]
-            if not current.folded and current in self.players_to_act:
-                break
-
-        self.root.after(UPDATE_DELAY, self.run_betting_round)
-
-    def check_betting_complete(self):
-        active_players = [p for p in self.players if not p.folded]
-        if len(active_players) == 1:
-            return True
-        if not self.players_to_act:
-            return True
-        return False
-
-    def create_side_pots(self):
-        self.side_pots = []
-        active_contribs = [
-            (self.player_contributions[i], self.players[i]) 
-            for i, p in enumerate(self.players)
-            if not p.folded and self.player_contributions[i] > 0
-        ]
-        if not active_contribs:
-            return
-
-        active_contribs.sort(key=lambda x: x[0])
-        previous_level = 0
-        for contrib, player in active_contribs:
-            if contrib > previous_level:
-                pot_level = contrib - previous_level
-                involved_players = [
-                    p for j, p in enumerate(self.players)
-                    if not p.folded and self.player_contributions[j] >= contrib
-                ]
-                pot_size = pot_level * len(involved_players)
-                self.side_pots.append({
-                    'players': involved_players,
-                    'amount': pot_size
-                })
-                previous_level = contrib
-
-    def next_stage(self):
-        if self.stage == "preflop":
-            for _ in range(3):
-                self.community_cards.append(self.deck.deal())
-            self.stage = "flop"
-        elif self.stage == "flop":
-            self.community_cards.append(self.deck.deal())
-            self.stage = "turn"
-        elif self.stage == "turn":
-            self.community_cards.append(self.deck.deal())
-            self.stage = "river"
-        elif self.stage == "river":
-            self.do_showdown()
-            return
-
-        # Reset bets each round
-        self.current_bet = 0
-        for p in self.players:
-            p.current_bet = 0
-            p.last_action = ""
-        
-        self.raise_count = 0
-
-        self.betting_completed = False
-        self.status_label.config(text=f"Dealing {self.stage.capitalize()}. Pot: {self.pot}")
-        self.update_ui()
-
-        # Post-flop: first to act is the seat after the dealer
-        if self.stage in ["flop", "turn", "river"]:
-            first_player_index = (self.dealer_index + 1) % len(self.players)
-        else:
-            first_player_index = (self.dealer_index + 3) % len(self.players)
-
-        self.current_player_index = first_player_index
-        while self.players[self.current_player_index].folded:
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
-        
-        # If preflop, players to act is everyone but the big blind. Otherwise, everyone who hasn't folded.
-        if self.stage == "preflop":
-             self.players_to_act = [p for p in self.players
-                if not p.folded and p != self.players[(self.dealer_index + 2) % len(self.players)]]
-        else:
-             self.players_to_act = [p for p in self.players if not p.folded]
-
-        self.root.after(UPDATE_DELAY, self.run_betting_round) # Reduced delay to 100ms
-
-    def do_showdown(self):
-        # Force stage to 'showdown' so that UI logic flips all cards face up
-        self.stage = "showdown"
-        active_players = [p for p in self.players if not p.folded]
+# The Tk GUI lives in holdem_gui so the evaluator, AIs and engine import without
+# tkinter (and without a display). Its names still resolve from here on first use.
+GUI_NAMES = {
+    "TexasHoldemGame",
+    "TABLE_COLOR",
+    "CHIP_COLORS",
+    "CHIP_VALUES",
+    "CHIP_IMAGE_NAMES",
+    "CHIP_STACK_HEIGHT",
+    "CHIP_STACK_WIDTH",
+    "CHIP_STACK_LIMIT",
+    "MAX_STACKS_PER_PLAYER",
+    "UPDATE_DELAY",
+    "MIN_AI_DELAY",
+    "MAX_AI_DELAY",
+}
 
-        if len(active_players) == 1:
-            self.single_player_win(active_players[0])
-            return
-
-        player_values = {}
-        for p in active_players:
-            val = best_five_from_seven(p.cards + self.community_cards)
-            player_values[p] = val
-
-        if not self.side_pots:
-            self.side_pots = [{'players': active_players, 'amount': self.pot}]
-
-        for side_pot in self.side_pots:
-            contenders = [p for p in side_pot['players'] if p in active_players and p in player_values]
-            if not contenders:
-                continue
-            best_value = None
-            winners = []
-            for p in contenders:
-                val = player_values[p]
-                if best_value is None or val > best_value:
-                    best_value = val
-                    winners = [p]
-                elif val == best_value:
-                    winners.append(p)
-
-            winning_hand_description = hand_description(best_value)
-            if len(winners) == 1:
-                winner = winners[0]
-                winner.chips += side_pot['amount']
-                self.status_label.config(
-                    text=f"{winner.name} wins {side_pot['amount']} chips with a {winning_hand_description}!"
-                )
-            else:
-                share = side_pot['amount'] // len(winners)
-                for w in winners:
-                    w.chips += share
-                winner_names = ", ".join([w.name for w in winners])
-                self.status_label.config(
-                    text=f"Split pot! {winner_names} each win {share} chips with a {winning_hand_description}!"
-                )
-
-        self.update_ui()
-        self.show_continue_button()
-
-    def single_player_win(self, player):
-        player.chips += self.pot
-        self.status_label.config(text=f"{player.name} wins {self.pot} chips!")
-        self.stage = "showdown"  # reveal everyone's cards
-        self.update_ui()
-        self.show_continue_button()
-
-    def show_continue_button(self):
-        if self.continue_button is None:
-            self.continue_button = tk.Button(
-                self.action_frame, text="Continue",
-                command=self.end_hand, bg="#C0C0C0", fg="black"
-            )
-            self.continue_button.pack(side=tk.LEFT, padx=10)
-
-        self.root.bind('<space>', self.on_spacebar_end_hand)
-
-        space_label = tk.Label(self.action_frame, text="", bg="#D0D0D0", fg="black")
-        space_label.pack(side=tk.LEFT, padx=10)
-
-    def on_spacebar_end_hand(self, event):
-        self.end_hand()
-
-    def end_hand(self):
-        self.root.unbind('<space>')
-        self.dealer_index = (self.dealer_index + 1) % len(self.players)
-        self.start_hand()
-
-    def update_ui(self):
-        self.stage_label.config(text=f"Stage: {self.stage.capitalize()}")
-        self.pot_label.config(text=f"Pot: {self.pot}")
-        
-        for frame, player in zip(self.player_frames, self.players):
-            self.update_player_frame(frame, player)
-
-        # Community cards
-        self.update_community_cards()
-        self.root.update_idletasks()
-
-
-    def update_player_frame(self, frame, player):
-        # Destroy previous widgets
-        for widget in frame.winfo_children():
-            widget.destroy()
-
-        # Grey out folded player's frame
-        if player.folded:
-            frame_bg = "#BBBBBB"
-        elif self.players[self.current_player_index] == player:
-            frame_bg = "#FFEB99"
-        else:
-            frame_bg = "#FFFFFF"
-
-        frame.config(bg=frame_bg)
-
-        # Show player's name, chips, any last action
-        action_display = ""
-        action_color = "black"
-        if player.last_action:
-            action_display = f" ({player.last_action})"
-            if "Fold" in player.last_action:
-                action_color = "red"
-            elif "Check" in player.last_action or "Call" in player.last_action:
-                action_color = "blue"
-            elif "Raise" in player.last_action or "All-In" in player.last_action:
-                action_color = "green"
-
-        dealer_button = " (D)" if (self.players.index(player) == self.dealer_index) else ""
-        label_text = f"{player.name}: {player.chips} chips{dealer_button}{action_display}"
-
-        lbl = tk.Label(frame, text=label_text, fg=action_color, bg=frame_bg, font=self.bold_font)
-        lbl.pack()
-
-        self.display_bet_this_round(frame, player, frame_bg)
-        self.display_chips(frame, player, frame_bg)
-
-        # Show hole cards face-up if human or showdown, else facedown
-        for c in player.cards:
-            if player.is_human or self.stage == "showdown":
-                img = self.card_images.get((c.rank, c.suit), self.card_back_image)
-            else:
-                img = self.card_back_image
-            lbl_card = tk.Label(frame, image=img, bg=frame_bg)
-            lbl_card.image = img
-            lbl_card.pack(side=tk.LEFT, padx=2, pady=2)
-
-    def update_community_cards(self):
-        for widget in self.community_frame.winfo_children():
-            widget.destroy()
-        tk.Label(
-            self.community_frame, text="Community Cards", bg="#DDDDDD",
-            fg="black", font=self.bold_font
-        ).pack(side=tk.LEFT, padx=5)
-
-        for c in self.community_cards:
-            img = self.card_images.get((c.rank, c.suit), self.card_back_image)
-            lbl = tk.Label(self.community_frame, image=img, bg="#DDDDDD")
-            lbl.image = img
-            lbl.pack(side=tk.LEFT, padx=2)
-
-    def display_bet_this_round(self, frame, player, bg_color="#000000"):
-        bet_this_round = player.current_bet
-        bet_label = tk.Label(
-            frame, text=f"Bet This Round: {bet_this_round}",
-            bg=bg_color,fg="black"
-        )
-        bet_label.pack(side=tk.TOP, padx=2, pady=2)
-
-    def display_chips(self, frame, player, bg_color="#FFFFFF"):
-        chips_frame = tk.Frame(frame, bg=bg_color)
-        chips_frame.pack(side=tk.TOP, pady=5)
-
-        
-        placed_chips = player.placed_chips
-        sorted_chips = sorted(placed_chips, key=lambda x: CHIP_VALUES[next(k for k, v in CHIP_VALUES.items() if v == x)], reverse=True)
-
-        num_stacks = 0
-        chips_in_stack = 0
-        x_offset_per_stack = 0
-        stacks = []
-        current_stack = []
-
-        for chip_value in sorted_chips:
-            current_stack.append(chip_value)
-            chips_in_stack += 1
-            if chips_in_stack >= CHIP_STACK_LIMIT:
-                 stacks.append(current_stack)
-                 current_stack = []
-                 chips_in_stack = 0
-                 num_stacks+=1
-
-        if current_stack:
-            stacks.append(current_stack)
-
-        num_stacks = len(stacks)
-        
-        # If we have more stacks than allowed per player, we just truncate to the limit
-        if num_stacks > MAX_STACKS_PER_PLAYER:
-              num_stacks = MAX_STACKS_PER_PLAYER
-              stacks = stacks[:MAX_STACKS_PER_PLAYER]
-
-
-        for stack_index, stack in enumerate(stacks):
-             chips_canvas = tk.Canvas(chips_frame, width=CHIP_STACK_WIDTH, height=CHIP_STACK_HEIGHT, bg=bg_color, highlightthickness=0)
-             chips_canvas.pack(side=tk.LEFT, padx=5)
-
-             max_display = 35
-             visible_chips = stack[:max_display]
-             extra_count = len(stack) - max_display if len(stack) > max_display else 0
-
-             x_start, y_start = CHIP_STACK_WIDTH / 2, CHIP_STACK_HEIGHT - 30
-             x_offset = 0
-             y_offset = 9 # Chip vertical spacing
-
-             # Stack them vertically
-             for i, chip_value in enumerate(visible_chips):
-                  chip_color = [k for k, v in CHIP_VALUES.items() if v == chip_value][0]
-                  img = self.get_chip_image(chip_color)
-                  x = x_start - i * x_offset
-                  y = y_start - i * y_offset
-                  chips_canvas.create_image(x, y, image=img, anchor=tk.CENTER)
-
-             if extra_count > 0:
-                 chips_canvas.create_text(
-                     x_start, 20, text=f"+{extra_count} more",
-                     fill="black", font=("Helvetica", 8)
-                 )
-
-    def enable_action_buttons(self):
-        self.call_button.config(state=tk.NORMAL)
-        self.fold_button.config(state=tk.NORMAL)
-        self.bet_button.config(state=tk.NORMAL)
-        self.all_in_button.config(state=tk.NORMAL)
-
-    def disable_action_buttons(self):
-        self.call_button.config(state=tk.DISABLED)
-        self.fold_button.config(state=tk.DISABLED)
-        self.bet_button.config(state=tk.DISABLED)
-        self.all_in_button.config(state=tk.DISABLED)
-
-    def human_call(self):
-        if not self.human_turn:
-            return
-        player = self.players[self.current_player_index]
-        if player.is_human and not player.folded:
-            required = self.current_bet - player.current_bet
-            if required > 0:
-                if player.chips < required:
-                    all_in_amount = player.chips
-                    self.place_bet_with_chips(player, all_in_amount)
-                    player.last_action = f"All-In {all_in_amount}"
-                    self.status_label.config(text="You go all-in!")
-                else:
-                    added = self.place_bet_with_chips(player, required)
-                    player.last_action = "Call"
-                    self.status_label.config(text="You call.")
-            else:
-                player.last_action = "Check"
-                self.status_label.config(text="You check.")
-
-            self.update_pot()
-            self.update_ui()
-            self.human_turn = False
-            self.disable_action_buttons()
-
-            if player in self.players_to_act:
-                self.players_to_act.remove(player)
-
-            # If only one remains, that player wins automatically
-            active_players = [p for p in self.players if not p.folded]
-            if len(active_players) == 1:
-                self.single_player_win(active_players[0])
-                return
-            self.next_player()
-
-    def human_fold(self):
-        if not self.human_turn:
-            return
-        player = self.players[self.current_player_index]
-        if player.is_human and not player.folded:
-            player.fold()
-            player.last_action = "Fold"
-            self.status_label.config(text="You fold.")
-            self.update_ui()
-            self.human_turn = False
-            self.disable_action_buttons()
-
-            if player in self.players_to_act:
-                self.players_to_act.remove(player)
-
-            active_players = [p for p in self.players if not p.folded]
-            if len(active_players) == 1:
-                self.single_player_win(active_players[0])
-                return
-
-            self.next_player()
-
-    def human_bet(self):
-        if not self.human_turn:
-            return
-        player = self.players[self.current_player_index]
-        if player.is_human and not player.folded:
-            if self.raise_count >= 2:
-                self.status_label.config(text="Maximum raises reached, choose call or fold.")
-                return
-            bet_amount = simpledialog.askinteger(
-                "Bet Amount", "Enter bet amount:",
-                minvalue=1, maxvalue=player.chips
-            )
-            if bet_amount is not None:
-                required = self.current_bet - player.current_bet
-                # Define a minimum raise (using big blind as a baseline)
-                min_raise = self.big_blind  
-                if required > 0 and bet_amount < required + min_raise:
-                    self.status_label.config(
-                        text=f"Bet must be at least {required + min_raise} (call of {required} plus minimum raise of {min_raise})."
-                    )
-                    return
-                # Cover the call if needed
-                if required > 0:
-                    self.place_bet_with_chips(player, required)
-                raise_amount = min(bet_amount, player.chips)
-                if raise_amount > 0:
-                    extra = self.place_bet_with_chips(player, raise_amount)
-                    self.current_bet += extra
-                    player.last_action = f"Raise {bet_amount}"
-                    self.status_label.config(text=f"You raise by {bet_amount}.")
-                    self.raise_count += 1
-                    self.players_to_act = [p for p in self.players if not p.folded and p != player]
-                else:
-                    if player.chips == 0:
-                        player.last_action = "All-In"
-                        self.status_label.config(text="You are all-in!")
-                    else:
-                        player.last_action = "Call"
-                        self.status_label.config(text="You call.")
-                self.update_pot()
-                self.update_ui()
-                self.human_turn = False
-                self.disable_action_buttons()
-                if player in self.players_to_act:
-                    self.players_to_act.remove(player)
-                active_players = [p for p in self.players if not p.folded]
-                if len(active_players) == 1:
-                    self.single_player_win(active_players[0])
-                    return
-                self.next_player()
-
-    def human_all_in(self):
-        if not self.human_turn:
-            return
-        player = self.players[self.current_player_index]
-        if player.is_human and not player.folded:
-            all_in_amount = player.chips
-            if all_in_amount > 0:
-                self.place_bet_with_chips(player, all_in_amount)
-                player.last_action = f"All-In {all_in_amount}"
-                self.status_label.config(text=f"You go all-in with {all_in_amount}.")
-                self.update_pot()
-                self.update_ui()
-                self.human_turn = False
-                self.disable_action_buttons()
-
-                if player in self.players_to_act:
-                    self.players_to_act.remove(player)
-
-                active_players = [p for p in self.players if not p.folded]
-                if len(active_players) == 1:
-                    self.single_player_win(active_players[0])
-                    return
-                self.players_to_act = [
-                    p for p in self.players if not p.folded and p != player
-                ]
-                self.next_player()
-            else:
-                self.status_label.config(text="You have no chips to go all-in.")
+def __getattr__(name):
+    if name in GUI_NAMES:
+        import holdem_gui
+        return getattr(holdem_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = TexasHoldemGame(root)
-    root.mainloop()
\ No newline at end of file
+    import sys
+    if sys.argv[1:2] == ["simulate"]:
+        # python texasholdem.py simulate --hands N ...: headless runs, see simulate.py
+        from simulate import main
+        main(sys.argv[2:])
+    elif sys.argv[1:2] == ["spectate"]:
+        # python texasholdem.py spectate --seats ...: all-AI table with a live dashboard
+        from spectator import main
+        main(sys.argv[2:])
+    else:
+        from holdem_gui import main
+        main()
@@ -0,0 +1,191 @@
+"""
+Tournament structures: blind and ante levels, bust-outs, table balancing and
+merging.
+
+A Tournament seats its players over HoldemEngine tables and plays rounds of
+one hand per table. Blinds follow a level schedule, busted players leave
+their table, tables are balanced to within one player of each other and a
+table is broken up as soon as the others have seats for its players. Tables
+are kept for the whole tournament and only their player lists change, so a
+round costs the hands and nothing more however many players have gone.
+
+    python tournament.py --players 90 --table-size 9
+"""
+import argparse
+import random
+import time
+
+from engine import HoldemEngine
+from texasholdem import STARTING_CHIPS, Player
+
+TABLE_SIZE = 9
+HANDS_PER_LEVEL = 10  # rounds between blind increases
+
+
+class BlindLevel:
+    def __init__(self, small_blind, big_blind, ante=0):
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+
+    def __str__(self):
+        text = f"{self.small_blind}/{self.big_blind}"
+        return f"{text} ante {self.ante}" if self.ante else text
+
+
+DEFAULT_SCHEDULE = [
+    BlindLevel(25, 50),
+    BlindLevel(50, 100),
+    BlindLevel(75, 150),
+    BlindLevel(100, 200, 25),
+    BlindLevel(150, 300, 25),
+    BlindLevel(200, 400, 50),
+    BlindLevel(300, 600, 75),
+    BlindLevel(400, 800, 100),
+    BlindLevel(600, 1200, 150),
+    BlindLevel(800, 1600, 200),
+    BlindLevel(1000, 2000, 300),
+    BlindLevel(1500, 3000, 400),
+    BlindLevel(2000, 4000, 500),
+]
+
+
+class Tournament:
+    def __init__(self, players, table_size=TABLE_SIZE, schedule=None,
+                 hands_per_level=HANDS_PER_LEVEL, rng=None):
+        if len(players) < 2:
+            raise ValueError("A tournament needs at least two players")
+        if table_size < 3:
+            # With two seats a lone player can't always be given an opponent
+            raise ValueError("Tables need at least three seats")
+        self.table_size = table_size
+        self.schedule = list(schedule) if schedule is not None else DEFAULT_SCHEDULE
+        self.hands_per_level = hands_per_level
+        self.rng = rng if rng is not None else random.Random()
+        self.round = 0
+        self.finishes = []  # busted players, first out first
+
+        seats = list(players)
+        self.rng.shuffle(seats)
+        num_tables = (len(seats) + table_size - 1) // table_size
+        self.tables = [
+            HoldemEngine(seats[i::num_tables], rng=random.Random(self.rng.getrandbits(64)))
+            for i in range(num_tables)
+        ]
+        self.remaining = len(seats)
+
+    @property
+    def level(self):
+        return self.schedule[min(self.round // self.hands_per_level, len(self.schedule) - 1)]
+
+    @property
+    def finished(self):
+        return self.remaining <= 1
+
+    def play_round(self):
+        """Plays one hand at every table, then removes busted players and rebalances."""
+        level = self.level
+        for table in self.tables:
+            if len(table.players) < 2:
+                continue
+            table.small_blind = level.small_blind
+            table.big_blind = level.big_blind
+            table.ante = level.ante
+            stacks = [p.chips for p in table.players]
+            table.start_hand()
+            self._remove_busted(table, stacks)
+        self.round += 1
+        self._balance()
+
+    def run(self, max_rounds=None):
+        """Plays until one player has every chip (or ``max_rounds``); returns the standings."""
+        while not self.finished and (max_rounds is None or self.round < max_rounds):
+            self.play_round()
+        return self.standings()
+
+    def standings(self):
+        """Players still in by chips, then the busted ones, last out first."""
+        alive = [p for table in self.tables for p in table.players]
+        alive.sort(key=lambda p: p.chips, reverse=True)
+        return alive + self.finishes[::-1]
+
+    def _remove_busted(self, table, stacks):
+        players = table.players
+        busted = [i for i, p in enumerate(players) if p.chips <= 0]
+        # The button moves on to the next player still in
+        n = len(players)
+        dealer = next(
+            (players[(table.dealer_index + k) % n] for k in range(1, n + 1)
+             if players[(table.dealer_index + k) % n].chips > 0),
+            None,
+        )
+        if busted:
+            # Players knocked out in the same hand finish in order of their starting stacks
+            for i in sorted(busted, key=lambda i: stacks[i]):
+                self.finishes.append(players[i])
+            players[:] = [p for p in players if p.chips > 0]
+            self.remaining -= len(busted)
+        table.dealer_index = players.index(dealer) if dealer is not None else 0
+
+    def _balance(self):
+        tables = self.tables
+        # Break the shortest table while the others have seats for its players
+        while len(tables) > 1 and self.remaining <= (len(tables) - 1) * self.table_size:
+            broken = min(tables, key=lambda t: len(t.players))
+            tables.remove(broken)
+            for p in list(broken.players):
+                self._seat(min(tables, key=lambda t: len(t.players)), p)
+            del broken.players[:]
+
+        while len(tables) > 1:
+            longest = max(tables, key=lambda t: len(t.players))
+            shortest = min(tables, key=lambda t: len(t.players))
+            if len(longest.players) - len(shortest.players) <= 1:
+                break
+            self._seat(shortest, self._unseat(longest))
+
+    def _unseat(self, table):
+        """Takes the player due to post the next big blind off ``table``."""
+        players = table.players
+        i = (table.dealer_index + 2) % len(players)
+        player = players.pop(i)
+        if i < table.dealer_index:
+            table.dealer_index -= 1
+        table.dealer_index %= len(players)
+        return player
+
+    def _seat(self, table, player):
+        # Seated just before the button, so the newcomer posts the blinds last
+        table.players.insert(table.dealer_index, player)
+        table.dealer_index += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate an all-AI Texas Hold'em tournament.")
+    parser.add_argument("--players", type=int, default=TABLE_SIZE * 10)
+    parser.add_argument("--table-size", type=int, default=TABLE_SIZE)
+    parser.add_argument("--chips", type=int, default=STARTING_CHIPS)
+    parser.add_argument("--hands-per-level", type=int, default=HANDS_PER_LEVEL)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    styles = ["straightforward", "risk_taker", "strategic", "chaos"]
+    players = [
+        Player(f"Player {i + 1}", args.chips, play_style=rng.choice(styles))
+        for i in range(args.players)
+    ]
+    tournament = Tournament(players, args.table_size, hands_per_level=args.hands_per_level, rng=rng)
+
+    start = time.perf_counter()
+    standings = tournament.run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(players)} players finished in {tournament.round} rounds "
+          f"({elapsed:.2f} s, final level {tournament.level})")
+    for place, p in enumerate(standings[:10], start=1):
+        print(f"{place:3}. {p.name} ({p.play_style}) {p.chips}")
+
+
+if __name__ == "__main__":
+    main()